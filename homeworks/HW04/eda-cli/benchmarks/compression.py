@@ -0,0 +1,99 @@
+"""
+Бенчмарк чтения сжатых CSV: потоковая распаковка прямо в чанковый профайлер
+против «сначала распаковать во временный файл, потом профилировать».
+
+Запуск:
+
+    uv run python benchmarks/compression.py --rows 1000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import bz2
+import gzip
+import json
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from eda_cli.compression import open_source
+from eda_cli.profiling import profile_csv
+from eda_cli.synth import SyntheticSpec, generate_dataset
+
+
+def _write_dataset(path: Path, rows: int, seed: int = 0) -> None:
+    generate_dataset(SyntheticSpec(rows=rows, cols=8, seed=seed)).to_csv(path, index=False)
+
+
+def _compress(src: Path, codec: str) -> Path:
+    data = src.read_bytes()
+    if codec == "gzip":
+        out = src.with_suffix(".csv.gz")
+        out.write_bytes(gzip.compress(data, compresslevel=6))
+    elif codec == "bz2":
+        out = src.with_suffix(".csv.bz2")
+        out.write_bytes(bz2.compress(data))
+    else:
+        import zstandard
+
+        out = src.with_suffix(".csv.zst")
+        out.write_bytes(zstandard.ZstdCompressor(level=3).compress(data))
+    return out
+
+
+def _timed(func) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def _decompress_then_profile(path: Path, workdir: Path) -> None:
+    plain = workdir / "decompressed.csv"
+    with open_source(path, read_ahead=False) as src, plain.open("wb") as dst:
+        shutil.copyfileobj(src, dst, 1 << 20)
+    profile_csv(plain)
+    plain.unlink()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=500_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json-out", type=Path, default=None)
+    args = parser.parse_args()
+
+    codecs = ["gzip", "bz2"]
+    try:
+        import zstandard  # noqa: F401
+
+        codecs.append("zstd")
+    except ImportError:
+        print("zstandard не установлен – zstd пропущен (uv sync --extra zstd)")
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        plain = workdir / "data.csv"
+        _write_dataset(plain, args.rows)
+        results.append({"codec": "none", "mode": "plain", "seconds": min(_timed(lambda: profile_csv(plain)) for _ in range(args.repeat))})
+
+        for codec in codecs:
+            compressed = _compress(plain, codec)
+            streaming = min(_timed(lambda: profile_csv(compressed)) for _ in range(args.repeat))
+            two_step = min(_timed(lambda: _decompress_then_profile(compressed, workdir)) for _ in range(args.repeat))
+            results.append({"codec": codec, "mode": "streaming", "seconds": streaming})
+            results.append({"codec": codec, "mode": "decompress_then_profile", "seconds": two_step})
+
+    table = pd.DataFrame(results)
+    table["rows_per_sec"] = args.rows / table["seconds"]
+    print(table.to_string(index=False))
+    if args.json_out:
+        args.json_out.write_text(json.dumps({"rows": args.rows, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
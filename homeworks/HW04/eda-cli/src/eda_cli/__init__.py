@@ -6,7 +6,15 @@ eda_cli – мини-утилита для EDA CSV-файлов.
 - на Семинаре 04 как библиотека для обёрток (HTTP-сервис и т.п.).
 """
 
-from . import core, viz
+from importlib import import_module
 
 __all__ = ["core", "viz"]
 __version__ = "0.1.0"
+
+
+def __getattr__(name: str):
+    # Подмодули (и pandas/matplotlib за ними) загружаются при первом обращении:
+    # `import eda_cli` и `eda-cli --help` не платят за тяжёлые импорты
+    if name in __all__:
+        return import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,12 +1,139 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import io
+import logging
+import os
+import threading
+from contextlib import asynccontextmanager, contextmanager
+from pathlib import Path
 from time import perf_counter
+from typing import AsyncIterator, Callable, Iterable, Iterator, Literal, TypeVar
 
 import pandas as pd
-from fastapi import FastAPI, File, HTTPException, UploadFile
+from fastapi import FastAPI, File, HTTPException, Query, Request, Response, UploadFile
+from fastapi import Path as PathParam
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from pydantic import BaseModel, Field
 
-from .core import compute_quality_flags, missing_table, summarize_dataset
+from .cancel import CancelToken, OperationCancelled, check_cancelled, use_cancel_token
+from .compression import open_source
+from .core import DatasetSummary, build_json_summary, compute_quality_flags, missing_table, summarize_dataset
+from .drift import compare_profiles
+from .instrument import Tracer, stage, use_tracer
+from .logs import (
+    REQUEST_ID_HEADER,
+    configure_logging,
+    dropped_log_records,
+    log_event,
+    request_context,
+    shutdown_logging,
+)
+from .metrics import CONTENT_TYPE, ROWS_BUCKETS, SIZE_BUCKETS, MetricsRegistry
+from .profiling import DatasetProfile, ProfileCache, default_cache_dir, profile_csv
+from .progress import encode_ndjson, encode_sse, iter_profile_events
+from .resultcache import ResultCache
+from .serialize import dumps, iter_json, loads
+from .synth import SyntheticSpec, generate_dataset
+from .target import TargetNotFound, profile_target
+from .validation import DEFAULT_CHUNK_ROWS, UploadLimits, UploadRejected, iter_csv_chunks, read_csv_limited
+
+logger = logging.getLogger("eda_cli.api")
+
+# Частые лёгкие эндпоинты логируются выборочно (доля запросов), остальные – всегда
+LOG_SAMPLE_RATES: dict[str, float] = {
+    "/quality": float(os.environ.get("EDA_LOG_SAMPLE_RATE", "0.1")),
+}
+
+
+class JobTracker:
+    """Счётчик CSV-задач в работе: при остановке новые не принимаются, текущие дожидаются."""
+
+    def __init__(self) -> None:
+        self._active = 0
+        self._draining = False
+        self._cond = threading.Condition()
+
+    @property
+    def active(self) -> int:
+        return self._active
+
+    @property
+    def draining(self) -> bool:
+        return self._draining
+
+    @contextmanager
+    def track(self) -> Iterator[None]:
+        with self._cond:
+            if self._draining:
+                raise HTTPException(status_code=503, detail="Сервис останавливается, повторите запрос позже.")
+            self._active += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._active -= 1
+                self._cond.notify_all()
+
+    def resume(self) -> None:
+        with self._cond:
+            self._draining = False
+
+    def drain(self, timeout: float) -> bool:
+        """Перестаёт принимать задачи и ждёт завершения текущих; False, если не успели за timeout."""
+        with self._cond:
+            self._draining = True
+            return self._cond.wait_for(lambda: self._active == 0, timeout=timeout)
+
+
+JOBS = JobTracker()
+
+
+def warmup() -> float:
+    """
+    Прогон пайплайна на маленьком синтетическом CSV до приёма запросов:
+    догружает ленивые импорты и прогревает пути pandas/NumPy. Возвращает время, мс.
+    """
+    start = perf_counter()
+    data = generate_dataset(SyntheticSpec(rows=500, cols=8, seed=0)).to_csv(index=False).encode("utf-8")
+    df = pd.read_csv(io.BytesIO(data))
+    summary = summarize_dataset(df)
+    build_json_summary(summary, compute_quality_flags(summary, missing_table(df)))
+    profile_csv(io.BytesIO(data))
+    return (perf_counter() - start) * 1000.0
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    configure_logging()
+    JOBS.resume()
+    # eda-cli serve передаёт настройки воркерам через окружение
+    if os.environ.get("EDA_API_WARMUP", "1") != "0":
+        log_event(logger, "warmup", pid=os.getpid(), duration_ms=round(warmup(), 1))
+    try:
+        yield
+    finally:
+        drain_timeout = float(os.environ.get("EDA_DRAIN_TIMEOUT", "30"))
+        drained = await asyncio.to_thread(JOBS.drain, drain_timeout)
+        # Число отброшенных записей уходит в последнюю запись лога, до остановки очереди
+        log_event(
+            logger,
+            "shutdown",
+            pid=os.getpid(),
+            drained=drained,
+            active_jobs=JOBS.active,
+            dropped_log_records=dropped_log_records(),
+        )
+        shutdown_logging()
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON-ответ через serialize.dumps (orjson, если установлен): NumPy и dataclass'ы – без конвертации."""
+
+    def render(self, content) -> bytes:
+        return dumps(content)
+
 
 app = FastAPI(
     title="AIE Dataset Quality API",
@@ -17,6 +144,289 @@ app = FastAPI(
     ),
     docs_url="/docs",
     redoc_url=None,
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse,
+)
+
+
+# ---------- Лимит размера тела запроса ----------
+
+LIMITS = UploadLimits.from_env()
+
+
+class BodySizeLimitMiddleware:
+    """
+    Отклоняет запрос с телом больше max_bytes (413) ещё до разбора multipart:
+    по Content-Length сразу, без него – как только прочитано больше лимита.
+    """
+
+    def __init__(self, app, max_bytes: int) -> None:
+        self.app = app
+        self.max_bytes = max_bytes
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        headers = dict(scope.get("headers") or [])
+        content_length = headers.get(b"content-length", b"")
+        if content_length.isdigit() and int(content_length) > self.max_bytes:
+            await self._reject(send)
+            return
+
+        received = 0
+        started = False
+        rejected = False
+
+        async def limited_receive():
+            # Исключение из receive() разбор формы превратил бы в 400, поэтому при
+            # превышении лимита сами отвечаем 413, а приложению отдаём http.disconnect.
+            nonlocal received, rejected
+            if rejected:
+                return {"type": "http.disconnect"}
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    rejected = True
+                    if not started:
+                        await self._reject(send)
+                    return {"type": "http.disconnect"}
+            return message
+
+        async def tracking_send(message) -> None:
+            nonlocal started
+            if rejected:
+                return  # ответ 413 уже отправлен
+            started = started or message["type"] == "http.response.start"
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, tracking_send)
+        except Exception:
+            if not rejected:
+                raise
+
+    async def _reject(self, send) -> None:
+        limit_mb = self.max_bytes / 2**20
+        body = dumps({"detail": f"Тело запроса больше допустимого размера ({limit_mb:g} МиБ, {self.max_bytes} байт)."})
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 413,
+                "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
+
+
+# Регистрируется до middleware метрик и X-Request-ID: Starlette вызывает middleware в порядке,
+# обратном добавлению, так что ответы 413 проходят через них и попадают в eda_http_requests_total.
+app.add_middleware(BodySizeLimitMiddleware, max_bytes=LIMITS.max_bytes)
+
+
+# ---------- Метрики ----------
+
+REGISTRY = MetricsRegistry()
+REQUESTS_TOTAL = REGISTRY.counter(
+    "eda_http_requests_total", "Число обработанных запросов", ("endpoint", "method", "status")
+)
+REQUEST_LATENCY = REGISTRY.histogram(
+    "eda_http_request_duration_seconds", "Время обработки запроса, секунды", ("endpoint",)
+)
+REQUEST_SIZE = REGISTRY.histogram(
+    "eda_http_request_size_bytes", "Размер тела запроса (загружаемого CSV), байты", ("endpoint",), SIZE_BUCKETS
+)
+IN_PROGRESS = REGISTRY.gauge("eda_http_requests_in_progress", "Запросы в обработке", ("endpoint",))
+STAGE_LATENCY = REGISTRY.histogram(
+    "eda_stage_duration_seconds", "Время стадии пайплайна (parse, summarize_dataset, ...), секунды", ("stage",)
+)
+STAGE_ROWS = REGISTRY.counter(
+    "eda_stage_rows_total", "Строк обработано стадией; rate() даёт строки в секунду", ("stage",)
+)
+STAGE_BATCH_ROWS = REGISTRY.histogram(
+    "eda_stage_rows", "Строк за один вызов стадии", ("stage",), ROWS_BUCKETS
+)
+
+_route_paths: frozenset[str] = frozenset()
+
+
+def _endpoint_label(request: Request) -> str:
+    """Шаблон пути эндпоинта; неизвестные пути схлопываются в 'other', чтобы не плодить метки."""
+    global _route_paths
+    if not _route_paths:
+        _route_paths = frozenset(route.path for route in app.routes)
+    path = request.url.path
+    return path if path in _route_paths else "other"
+
+
+@app.middleware("http")
+async def collect_metrics(request: Request, call_next):
+    endpoint = _endpoint_label(request)
+    content_length = request.headers.get("content-length")
+    if content_length is not None and content_length.isdigit():
+        REQUEST_SIZE.observe(int(content_length), endpoint=endpoint)
+
+    IN_PROGRESS.inc(endpoint=endpoint)
+    start = perf_counter()
+    status = "500"
+    try:
+        response = await call_next(request)
+        status = str(response.status_code)
+        return response
+    finally:
+        IN_PROGRESS.dec(endpoint=endpoint)
+        REQUEST_LATENCY.observe(perf_counter() - start, endpoint=endpoint)
+        REQUESTS_TOTAL.inc(endpoint=endpoint, method=request.method, status=status)
+
+
+@app.middleware("http")
+async def bind_request_id(request: Request, call_next):
+    """Берёт X-Request-ID клиента (или генерирует свой) и возвращает его в ответе."""
+    with request_context(request.headers.get(REQUEST_ID_HEADER)) as request_id:
+        response = await call_next(request)
+    response.headers[REQUEST_ID_HEADER] = request_id
+    return response
+
+
+def _stage_ms(tracer: Tracer) -> dict[str, float]:
+    """Компактные замеры стадий для лога: {стадия: wall_ms}."""
+    return {timing.name: round(timing.wall_ms, 2) for timing in tracer.stages}
+
+
+@contextmanager
+def _request_tracer() -> Iterator[Tracer]:
+    """Трейсер на время обработки запроса; по выходу стадии попадают в метрики."""
+    tracer = Tracer()
+    try:
+        with JOBS.track(), use_tracer(tracer):
+            yield tracer
+    finally:
+        for timing in tracer.stages:
+            STAGE_LATENCY.observe(timing.wall_ms / 1000.0, stage=timing.name)
+            if timing.rows is not None:
+                STAGE_ROWS.inc(timing.rows, stage=timing.name)
+                STAGE_BATCH_ROWS.observe(timing.rows, stage=timing.name)
+
+
+# content_type от браузера/curl может быть разным, в т.ч. для сжатых CSV
+CSV_CONTENT_TYPES = (
+    "text/csv",
+    "application/vnd.ms-excel",
+    "application/octet-stream",
+    "application/gzip",
+    "application/x-gzip",
+    "application/x-bzip2",
+    "application/zstd",
+)
+
+
+
+def _read_upload(file: UploadFile, partial_on_deadline: bool = False) -> pd.DataFrame:
+    """
+    Читает загруженный CSV; сжатие (.gz/.bz2/.zst) определяется по имени или magic bytes.
+    Читается чанками с проверкой лимитов (LIMITS): бинарный, слишком большой или
+    структурно битый файл отклоняется (UploadRejected) на первом же плохом чанке.
+    partial_on_deadline – см. read_csv_limited.
+    """
+    with stage("parse") as st, open_source(file.file, name=file.filename) as stream:
+        df = read_csv_limited(stream, LIMITS, partial_on_deadline=partial_on_deadline)
+        st["rows"] = len(df)
+        return df
+
+
+def _profile_upload(file: UploadFile) -> DatasetProfile:
+    """Потоковый профиль загруженного CSV с теми же проверками, что и в _read_upload."""
+    profile = DatasetProfile(source=file.filename or "")
+    with stage("profile_csv") as st, open_source(file.file, name=file.filename) as stream:
+        for chunk in iter_csv_chunks(stream, LIMITS):
+            profile.update(chunk)
+        st["rows"] = profile.n_rows
+    return profile
+
+
+def _cached_upload_profile(file: UploadFile) -> tuple[DatasetProfile, bool]:
+    """
+    _profile_upload с кэшем профилей по sha256 содержимого (ProfileCache в каталоге uploads).
+    Возвращает профиль и признак попадания в кэш.
+    """
+    sha = _hash_upload(file)
+    cache = ProfileCache(default_cache_dir() / "uploads")
+    key = cache.key_for_content(sha)
+    profile = cache.get(key)
+    hit = profile is not None
+    if profile is None:
+        profile = _profile_upload(file)
+        if profile.n_rows > 0:
+            cache.put(key, profile)
+    profile.source = file.filename or ""
+    return profile, hit
+
+
+T = TypeVar("T")
+
+DISCONNECT_POLL_INTERVAL = 0.1
+
+
+async def _run_cancellable(request: Request, func: Callable[[], T], token: CancelToken) -> T:
+    """
+    Выполняет func в пуле потоков с активным token (см. cancel.py). Пока она работает,
+    проверяем, не отключился ли клиент: если да – токен отменяется, и func
+    останавливается на ближайшей точке отмены (между чанками или стадиями).
+    """
+
+    def work() -> T:
+        with use_cancel_token(token):
+            return func()
+
+    # to_thread копирует контекст – трейсер запроса виден и в потоке
+    task = asyncio.ensure_future(asyncio.to_thread(work))
+    while True:
+        done, _ = await asyncio.wait({task}, timeout=DISCONNECT_POLL_INTERVAL)
+        if done:
+            return task.result()
+        if not token.cancelled and await request.is_disconnected():
+            token.cancel("клиент отключился")
+
+
+def _cancelled(file: UploadFile, exc: OperationCancelled) -> HTTPException:
+    log_event(logger, "cancelled", filename=file.filename, reason=str(exc))
+    # 499 – «клиент закрыл соединение» (как в nginx); ответ уже никто не прочитает
+    return HTTPException(status_code=499, detail=f"Обработка прервана: {exc}")
+
+
+async def _read_upload_cancellable(request: Request, file: UploadFile, token: CancelToken) -> pd.DataFrame:
+    """
+    _read_upload в потоке с отменой. По дедлайну – прочитанные строки (df.attrs["partial"]);
+    ошибки – HTTPException: битый/пустой CSV – 400, к дедлайну не прочитано ничего – 504.
+    """
+    try:
+        df = await _run_cancellable(request, lambda: _read_upload(file, partial_on_deadline=True), token)
+    except OperationCancelled as exc:
+        raise _cancelled(file, exc)
+    except UploadRejected as exc:
+        raise HTTPException(status_code=exc.status_code, detail=exc.detail)
+    except Exception as exc:  # noqa: BLE001
+        raise HTTPException(status_code=400, detail=f"Не удалось прочитать CSV: {exc}")
+
+    if df.empty:
+        if df.attrs.get("partial"):
+            raise HTTPException(status_code=504, detail="За timeout_ms не прочитано ни одного чанка CSV.")
+        raise HTTPException(status_code=400, detail="CSV-файл не содержит данных (пустой DataFrame).")
+    return df
+
+
+def _deadline(timeout_ms: int | None) -> CancelToken:
+    return CancelToken(timeout_ms / 1000.0 if timeout_ms is not None else None)
+
+
+TIMEOUT_MS_QUERY_HELP = (
+    "Дедлайн на чтение файла, мс. Если он истёк раньше, чем файл прочитан, "
+    "оценка считается по уже прочитанным строкам и помечается partial=true."
+)
+TARGET_QUERY_HELP = (
+    "Целевая колонка: добавляет флаги готовности к обучению (дисбаланс классов, "
+    "пропуски в таргете, подозрения на утечку) и поле target в ответе."
 )
 
 
@@ -76,6 +486,21 @@ class QualityResponse(BaseModel):
         default=None,
         description="Размеры датасета: {'n_rows': ..., 'n_cols': ...}, если известны",
     )
+    timings: list[dict] | None = Field(
+        default=None,
+        description="Замеры по стадиям (parse, summarize_dataset, ...): wall/CPU-время, строки/с, память",
+    )
+    partial: bool = Field(
+        default=False,
+        description="True – дедлайн (timeout_ms) истёк раньше, чем файл прочитан: оценка по первым строкам файла",
+    )
+    target: dict | None = Field(
+        default=None,
+        description=(
+            "Анализ целевой колонки (если задан target): тип задачи, баланс классов, "
+            "нормированная взаимная информация признаков с таргетом, корреляции, leakage_columns"
+        ),
+    )
 
 
 # ---------- Системный эндпоинт ----------
@@ -85,12 +510,18 @@ class QualityResponse(BaseModel):
 def health() -> dict[str, str]:
     """Простейший health-check сервиса."""
     return {
-        "status": "ok",
+        "status": "draining" if JOBS.draining else "ok",
         "service": "dataset-quality",
         "version": "0.2.0",
     }
 
 
+@app.get("/metrics", tags=["system"], response_class=PlainTextResponse)
+def metrics() -> PlainTextResponse:
+    """Метрики сервиса в текстовом формате Prometheus."""
+    return PlainTextResponse(REGISTRY.render(), media_type=CONTENT_TYPE)
+
+
 # ---------- Заглушка /quality по агрегированным признакам ----------
 
 
@@ -144,11 +575,15 @@ def quality(req: QualityRequest) -> QualityResponse:
         "no_categorical_columns": req.categorical_cols == 0,
     }
 
-    # Примитивный лог — на семинаре можно обсудить, как это превратить в нормальный logger
-    print(
-        f"[quality] n_rows={req.n_rows} n_cols={req.n_cols} "
-        f"max_missing_share={req.max_missing_share:.3f} "
-        f"score={score:.3f} latency_ms={latency_ms:.1f} ms"
+    log_event(
+        logger,
+        "quality",
+        sample_rate=LOG_SAMPLE_RATES["/quality"],
+        n_rows=req.n_rows,
+        n_cols=req.n_cols,
+        max_missing_share=round(req.max_missing_share, 3),
+        score=round(score, 3),
+        latency_ms=round(latency_ms, 1),
     )
 
     return QualityResponse(
@@ -161,44 +596,97 @@ def quality(req: QualityRequest) -> QualityResponse:
     )
 
 
-# ---------- /quality-from-csv: реальный CSV через нашу EDA-логику ----------
+# ---------- Кэш результатов по хэшу загруженного файла ----------
 
+# Версия закэшированных результатов: меняется вместе с логикой флагов/сводки
+RESULT_CACHE_VERSION = 1
+SHA256_PATTERN = "^[0-9a-f]{64}$"
+HASH_BLOCK = 1 << 20
 
-@app.post(
-    "/quality-from-csv",
-    response_model=QualityResponse,
-    tags=["quality"],
-    summary="Оценка качества по CSV-файлу с использованием EDA-ядра",
-)
-async def quality_from_csv(file: UploadFile = File(...)) -> QualityResponse:
-    """
-    Эндпоинт, который принимает CSV-файл, запускает EDA-ядро
-    (summarize_dataset + missing_table + compute_quality_flags)
-    и возвращает оценку качества данных.
 
-    Именно это по сути связывает S03 (CLI EDA) и S04 (HTTP-сервис).
+def _result_cache() -> ResultCache:
+    root = os.environ.get("EDA_RESULT_CACHE_DIR")
+    return ResultCache(
+        root=Path(root) if root else default_cache_dir() / "results",
+        max_memory_bytes=int(float(os.environ.get("EDA_RESULT_CACHE_MEMORY_MB", "64")) * 2**20),
+        max_disk_bytes=int(float(os.environ.get("EDA_RESULT_CACHE_DISK_MB", "512")) * 2**20),
+    )
+
+
+RESULTS = _result_cache()
+
+
+def _hash_upload(file: UploadFile) -> str:
+    """sha256 загруженного файла блоками; после хэширования файл снова читается с начала."""
+    digest = hashlib.sha256()
+    with stage("hash_upload"):
+        stream = file.file
+        for block in iter(lambda: stream.read(HASH_BLOCK), b""):
+            digest.update(block)
+        stream.seek(0)
+    return digest.hexdigest()
+
+
+def _cache_key(kind: str, sha: str) -> str:
+    return f"{kind}-v{RESULT_CACHE_VERSION}-{sha}"
+
+
+def _etag(key: str) -> str:
+    return f'"{key}"'
+
+
+def _not_modified(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return etag in candidates or "*" in candidates
+
+
+def _cached_result(request: Request, key: str) -> tuple[bytes | None, Response | None]:
     """
+    Закэшированный результат для GET .../by-hash/{sha}: (JSON, None) или (None, ответ 304),
+    если у клиента уже есть эта версия. Нет в кэше – 404.
+    """
+    etag = _etag(key)
+    if _not_modified(request, etag):
+        return None, Response(status_code=304, headers={"ETag": etag})
+    raw = RESULTS.get(key)
+    if raw is None:
+        raise HTTPException(
+            status_code=404,
+            detail="Результат для этого хэша не найден в кэше – загрузите файл целиком.",
+        )
+    return raw, None
 
-    start = perf_counter()
 
-    if file.content_type not in ("text/csv", "application/vnd.ms-excel", "application/octet-stream"):
-        # content_type от браузера может быть разным, поэтому проверка мягкая
-        # но для демонстрации оставим простую ветку 400
-        raise HTTPException(status_code=400, detail="Ожидается CSV-файл (content-type text/csv).")
+# ---------- /quality-from-csv: реальный CSV через нашу EDA-логику ----------
 
-    try:
-        # FastAPI даёт file.file как file-like объект, который можно читать pandas'ом
-        df = pd.read_csv(file.file)
-    except Exception as exc:  # noqa: BLE001
-        raise HTTPException(status_code=400, detail=f"Не удалось прочитать CSV: {exc}")
 
-    if df.empty:
-        raise HTTPException(status_code=400, detail="CSV-файл не содержит данных (пустой DataFrame).")
+def _quality_kind(target: str | None) -> str:
+    # Имя колонки – произвольная строка, в ключ кэша (и ETag) идёт её хэш
+    if target is None:
+        return "quality"
+    return f"quality-target-{hashlib.sha256(target.encode('utf-8')).hexdigest()[:16]}"
 
+
+def _quality_flags(df: pd.DataFrame, target: str | None = None) -> dict:
+    """compute_quality_flags по DataFrame с точками отмены между стадиями (дедлайн здесь уже не действует)."""
     # Используем EDA-ядро из S03
     summary = summarize_dataset(df)
+    check_cancelled(deadline=False)
     missing_df = missing_table(df)
-    flags_all = compute_quality_flags(summary, missing_df)
+    check_cancelled(deadline=False)
+    target_profile = None
+    if target is not None:
+        target_profile = profile_target(df, target)
+        check_cancelled(deadline=False)
+    return compute_quality_flags(summary, missing_df, target=target_profile)
+
+
+def _quality_payload(df: pd.DataFrame, target: str | None = None) -> dict:
+    """Оценка качества по DataFrame – то, что кэшируется (без latency_ms/timings)."""
+    flags_all = _quality_flags(df, target)
 
     # Ожидаем, что compute_quality_flags вернёт quality_score в [0,1]
     score = float(flags_all.get("quality_score", 0.0))
@@ -209,8 +697,8 @@ async def quality_from_csv(file: UploadFile = File(...)) -> QualityResponse:
         message = "CSV выглядит достаточно качественным для обучения модели (по текущим эвристикам)."
     else:
         message = "CSV требует доработки перед обучением модели (по текущим эвристикам)."
-
-    latency_ms = (perf_counter() - start) * 1000.0
+    if flags_all.get("leakage_columns"):
+        message += f" Подозрение на утечку таргета: {', '.join(flags_all['leakage_columns'])}."
 
     # Оставляем только булевы флаги для компактности
     flags_bool: dict[str, bool] = {
@@ -219,30 +707,124 @@ async def quality_from_csv(file: UploadFile = File(...)) -> QualityResponse:
         if isinstance(value, bool)
     }
 
-    # Размеры датасета берём из summary (если там есть поля n_rows/n_cols),
-    # иначе — напрямую из DataFrame.
-    try:
-        n_rows = int(getattr(summary, "n_rows"))
-        n_cols = int(getattr(summary, "n_cols"))
-    except AttributeError:
-        n_rows = int(df.shape[0])
-        n_cols = int(df.shape[1])
-
-    print(
-        f"[quality-from-csv] filename={file.filename!r} "
-        f"n_rows={n_rows} n_cols={n_cols} score={score:.3f} "
-        f"latency_ms={latency_ms:.1f} ms"
-    )
+    return {
+        "ok_for_model": ok_for_model,
+        "quality_score": score,
+        "message": message,
+        "flags": flags_bool,
+        "dataset_shape": {"n_rows": int(df.shape[0]), "n_cols": int(df.shape[1])},
+        "target": flags_all.get("target_profile"),
+    }
 
-    return QualityResponse(
-        ok_for_model=ok_for_model,
-        quality_score=score,
-        message=message,
-        latency_ms=latency_ms,
-        flags=flags_bool,
-        dataset_shape={"n_rows": n_rows, "n_cols": n_cols},
+
+@app.post(
+    "/quality-from-csv",
+    response_model=QualityResponse,
+    tags=["quality"],
+    summary="Оценка качества по CSV-файлу с использованием EDA-ядра",
+)
+async def quality_from_csv(
+    request: Request,
+    response: Response,
+    file: UploadFile = File(...),
+    timeout_ms: int | None = Query(None, ge=1, description=TIMEOUT_MS_QUERY_HELP),
+    target: str | None = Query(None, min_length=1, description=TARGET_QUERY_HELP),
+) -> QualityResponse:
+    """
+    Эндпоинт, который принимает CSV-файл, запускает EDA-ядро
+    (summarize_dataset + missing_table + compute_quality_flags)
+    и возвращает оценку качества данных.
+
+    Именно это по сути связывает S03 (CLI EDA) и S04 (HTTP-сервис).
+
+    Результат кэшируется по sha256 содержимого: повторная загрузка того же файла
+    не пересчитывается, а сам хэш можно запросить через GET /quality/by-hash/{sha}.
+
+    Если клиент отключается, разбор останавливается на ближайшем чанке.
+    С timeout_ms по истечении дедлайна возвращается частичная оценка (partial=true, не кэшируется).
+    С target – ещё и анализ относительно целевой колонки (target.py), кэшируется отдельно.
+    """
+
+    start = perf_counter()
+
+    if file.content_type not in CSV_CONTENT_TYPES:
+        # content_type от браузера может быть разным, поэтому проверка мягкая
+        # но для демонстрации оставим простую ветку 400
+        raise HTTPException(status_code=400, detail="Ожидается CSV-файл (content-type text/csv).")
+
+    with _request_tracer() as tracer:
+        sha = await asyncio.to_thread(_hash_upload, file)
+        key = _cache_key(_quality_kind(target), sha)
+        raw = RESULTS.get(key)
+        partial = False
+        if raw is not None:
+            payload = loads(raw)
+        else:
+            token = _deadline(timeout_ms)
+            # FastAPI даёт file.file как file-like объект, который можно читать pandas'ом
+            df = await _read_upload_cancellable(request, file, token)
+            partial = bool(df.attrs.get("partial"))
+            try:
+                payload = await _run_cancellable(request, lambda: _quality_payload(df, target), token)
+            except OperationCancelled as exc:
+                raise _cancelled(file, exc)
+            except TargetNotFound as exc:
+                raise HTTPException(status_code=400, detail=str(exc))
+
+            if partial:
+                note = f"Частичный результат по первым {len(df)} строкам (истёк timeout_ms). "
+                payload["message"] = note + payload["message"]
+            else:
+                RESULTS.put(key, dumps(payload))
+
+    latency_ms = (perf_counter() - start) * 1000.0
+    if not partial:
+        response.headers["ETag"] = _etag(key)
+    response.headers["X-Cache"] = "MISS" if raw is None else "HIT"
+
+    log_event(
+        logger,
+        "quality-from-csv",
+        filename=file.filename,
+        sha256=sha,
+        cache="MISS" if raw is None else "HIT",
+        partial=partial,
+        n_rows=payload["dataset_shape"]["n_rows"],
+        n_cols=payload["dataset_shape"]["n_cols"],
+        score=round(payload["quality_score"], 3),
+        latency_ms=round(latency_ms, 1),
+        stages=_stage_ms(tracer),
     )
 
+    return QualityResponse(**payload, latency_ms=latency_ms, timings=tracer.to_dicts(), partial=partial)
+
+
+@app.get(
+    "/quality/by-hash/{sha}",
+    response_model=QualityResponse,
+    tags=["quality"],
+    summary="Оценка качества по sha256 уже загружавшегося CSV (без повторной загрузки)",
+    responses={304: {"description": "Не изменилось (If-None-Match совпал с ETag)"}, 404: {"description": "Нет в кэше"}},
+)
+def quality_by_hash(
+    request: Request,
+    response: Response,
+    sha: str = PathParam(..., pattern=SHA256_PATTERN, description="sha256 содержимого файла (hex)"),
+):
+    """
+    Результат /quality-from-csv для файла с данным sha256, если он есть в кэше.
+    404 – файла с таким хэшем ещё не было (или результат вытеснен), нужно загрузить его.
+    """
+    start = perf_counter()
+    key = _cache_key("quality", sha)
+    raw, not_modified = _cached_result(request, key)
+    if not_modified is not None:
+        return not_modified
+    payload = loads(raw)
+    response.headers["ETag"] = _etag(key)
+    response.headers["X-Cache"] = "HIT"
+    return QualityResponse(**payload, latency_ms=(perf_counter() - start) * 1000.0, timings=[])
+
 
 # ---------- Собственный эндпоинт из HW03 ----------
 @app.post(
@@ -250,30 +832,35 @@ async def quality_from_csv(file: UploadFile = File(...)) -> QualityResponse:
     tags=["quality"],
     summary="Полный набор флагов качества по CSV-файлу",
 )
-async def quality_flags_from_csv(file: UploadFile = File(...)) -> dict:
+async def quality_flags_from_csv(
+    request: Request,
+    file: UploadFile = File(...),
+    timeout_ms: int | None = Query(None, ge=1, description=TIMEOUT_MS_QUERY_HELP),
+    target: str | None = Query(None, min_length=1, description=TARGET_QUERY_HELP),
+) -> FastJSONResponse:
     """
     Эндпоинт, который принимает CSV-файл, запускает EDA-ядро
     (summarize_dataset + missing_table + compute_quality_flags)
     и возвращает полный набор флагов качества данных, включая те,
     что были добавлены в HW03.
+
+    Отмена и дедлайн – как в /quality-from-csv (поле partial в ответе),
+    target – тоже (поле target в ответе).
     """
     start = perf_counter()
 
-    if file.content_type not in ("text/csv", "application/vnd.ms-excel", "application/octet-stream"):
+    if file.content_type not in CSV_CONTENT_TYPES:
         raise HTTPException(status_code=400, detail="Ожидается CSV-файл (content-type text/csv).")
 
-    try:
-        df = pd.read_csv(file.file)
-    except Exception as exc:  
-        raise HTTPException(status_code=400, detail=f"Не удалось прочитать CSV: {exc}")
-
-    if df.empty:
-        raise HTTPException(status_code=400, detail="CSV-файл не содержит данных (пустой DataFrame).")
-
-    # Используем EDA-ядро из S03
-    summary = summarize_dataset(df)
-    missing_df = missing_table(df)
-    flags_all = compute_quality_flags(summary, missing_df)
+    with _request_tracer() as tracer:
+        token = _deadline(timeout_ms)
+        df = await _read_upload_cancellable(request, file, token)
+        try:
+            flags_all = await _run_cancellable(request, lambda: _quality_flags(df, target), token)
+        except OperationCancelled as exc:
+            raise _cancelled(file, exc)
+        except TargetNotFound as exc:
+            raise HTTPException(status_code=400, detail=str(exc))
 
     latency_ms = (perf_counter() - start) * 1000.0
 
@@ -284,106 +871,282 @@ async def quality_flags_from_csv(file: UploadFile = File(...)) -> dict:
         if isinstance(value, bool)
     }
 
-    print(
-        f"[quality-flags-from-csv] filename={file.filename!r} "
-        f"n_rows={df.shape[0]} n_cols={df.shape[1]} "
-        f"latency_ms={latency_ms:.1f} ms"
+    log_event(
+        logger,
+        "quality-flags-from-csv",
+        filename=file.filename,
+        n_rows=int(df.shape[0]),
+        n_cols=int(df.shape[1]),
+        latency_ms=round(latency_ms, 1),
+        stages=_stage_ms(tracer),
     )
 
-    return {"flags": flags_bool}
+    return FastJSONResponse(
+        {
+            "flags": flags_bool,
+            "partial": bool(df.attrs.get("partial")),
+            "target": flags_all.get("target_profile"),
+            "timings": tracer.to_dicts(),
+        }
+    )
 
 
 # ---------- Дополнительный эндпоинт: JSON-сводка из HW03 ----------
+
+
+def _summary_kind(columns: bool) -> str:
+    return "summary-columns" if columns else "summary"
+
+
+def _summary_body(chunks: Iterable[bytes], timings: list[dict], cache_key: str | None = None) -> Iterator[bytes]:
+    """
+    Документ сводки (из iter_json или из кэша) с дописанным в конец полем timings.
+    С cache_key документ без timings по окончании сохраняется в кэш.
+    """
+    parts: list[bytes] = []
+    pending = b""
+    for chunk in chunks:
+        if pending:
+            parts.append(pending)
+            yield pending
+        pending = chunk
+    # pending – хвост документа, заканчивающийся закрывающей скобкой
+    if cache_key is not None:
+        RESULTS.put(cache_key, b"".join(parts) + pending)
+    yield pending[:-1] + b',"timings":' + dumps(timings) + b"}"
+
+
+def _summary_parts(file: UploadFile) -> tuple[pd.DataFrame, DatasetSummary, dict]:
+    """Чтение и сводка для /summary-from-csv; синхронно, поэтому вызывается в пуле потоков."""
+    try:
+        df = _read_upload(file)
+    except UploadRejected as exc:
+        raise HTTPException(status_code=exc.status_code, detail=exc.detail)
+    except Exception as exc:  # noqa: BLE001
+        raise HTTPException(status_code=400, detail=f"Не удалось прочитать CSV: {exc}")
+
+    if df.empty:
+        raise HTTPException(status_code=400, detail="CSV-файл не содержит данных (пустой DataFrame).")
+
+    # Используем EDA-ядро из S03
+    summary = summarize_dataset(df)
+    missing_df = missing_table(df)
+    return df, summary, compute_quality_flags(summary, missing_df)
+
+
 @app.post(
     "/summary-from-csv",
     tags=["summary"],
     summary="JSON-сводка по CSV-файлу (аналог опции --json-summary)",
 )
-async def summary_from_csv(file: UploadFile = File(...)) -> dict:
+async def summary_from_csv(
+    file: UploadFile = File(...),
+    columns: bool = Query(False, description="Добавить полную сводку по каждой колонке (поле columns)"),
+) -> StreamingResponse:
     """
     Эндпоинт, который принимает CSV-файл, запускает EDA-ядро
     и возвращает JSON-сводку по датасету, аналогично опции CLI --json-summary.
+
+    Ответ отдаётся потоково: проблемные колонки (и колонки сводки при columns=true)
+    кодируются по одной, поэтому широкие датасеты не собираются в один большой dict.
+    Сводка кэшируется по sha256 файла (см. GET /summary/by-hash/{sha}).
     """
     start = perf_counter()
 
-    if file.content_type not in ("text/csv", "application/vnd.ms-excel", "application/octet-stream"):
+    if file.content_type not in CSV_CONTENT_TYPES:
         raise HTTPException(status_code=400, detail="Ожидается CSV-файл (content-type text/csv).")
 
+    with _request_tracer() as tracer:
+        sha = await asyncio.to_thread(_hash_upload, file)
+        key = _cache_key(_summary_kind(columns), sha)
+        raw = RESULTS.get(key)
+        if raw is None:
+            df, summary, quality_flags = await asyncio.to_thread(_summary_parts, file)
+
+    latency_ms = (perf_counter() - start) * 1000.0
+
+    if raw is None:
+        json_summary_data = build_json_summary(summary, quality_flags)
+        streamed = {"problematic_columns": json_summary_data.pop("problematic_columns")}
+        if columns:
+            streamed["columns"] = summary.columns
+        body = _summary_body(iter_json(json_summary_data, streamed), tracer.to_dicts(), cache_key=key)
+    else:
+        body = _summary_body([raw], tracer.to_dicts())
+
+    log_event(
+        logger,
+        "summary-from-csv",
+        filename=file.filename,
+        sha256=sha,
+        cache="MISS" if raw is None else "HIT",
+        n_rows=int(df.shape[0]) if raw is None else None,
+        n_cols=int(df.shape[1]) if raw is None else None,
+        latency_ms=round(latency_ms, 1),
+        stages=_stage_ms(tracer),
+    )
+
+    return StreamingResponse(
+        body,
+        media_type="application/json",
+        headers={"ETag": _etag(key), "X-Cache": "MISS" if raw is None else "HIT"},
+    )
+
+
+@app.get(
+    "/summary/by-hash/{sha}",
+    tags=["summary"],
+    summary="JSON-сводка по sha256 уже загружавшегося CSV (без повторной загрузки)",
+    responses={304: {"description": "Не изменилось (If-None-Match совпал с ETag)"}, 404: {"description": "Нет в кэше"}},
+)
+def summary_by_hash(
+    request: Request,
+    sha: str = PathParam(..., pattern=SHA256_PATTERN, description="sha256 содержимого файла (hex)"),
+    columns: bool = Query(False, description="Сводка с полем columns (если такая запрашивалась при загрузке)"),
+) -> Response:
+    """Результат /summary-from-csv для файла с данным sha256, если он есть в кэше."""
+    key = _cache_key(_summary_kind(columns), sha)
+    raw, not_modified = _cached_result(request, key)
+    if not_modified is not None:
+        return not_modified
+    return StreamingResponse(
+        _summary_body([raw], []),
+        media_type="application/json",
+        headers={"ETag": _etag(key), "X-Cache": "HIT"},
+    )
+
+# ---------- Потоковое профилирование с прогрессом ----------
+
+STREAM_FORMATS = {
+    "ndjson": ("application/x-ndjson", encode_ndjson),
+    "sse": ("text/event-stream", encode_sse),
+}
+
+
+def _profile_event_stream(file: UploadFile, encode, chunk_rows: int, partial_interval: float) -> Iterator[bytes]:
+    """
+    Закодированные события iter_profile_events. Ошибки после начала ответа
+    уходят событием error (HTTP-статус уже отправлен); обрыв соединения
+    останавливает генератор между чанками.
+    """
+    start = perf_counter()
+    last: dict = {}
+    events = iter_profile_events(
+        file.file,
+        name=file.filename or "",
+        total_bytes=file.size,
+        limits=LIMITS,
+        chunk_rows=chunk_rows,
+        partial_interval=partial_interval,
+    )
     try:
-        df = pd.read_csv(file.file)
-    except Exception as exc:  
-        raise HTTPException(status_code=400, detail=f"Не удалось прочитать CSV: {exc}")
+        with JOBS.track():
+            for event in events:
+                last = event
+                yield encode(event)
+    except UploadRejected as exc:
+        last = {"event": "error", "status_code": exc.status_code, "detail": exc.detail}
+        yield encode(last)
+    except HTTPException as exc:
+        last = {"event": "error", "status_code": exc.status_code, "detail": exc.detail}
+        yield encode(last)
+    except Exception as exc:  # noqa: BLE001
+        last = {"event": "error", "status_code": 400, "detail": f"Не удалось прочитать CSV: {exc}"}
+        yield encode(last)
+    finally:
+        events.close()
+        log_event(
+            logger,
+            "profile-stream",
+            filename=file.filename,
+            outcome=last.get("event") if last.get("event") in ("result", "error") else "cancelled",
+            n_rows=last.get("n_rows", last.get("rows")),
+            latency_ms=round((perf_counter() - start) * 1000.0, 1),
+        )
 
-    if df.empty:
-        raise HTTPException(status_code=400, detail="CSV-файл не содержит данных (пустой DataFrame).")
 
-    # Используем EDA-ядро из S03
-    summary = summarize_dataset(df)
-    missing_df = missing_table(df)
-    quality_flags = compute_quality_flags(summary, missing_df)
+@app.post(
+    "/profile-from-csv/stream",
+    tags=["summary"],
+    summary="Потоковое профилирование CSV с событиями прогресса (NDJSON или SSE)",
+)
+async def profile_from_csv_stream(
+    file: UploadFile = File(...),
+    format: Literal["ndjson", "sse"] = Query("ndjson", description="ndjson – строка JSON на событие, sse – text/event-stream"),
+    chunk_rows: int = Query(DEFAULT_CHUNK_ROWS, ge=100, le=1_000_000, description="Строк в чанке (событие на чанк)"),
+    partial_interval_ms: int = Query(1000, ge=0, description="Как часто (мс) отдавать промежуточную сводку по колонкам"),
+) -> StreamingResponse:
+    """
+    Профилирует CSV по чанкам и сразу отдаёт события:
+    progress (байты, строки, стадия), partial (сводка по колонкам на текущий момент)
+    и в конце result (итоговая сводка и флаги качества) или error.
+
+    Клиент может закрыть соединение в любой момент – профилирование остановится.
+    """
+    if file.content_type not in CSV_CONTENT_TYPES:
+        raise HTTPException(status_code=400, detail="Ожидается CSV-файл (content-type text/csv).")
+    if JOBS.draining:
+        raise HTTPException(status_code=503, detail="Сервис останавливается, повторите запрос позже.")
+
+    media_type, encode = STREAM_FORMATS[format]
+    return StreamingResponse(
+        _profile_event_stream(file, encode, chunk_rows, partial_interval_ms / 1000.0),
+        media_type=media_type,
+        # Прокси (nginx) не должны буферизовать поток событий
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
 
+# ---------- Сравнение двух выгрузок: дрифт по колонкам ----------
+@app.post(
+    "/drift-from-csv",
+    tags=["drift"],
+    summary="Дрифт между двумя CSV-файлами (аналог команды eda-cli diff)",
+)
+async def drift_from_csv(
+    old: UploadFile = File(..., description="«Старый» CSV-файл"),
+    new: UploadFile = File(..., description="«Новый» CSV-файл"),
+) -> FastJSONResponse:
+    """
+    Эндпоинт, который принимает два CSV-файла, потоково профилирует каждый
+    (по чанкам, без загрузки целого DataFrame) и возвращает поколоночный дрифт:
+    PSI, KS, сдвиг долей категорий и изменение доли пропусков.
+    Профили кэшируются по sha256 файла, так что уже встречавшийся файл не перечитывается.
+    """
+    start = perf_counter()
+
+    profiles = []
+    cache_status = []
+    with _request_tracer() as tracer:
+        for file in (old, new):
+            if file.content_type not in CSV_CONTENT_TYPES:
+                raise HTTPException(status_code=400, detail="Ожидается CSV-файл (content-type text/csv).")
+            try:
+                profile, hit = await asyncio.to_thread(_cached_upload_profile, file)
+            except UploadRejected as exc:
+                raise HTTPException(status_code=exc.status_code, detail=f"{file.filename!r}: {exc.detail}")
+            except Exception as exc:  # noqa: BLE001
+                raise HTTPException(status_code=400, detail=f"Не удалось прочитать CSV {file.filename!r}: {exc}")
+            if profile.n_rows == 0:
+                raise HTTPException(status_code=400, detail=f"CSV-файл {file.filename!r} не содержит данных.")
+            profiles.append(profile)
+            cache_status.append("HIT" if hit else "MISS")
+
+        drift_report = compare_profiles(profiles[0], profiles[1])
     latency_ms = (perf_counter() - start) * 1000.0
 
-    json_summary_data = {
-        "n_rows": summary.n_rows,
-        "n_cols": summary.n_cols,
-        "quality_score": float(quality_flags["quality_score"]),
-        "problematic_columns": []
-    }
-    
-    # Добавляем информацию о проблемных колонках
-    if quality_flags["too_many_missing"]:
-        for col in summary.columns:
-            if col.missing_share > 0.5:
-                json_summary_data["problematic_columns"].append({
-                    "name": col.name,
-                    "issue": "too_many_missing",
-                    "missing_share": col.missing_share
-                })
-    
-    if quality_flags["has_constant_columns"]:
-        for col_name in quality_flags["constant_columns"]:
-            json_summary_data["problematic_columns"].append({
-                "name": col_name,
-                "issue": "constant_column",
-                "unique_values": 1
-            })
-    
-    if quality_flags["has_high_cardinality_categoricals"]:
-        for col_name in quality_flags["high_cardinality_categoricals"]:
-            col = next(c for c in summary.columns if c.name == col_name)
-            cardinality_ratio = col.unique / summary.n_rows if summary.n_rows > 0 else 0
-            json_summary_data["problematic_columns"].append({
-                "name": col_name,
-                "issue": "high_cardinality",
-                "cardinality_ratio": cardinality_ratio,
-                "unique_count": col.unique
-            })
-    
-    if quality_flags["has_many_zero_values"]:
-        for col_name in quality_flags["many_zero_columns"]:
-            col = next(c for c in summary.columns if c.name == col_name)
-            zero_ratio = col.zeros / col.non_null if col.non_null > 0 else 0
-            json_summary_data["problematic_columns"].append({
-                "name": col_name,
-                "issue": "many_zero_values",
-                "zero_ratio": zero_ratio,
-                "zero_count": col.zeros
-            })
-    
-    if quality_flags["has_suspicious_id_duplicates"]:
-        for col_name in quality_flags["suspicious_id_columns"]:
-            col = next(c for c in summary.columns if c.name == col_name)
-            json_summary_data["problematic_columns"].append({
-                "name": col_name,
-                "issue": "suspicious_id_duplicates",
-                "unique_count": col.unique
-            })
-
-    print(
-        f"[summary-from-csv] filename={file.filename!r} "
-        f"n_rows={df.shape[0]} n_cols={df.shape[1]} "
-        f"latency_ms={latency_ms:.1f} ms"
+    log_event(
+        logger,
+        "drift-from-csv",
+        old=old.filename,
+        new=new.filename,
+        cache=cache_status,
+        drifted=len(drift_report.drifted_columns),
+        latency_ms=round(latency_ms, 1),
+        stages=_stage_ms(tracer),
     )
 
-    return json_summary_data
\ No newline at end of file
+    result = drift_report.to_dict()
+    result["latency_ms"] = latency_ms
+    result["timings"] = tracer.to_dicts()
+    return FastJSONResponse(result)
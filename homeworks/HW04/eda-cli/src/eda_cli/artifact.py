@@ -0,0 +1,360 @@
+from __future__ import annotations
+
+import struct
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .core import ColumnSummary, DatasetSummary
+from .drift import DriftReport, compare_profiles
+from .profiling import PROFILE_VERSION, ColumnProfile, DatasetProfile, column_seed
+from .serialize import dumps, loads
+from .sketches import DistinctSketch, SampleSketch, TopKSketch
+from .temporal import TemporalProfile
+from .text import TextProfile
+
+# Бинарный артефакт профиля (*.edaprof) – один файл для сервисов, которые раньше
+# разбирали CSV отчёта. Внутри: JSON-манифест (сводка, таблицы, скаляры скетчей)
+# и выровненные NumPy-буферы (выборки, хэши KMV, счётчики по дням, матрица
+# корреляций). Буферы читаются через mmap без копирования; профиль из артефакта
+# можно сливать и сравнивать (drift) без исходных данных.
+#
+# Формат: MAGIC | uint64 длина манифеста (LE) | манифест | выравнивание | буферы.
+# В манифесте массив заменяется ссылкой {"$buf": i}; buffers[i] – смещение
+# от начала области буферов, dtype и shape. pyarrow не требуется.
+
+MAGIC = b"EDAPROF\x00"
+ARTIFACT_VERSION = 1
+ARTIFACT_SUFFIX = ".edaprof"
+ALIGNMENT = 64
+
+_HEADER = struct.Struct("<8sQ")
+
+
+def _pad(n: int) -> int:
+    return -n % ALIGNMENT
+
+
+def is_artifact(path: Path) -> bool:
+    """Файл – артефакт профиля (по расширению или сигнатуре)."""
+    path = Path(path)
+    if path.suffix == ARTIFACT_SUFFIX:
+        return True
+    try:
+        with path.open("rb") as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+# ---------- Состояние профиля <-> манифест ----------
+
+
+class _Buffers:
+    """Копит массивы для записи и отдаёт вместо них ссылки для манифеста."""
+
+    def __init__(self) -> None:
+        self.arrays: List[np.ndarray] = []
+        self.meta: List[Dict[str, Any]] = []
+        self.size = 0
+
+    def add(self, array: np.ndarray) -> Dict[str, int]:
+        array = np.ascontiguousarray(array)
+        self.size += _pad(self.size)
+        self.meta.append({"offset": self.size, "dtype": array.dtype.str, "shape": list(array.shape)})
+        self.arrays.append(array)
+        self.size += array.nbytes
+        return {"$buf": len(self.arrays) - 1}
+
+
+def _column_state(col: ColumnProfile, buffers: _Buffers) -> Dict[str, Any]:
+    text = col.text
+    state: Dict[str, Any] = {
+        "name": col.name,
+        "dtype": col.dtype,
+        "count": col.count,
+        "missing": col.missing,
+        "is_numeric": col.is_numeric,
+        "numeric_count": col.numeric_count,
+        "mean": col.mean,
+        "m2": col.m2,
+        "min": col.min,
+        "max": col.max,
+        "zeros": col.zeros,
+        "example_values": col.example_values,
+        "temporal_checked": col.temporal_checked,
+        "approximate": col.approximate,
+        "distinct": {"k": col.distinct.k, "hashes": buffers.add(col.distinct.hashes)},
+        "sample": {
+            "capacity": col.sample.capacity,
+            "values": buffers.add(col.sample.values),
+            "priorities": buffers.add(col.sample.priorities),
+        },
+        "top": {"capacity": col.top.capacity, "counts": col.top.counts, "total": col.top.total},
+        "text": {
+            "sample_size": text.sample_size,
+            "count": text.count,
+            "empty": text.empty,
+            "whitespace_only": text.whitespace_only,
+            "len_min": text.len_min,
+            "len_max": text.len_max,
+            "len_sum": text.len_sum,
+            "length_hist": text.length_hist.tolist(),
+            "sampled": text.sampled,
+            "estimates": text.estimates,
+        },
+        "temporal": None,
+    }
+    temporal = col.temporal
+    if temporal is not None:
+        days = np.fromiter(temporal.day_counts, dtype="int64", count=len(temporal.day_counts))
+        counts = np.fromiter(temporal.day_counts.values(), dtype="int64", count=len(temporal.day_counts))
+        state["temporal"] = {
+            "format": temporal.format,
+            "count": temporal.count,
+            "unparsed": temporal.unparsed,
+            "min_ns": temporal.min_ns,
+            "max_ns": temporal.max_ns,
+            "future": temporal.future,
+            "sentinel": temporal.sentinel,
+            "days": buffers.add(days),
+            "day_counts": buffers.add(counts),
+        }
+    return state
+
+
+def _restore_column(state: Dict[str, Any]) -> ColumnProfile:
+    distinct = DistinctSketch(k=state["distinct"]["k"])
+    distinct.hashes = state["distinct"]["hashes"]
+
+    sample = SampleSketch(capacity=state["sample"]["capacity"], seed=column_seed(state["name"]))
+    sample.values = state["sample"]["values"]
+    sample.priorities = state["sample"]["priorities"]
+
+    top = TopKSketch(capacity=state["top"]["capacity"])
+    top.counts = dict(state["top"]["counts"])
+    top.total = state["top"]["total"]
+
+    text_state = state["text"]
+    text = TextProfile(sample_size=text_state["sample_size"])
+    for name in ("count", "empty", "whitespace_only", "len_min", "len_max", "len_sum", "sampled"):
+        setattr(text, name, text_state[name])
+    text.length_hist = np.asarray(text_state["length_hist"], dtype="int64")
+    text.estimates = dict(text_state["estimates"])
+
+    temporal: Optional[TemporalProfile] = None
+    temporal_state = state["temporal"]
+    if temporal_state is not None:
+        temporal = TemporalProfile(temporal_state["format"])
+        for name in ("count", "unparsed", "min_ns", "max_ns", "future", "sentinel"):
+            setattr(temporal, name, temporal_state[name])
+        temporal.day_counts = dict(
+            zip(temporal_state["days"].tolist(), temporal_state["day_counts"].tolist())
+        )
+
+    return ColumnProfile(
+        name=state["name"],
+        dtype=state["dtype"],
+        count=state["count"],
+        missing=state["missing"],
+        is_numeric=state["is_numeric"],
+        numeric_count=state["numeric_count"],
+        mean=state["mean"],
+        m2=state["m2"],
+        min=state["min"],
+        max=state["max"],
+        zeros=state["zeros"],
+        example_values=list(state["example_values"]),
+        distinct=distinct,
+        sample=sample,
+        top=top,
+        text=text,
+        temporal=temporal,
+        temporal_checked=state["temporal_checked"],
+        approximate=state["approximate"],
+    )
+
+
+def _resolve(node: Any, arrays: List[np.ndarray]) -> Any:
+    """Заменяет ссылки {"$buf": i} в разобранном манифесте на массивы."""
+    if isinstance(node, dict):
+        if len(node) == 1 and "$buf" in node:
+            return arrays[node["$buf"]]
+        return {key: _resolve(value, arrays) for key, value in node.items()}
+    if isinstance(node, list):
+        return [_resolve(value, arrays) for value in node]
+    return node
+
+
+# ---------- Артефакт ----------
+
+
+@dataclass
+class ProfileArtifact:
+    """
+    Содержимое артефакта. profile – слияемое состояние скетчей; summary, missing,
+    correlation и top_categories – таблицы отчёта в том виде, в каком они были
+    посчитаны при сохранении (корреляция – только если была посчитана по данным).
+    histograms – готовые гистограммы числовых колонок {колонка: (counts, edges)},
+    чтобы дашборды и графики не пересчитывали их.
+    """
+
+    profile: DatasetProfile
+    summary: DatasetSummary
+    missing: pd.DataFrame
+    correlation: pd.DataFrame
+    top_categories: Dict[str, pd.DataFrame] = field(default_factory=dict)
+    meta: Dict[str, Any] = field(default_factory=dict)
+    histograms: Dict[str, Tuple[np.ndarray, np.ndarray]] = field(default_factory=dict)
+
+    @classmethod
+    def from_profile(cls, profile: DatasetProfile, top_k: int = 5, **meta: Any) -> "ProfileArtifact":
+        """Артефакт только из профиля; корреляции без исходных данных нет."""
+        return cls(
+            profile=profile,
+            summary=profile.to_summary(),
+            missing=profile.missing_table(),
+            correlation=pd.DataFrame(),
+            top_categories=profile.top_categories(top_k=top_k),
+            meta=dict(meta),
+            histograms=profile.histograms(),
+        )
+
+    def merge(self, other: "ProfileArtifact", top_k: int = 5) -> "ProfileArtifact":
+        """Объединение (например, профилей шардов или дней); исходные артефакты не меняются."""
+        merged = DatasetProfile(source=self.profile.source)
+        merged.merge(self.profile).merge(other.profile)
+        return ProfileArtifact.from_profile(merged, top_k=top_k)
+
+    def diff(self, other: "ProfileArtifact", top_k: int = 5) -> DriftReport:
+        """Дрифт self -> other по сохранённым скетчам."""
+        return compare_profiles(self.profile, other.profile, top_k=top_k)
+
+
+def save_profile(path: Path, artifact: ProfileArtifact) -> Path:
+    path = Path(path)
+    buffers = _Buffers()
+
+    missing = artifact.missing
+    correlation = artifact.correlation
+    manifest = {
+        "artifact_version": ARTIFACT_VERSION,
+        "profile_version": PROFILE_VERSION,
+        "meta": artifact.meta,
+        "profile": {
+            "source": artifact.profile.source,
+            "n_rows": artifact.profile.n_rows,
+            "columns": [_column_state(col, buffers) for col in artifact.profile.columns.values()],
+        },
+        "summary": artifact.summary,
+        "missing": {
+            "index": [str(name) for name in missing.index],
+            "missing_count": buffers.add(missing["missing_count"].to_numpy(dtype="int64")),
+            "missing_share": buffers.add(missing["missing_share"].to_numpy(dtype="float64")),
+        },
+        "correlation": {
+            "columns": [str(name) for name in correlation.columns],
+            "values": buffers.add(correlation.to_numpy(dtype="float64")),
+        },
+        "top_categories": {
+            name: {
+                "value": table["value"].astype(str).tolist(),
+                "count": buffers.add(table["count"].to_numpy(dtype="int64")),
+                "share": buffers.add(table["share"].to_numpy(dtype="float64")),
+            }
+            for name, table in artifact.top_categories.items()
+        },
+        "histograms": {
+            name: {
+                "counts": buffers.add(np.asarray(counts, dtype="int64")),
+                "edges": buffers.add(np.asarray(edges, dtype="float64")),
+            }
+            for name, (counts, edges) in artifact.histograms.items()
+        },
+    }
+    manifest["buffers"] = buffers.meta
+    raw = dumps(manifest)
+
+    tmp = path.with_name(path.name + ".tmp")
+    with tmp.open("wb") as f:
+        head = _HEADER.pack(MAGIC, len(raw)) + raw
+        f.write(head + b"\0" * _pad(len(head)))
+        written = 0
+        for array, meta in zip(buffers.arrays, buffers.meta):
+            f.write(b"\0" * (meta["offset"] - written))
+            if array.nbytes:
+                f.write(array.data)
+            written = meta["offset"] + array.nbytes
+    tmp.replace(path)
+    return path
+
+
+def load_profile(path: Path) -> ProfileArtifact:
+    """
+    Читает артефакт. Большие массивы (выборки, хэши, корреляция) – представления
+    поверх mmap файла, без копирования; они только для чтения, слияние создаёт новые.
+    """
+    path = Path(path)
+    mapped = np.memmap(path, dtype="uint8", mode="r")
+    magic, manifest_len = _HEADER.unpack_from(mapped, 0)
+    if magic != MAGIC:
+        raise ValueError(f"{path}: не артефакт профиля eda-cli")
+    start = _HEADER.size
+    manifest = loads(bytes(mapped[start : start + manifest_len]))
+    if manifest["artifact_version"] != ARTIFACT_VERSION or manifest["profile_version"] != PROFILE_VERSION:
+        raise ValueError(
+            f"{path}: версия артефакта {manifest['artifact_version']}/{manifest['profile_version']} "
+            f"не поддерживается (ожидается {ARTIFACT_VERSION}/{PROFILE_VERSION})"
+        )
+
+    base = start + manifest_len
+    base += _pad(base)
+    arrays = []
+    for meta in manifest["buffers"]:
+        dtype = np.dtype(meta["dtype"])
+        count = int(np.prod(meta["shape"], dtype="int64"))
+        array = np.frombuffer(mapped, dtype=dtype, count=count, offset=base + meta["offset"])
+        arrays.append(array.reshape(meta["shape"]))
+    manifest = _resolve(manifest, arrays)
+
+    state = manifest["profile"]
+    profile = DatasetProfile(n_rows=state["n_rows"], source=state["source"])
+    for column_state in state["columns"]:
+        profile.columns[column_state["name"]] = _restore_column(column_state)
+
+    summary_state = manifest["summary"]
+    summary = DatasetSummary(
+        n_rows=summary_state["n_rows"],
+        n_cols=summary_state["n_cols"],
+        columns=[ColumnSummary(**col) for col in summary_state["columns"]],
+    )
+    missing_state = manifest["missing"]
+    missing = pd.DataFrame(
+        {"missing_count": missing_state["missing_count"], "missing_share": missing_state["missing_share"]},
+        index=missing_state["index"],
+    )
+    corr_state = manifest["correlation"]
+    correlation = (
+        pd.DataFrame(corr_state["values"], index=corr_state["columns"], columns=corr_state["columns"], copy=False)
+        if corr_state["columns"]
+        else pd.DataFrame()
+    )
+    top_categories = {name: pd.DataFrame(table) for name, table in manifest["top_categories"].items()}
+    # В артефактах без гистограмм (сохранённых до их появления) – оценка по скетчам
+    histograms = (
+        {name: (state["counts"], state["edges"]) for name, state in manifest["histograms"].items()}
+        if "histograms" in manifest
+        else profile.histograms()
+    )
+    return ProfileArtifact(
+        profile=profile,
+        summary=summary,
+        missing=missing,
+        correlation=correlation,
+        top_categories=top_categories,
+        meta=manifest["meta"],
+        histograms=histograms,
+    )
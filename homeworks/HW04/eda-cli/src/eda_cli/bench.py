@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import json
+import platform
+import statistics
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, replace
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from . import __version__
+from .core import (
+    compute_quality_flags,
+    correlation_matrix,
+    missing_table,
+    summarize_dataset,
+    top_categories,
+)
+from .profiling import profile_frame
+from .report import DEFAULT_SECTIONS, ReportConfig, ReportContext, run_report
+from .synth import SyntheticSpec, generate_dataset
+from .viz import histogram_counts, plot_histogram_grid
+
+DEFAULT_SCALES = "1000x10,50000x20,200000x50"
+
+
+@dataclass
+class BenchCase:
+    """Данные одного масштаба: датасет, готовые промежуточные результаты и CSV на диске."""
+
+    df: pd.DataFrame
+    csv_path: Path
+    out_dir: Path
+    summary: Any = None
+    missing_df: Optional[pd.DataFrame] = None
+
+
+@dataclass
+class BenchResult:
+    name: str
+    rows: int
+    cols: int
+    repeat: int
+    min_seconds: float
+    median_seconds: float
+    rows_per_sec: float
+    peak_mib: Optional[float] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def _full_report(case: BenchCase) -> None:
+    case.out_dir.mkdir(parents=True, exist_ok=True)
+    config = ReportConfig(source_name=case.csv_path.name, out_root=case.out_dir)
+    ctx = ReportContext(config, load_frame=lambda: pd.read_csv(case.csv_path))
+    run_report(ctx, [*DEFAULT_SECTIONS, "json"])
+
+
+# Что именно меряем: имя -> функция от подготовленного BenchCase
+BENCHMARKS: Dict[str, Callable[[BenchCase], Any]] = {
+    "summarize_dataset": lambda c: summarize_dataset(c.df),
+    "missing_table": lambda c: missing_table(c.df),
+    "correlation_matrix": lambda c: correlation_matrix(c.df),
+    "top_categories": lambda c: top_categories(c.df),
+    "compute_quality_flags": lambda c: compute_quality_flags(c.summary, c.missing_df),
+    "profile_frame": lambda c: profile_frame(c.df),
+    "histogram_grid": lambda c: plot_histogram_grid(histogram_counts(c.df), c.out_dir),
+    "report": _full_report,
+}
+
+
+def parse_scales(value: str) -> List[Tuple[int, int]]:
+    """'1000x10,50000x20' -> [(1000, 10), (50000, 20)]"""
+    scales = []
+    for part in value.split(","):
+        part = part.strip().lower()
+        if not part:
+            continue
+        rows, sep, cols = part.partition("x")
+        if not sep:
+            raise ValueError(f"Масштаб должен иметь вид ROWSxCOLS, получено: {part!r}")
+        scales.append((int(rows), int(cols)))
+    return scales
+
+
+def _time(func: Callable[[], Any], repeat: int) -> List[float]:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def _peak_mib(func: Callable[[], Any]) -> float:
+    """Пиковое потребление памяти (аллокации Python и NumPy) за один прогон."""
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 2**20
+
+
+def run_benchmarks(
+    scales: Sequence[Tuple[int, int]],
+    spec: Optional[SyntheticSpec] = None,
+    repeat: int = 3,
+    names: Optional[Sequence[str]] = None,
+    measure_memory: bool = True,
+    progress: Optional[Callable[[str], None]] = None,
+) -> Dict[str, Any]:
+    """
+    Прогоняет бенчмарки на синтетических датасетах нескольких масштабов.
+    Время меряется без tracemalloc (он заметно замедляет код), пик памяти –
+    отдельным прогоном. Возвращает JSON-совместимый словарь с метаданными.
+    """
+    base_spec = spec or SyntheticSpec()
+    selected = list(names or BENCHMARKS)
+    unknown = [name for name in selected if name not in BENCHMARKS]
+    if unknown:
+        raise ValueError(f"Неизвестные бенчмарки: {', '.join(unknown)}. Доступны: {', '.join(BENCHMARKS)}")
+
+    results: List[BenchResult] = []
+    with tempfile.TemporaryDirectory(prefix="eda-bench-") as tmp:
+        for rows, cols in scales:
+            scale_spec = replace(base_spec, rows=rows, cols=cols)
+            df = generate_dataset(scale_spec)
+            csv_path = Path(tmp) / f"data_{rows}x{cols}.csv"
+            df.to_csv(csv_path, index=False)
+            case = BenchCase(df=df, csv_path=csv_path, out_dir=Path(tmp) / f"report_{rows}x{cols}")
+            case.summary = summarize_dataset(df)
+            case.missing_df = missing_table(df)
+
+            for name in selected:
+                func = BENCHMARKS[name]
+                timings = _time(lambda: func(case), repeat)
+                best = min(timings)
+                results.append(
+                    BenchResult(
+                        name=name,
+                        rows=rows,
+                        cols=cols,
+                        repeat=repeat,
+                        min_seconds=best,
+                        median_seconds=statistics.median(timings),
+                        rows_per_sec=rows / best if best > 0 else float("inf"),
+                        peak_mib=_peak_mib(lambda: func(case)) if measure_memory else None,
+                    )
+                )
+                if progress is not None:
+                    progress(f"{name} {rows}x{cols}: {best * 1000:.1f} ms")
+
+    return {
+        "meta": {
+            "eda_cli_version": __version__,
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "spec": base_spec.to_dict(),
+        },
+        "results": [r.to_dict() for r in results],
+    }
+
+
+def save_results(results: Dict[str, Any], path: Path) -> None:
+    Path(path).write_text(json.dumps(results, indent=2, ensure_ascii=False), encoding="utf-8")
+
+
+def load_results(path: Path) -> Dict[str, Any]:
+    return json.loads(Path(path).read_text(encoding="utf-8"))
+
+
+def compare_results(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    threshold: float = 0.2,
+) -> pd.DataFrame:
+    """
+    Сравнивает два прогона по (name, rows, cols): отношение min-времени и пика памяти.
+    regression=True, если время выросло больше чем на threshold (0.2 = 20%).
+    """
+    base = pd.DataFrame(baseline["results"]).set_index(["name", "rows", "cols"])
+    cur = pd.DataFrame(current["results"]).set_index(["name", "rows", "cols"])
+    joined = base[["min_seconds", "peak_mib"]].join(
+        cur[["min_seconds", "peak_mib"]], lsuffix="_base", rsuffix="_new", how="inner"
+    )
+    joined["time_ratio"] = joined["min_seconds_new"] / joined["min_seconds_base"]
+    joined["memory_ratio"] = joined["peak_mib_new"] / joined["peak_mib_base"]
+    joined["regression"] = joined["time_ratio"] > 1.0 + threshold
+    return joined.reset_index()
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import monotonic
+from typing import Iterator, Optional
+
+# Кооперативная отмена и дедлайны. Длинные циклы ядра (чанки CSV, секции отчёта)
+# вызывают check_cancelled() между шагами; токен активен в текущем контексте –
+# так же, как трейсер в instrument.use_tracer, поэтому виден и в asyncio.to_thread,
+# и в потоках отчёта (контекст копируется). Без активного токена проверки ничего не стоят.
+
+
+class OperationCancelled(Exception):
+    """Работа прервана: клиент отключился или её отменили явно."""
+
+
+class DeadlineExceeded(OperationCancelled):
+    """Истёк дедлайн: вызывающий может вернуть частичный результат."""
+
+
+class CancelToken:
+    def __init__(self, timeout: Optional[float] = None) -> None:
+        """timeout – секунды до дедлайна от момента создания (None – без дедлайна)."""
+        self.deadline = monotonic() + timeout if timeout is not None else None
+        self.reason: Optional[str] = None
+        self._event = threading.Event()
+
+    def cancel(self, reason: str = "отменено") -> None:
+        self.reason = reason
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    @property
+    def expired(self) -> bool:
+        return self.deadline is not None and monotonic() >= self.deadline
+
+    def remaining(self) -> Optional[float]:
+        return None if self.deadline is None else max(0.0, self.deadline - monotonic())
+
+    def check(self, deadline: bool = True) -> None:
+        """OperationCancelled при отмене, DeadlineExceeded при истёкшем дедлайне (если deadline=True)."""
+        if self._event.is_set():
+            raise OperationCancelled(self.reason)
+        if deadline and self.expired:
+            raise DeadlineExceeded("истёк дедлайн")
+
+
+_current_token: ContextVar[Optional[CancelToken]] = ContextVar("eda_cli_cancel_token", default=None)
+
+
+def current_token() -> Optional[CancelToken]:
+    return _current_token.get()
+
+
+@contextmanager
+def use_cancel_token(token: CancelToken) -> Iterator[CancelToken]:
+    """Делает token активным в текущем контексте (и в контекстах, скопированных из него)."""
+    ctx_token = _current_token.set(token)
+    try:
+        yield token
+    finally:
+        _current_token.reset(ctx_token)
+
+
+def check_cancelled(deadline: bool = True) -> None:
+    """Точка отмены: проверка активного токена; без токена – ничего."""
+    token = _current_token.get()
+    if token is not None:
+        token.check(deadline)
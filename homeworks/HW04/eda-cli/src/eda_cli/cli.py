@@ -1,76 +1,205 @@
 from __future__ import annotations
 
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Iterator, List, Optional, Tuple
 
-import pandas as pd
 import typer
 
-from .core import (
-    DatasetSummary,
-    compute_quality_flags,
-    correlation_matrix,
-    flatten_summary_for_print,
-    missing_table,
-    summarize_dataset,
-    top_categories,
-)
-from .viz import (
-    plot_correlation_heatmap,
-    plot_missing_matrix,
-    plot_histograms_per_column,
-    save_top_categories_tables,
-)
+from .compression import open_source
+from .instrument import Tracer, stage, use_tracer
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+    from .core import DatasetSummary
+    from .shards import ShardProfile
+    from .sniff import CsvDialect
+
+# pandas, matplotlib и модули ядра импортируются внутри команд: `eda-cli --help`
+# и лёгкие команды не платят за загрузку того, что им не нужно
+# (бюджет времени импорта проверяет tests/test_startup.py).
 
 app = typer.Typer(help="Мини-CLI для EDA CSV-файлов")
 
+PROFILE_OPTION_HELP = "Замерить стадии (wall/CPU-время, строки/с, память) и напечатать таблицу."
+TRACE_OUT_OPTION_HELP = "Сохранить замеры стадий в формате Chrome Trace (chrome://tracing, ui.perfetto.dev)."
+SEP_OPTION_HELP = "Разделитель в CSV (по умолчанию определяется автоматически)."
+ENCODING_OPTION_HELP = "Кодировка файла (по умолчанию определяется автоматически)."
+
+
+def _format_stage_table(tracer: Tracer) -> str:
+    table = tracer.to_table()
+    if table.empty:
+        return "нет стадий"
+    columns = ["name", "wall_ms", "cpu_ms", "rows", "rows_per_sec", "rss_delta_mib", "peak_rss_mib", "thread"]
+    return table[columns].round(1).to_string(index=False)
+
+
+@contextmanager
+def _tracing(profile: bool, trace_out: Optional[str], json_path: Optional[Path] = None) -> Iterator[None]:
+    """
+    Включает трейсер для команды, если задан --profile или --trace-out.
+    По завершении печатает таблицу стадий и сохраняет трейс/JSON.
+    """
+    if not profile and not trace_out:
+        yield
+        return
+    tracer = Tracer()
+    with use_tracer(tracer), tracer.stage("total"):
+        yield
+    if profile:
+        typer.echo("\nСтадии:")
+        typer.echo(_format_stage_table(tracer))
+        if json_path is not None:
+            tracer.save_json(json_path)
+            typer.echo(f"Замеры стадий (JSON): {json_path}")
+    if trace_out:
+        tracer.save_chrome_trace(Path(trace_out))
+        typer.echo(f"Chrome-трейс: {trace_out}")
+
+
+def _dialect(path: Path, sep: Optional[str] = None, encoding: Optional[str] = None) -> CsvDialect:
+    """
+    Формат CSV: определяется по первым килобайтам файла (с кэшем по пути и mtime),
+    явно заданные --sep/--encoding имеют приоритет.
+    """
+    from dataclasses import replace
+
+    from .profiling import default_cache_dir
+    from .sniff import sniff_path
 
-def _load_csv(
-    path: Path,
-    sep: str = ",",
-    encoding: str = "utf-8",
-) -> pd.DataFrame:
     if not path.exists():
         raise typer.BadParameter(f"Файл '{path}' не найден")
     try:
-        return pd.read_csv(path, sep=sep, encoding=encoding)
+        with stage("sniff"):
+            dialect = sniff_path(path, cache_dir=default_cache_dir() / "dialects")
+    except OSError as exc:
+        raise typer.BadParameter(f"Не удалось прочитать CSV: {exc}") from exc
+    overrides = {"delimiter": sep, "encoding": encoding}
+    return replace(dialect, **{key: value for key, value in overrides.items() if value is not None})
+
+
+def _load_csv(path: Path, dialect: Optional[CsvDialect] = None) -> pd.DataFrame:
+    import pandas as pd
+
+    if not path.exists():
+        raise typer.BadParameter(f"Файл '{path}' не найден")
+    dialect = dialect or _dialect(path)
+    try:
+        # Сжатые CSV (.gz/.bz2/.zst) распаковываются потоково, без временного файла
+        with stage("parse") as st, open_source(path) as stream:
+            df = pd.read_csv(stream, **dialect.read_csv_kwargs())
+            st["rows"] = len(df)
+            return df
+    except Exception as exc:  # noqa: BLE001
+        raise typer.BadParameter(f"Не удалось прочитать CSV: {exc}") from exc
+
+
+def _profile_shards(
+    path: str,
+    sep: Optional[str],
+    encoding: Optional[str],
+    workers: Optional[int],
+) -> Tuple[List[ShardProfile], CsvDialect]:
+    """Профили шардов и их общий формат (определяется по первому шарду)."""
+    from .shards import expand_sources, profile_shards
+
+    sources = expand_sources(path)
+    if not sources:
+        raise typer.BadParameter(f"По пути '{path}' не найдено ни одного CSV-файла")
+    dialect = _dialect(sources[0], sep, encoding)
+    try:
+        # Шарды профилируются в дочерних процессах – замеряем их целиком
+        with stage("profile_shards") as st:
+            shards = profile_shards(sources, dialect=dialect, workers=workers)
+            st["rows"] = sum(shard.profile.n_rows for shard in shards)
+        return shards, dialect
     except Exception as exc:  # noqa: BLE001
         raise typer.BadParameter(f"Не удалось прочитать CSV: {exc}") from exc
 
 
 @app.command()
 def overview(
-    path: str = typer.Argument(..., help="Путь к CSV-файлу."),
-    sep: str = typer.Option(",", help="Разделитель в CSV."),
-    encoding: str = typer.Option("utf-8", help="Кодировка файла."),
+    path: str = typer.Argument(..., help="Путь к CSV-файлу, каталогу с шардами или glob-маске."),
+    sep: Optional[str] = typer.Option(None, help=SEP_OPTION_HELP),
+    encoding: Optional[str] = typer.Option(None, help=ENCODING_OPTION_HELP),
+    workers: Optional[int] = typer.Option(None, min=1, help="Число процессов для шардов (по умолчанию – число ядер)."),
+    profile: bool = typer.Option(False, "--profile", help=PROFILE_OPTION_HELP),
+    trace_out: Optional[str] = typer.Option(None, help=TRACE_OUT_OPTION_HELP),
+    json_out: Optional[str] = typer.Option(
+        None, help="Сохранить полную сводку по колонкам в JSON (пишется потоково, по колонке)."
+    ),
 ) -> None:
     """
     Напечатать краткий обзор датасета:
     - размеры;
     - типы;
     - простая табличка по колонкам.
+
+    Для каталога/маски шарды профилируются параллельно и сводка объединяется.
     """
-    df = _load_csv(Path(path), sep=sep, encoding=encoding)
-    summary: DatasetSummary = summarize_dataset(df)
-    summary_df = flatten_summary_for_print(summary)
+    from .core import flatten_summary_for_print, summarize_dataset
+    from .shards import is_multi_source, merge_shards, shard_table
 
-    typer.echo(f"Строк: {summary.n_rows}")
-    typer.echo(f"Столбцов: {summary.n_cols}")
-    typer.echo("\nКолонки:")
-    typer.echo(summary_df.to_string(index=False))
+    with _tracing(profile, trace_out):
+        shards: List[ShardProfile] = []
+        if is_multi_source(path):
+            shards, dialect = _profile_shards(path, sep, encoding, workers)
+            summary: DatasetSummary = merge_shards(shards).to_summary()
+        else:
+            dialect = _dialect(Path(path), sep, encoding)
+            df = _load_csv(Path(path), dialect)
+            summary = summarize_dataset(df)
+        summary_df = flatten_summary_for_print(summary)
+
+        typer.echo(f"Формат: {dialect.describe()}")
+        typer.echo(f"Строк: {summary.n_rows}")
+        typer.echo(f"Столбцов: {summary.n_cols}")
+        typer.echo("\nКолонки:")
+        typer.echo(summary_df.to_string(index=False))
+        if shards:
+            typer.echo(f"\nШарды ({len(shards)}):")
+            typer.echo(shard_table(shards).to_string(index=False))
+        if json_out:
+            from .serialize import iter_dataset_summary, write_json_stream
+
+            write_json_stream(Path(json_out), iter_dataset_summary(summary, {"dialect": dialect.to_dict()}))
+            typer.echo(f"\nJSON-сводка: {json_out}")
 
 
 @app.command()
 def report(
-    path: str = typer.Argument(..., help="Путь к CSV-файлу."),
+    path: str = typer.Argument(..., help="Путь к CSV-файлу, каталогу с шардами или glob-маске."),
     out_dir: str = typer.Option("reports", help="Каталог для отчёта."),
-    sep: str = typer.Option(",", help="Разделитель в CSV."),
-    encoding: str = typer.Option("utf-8", help="Кодировка файла."),
+    sep: Optional[str] = typer.Option(None, help=SEP_OPTION_HELP),
+    encoding: Optional[str] = typer.Option(None, help=ENCODING_OPTION_HELP),
     max_hist_columns: int = typer.Option(6, help="Максимум числовых колонок для гистограмм."),
     top_k_categories: int = typer.Option(5, help="Количество top-значений для категориальных признаков."),
     report_title: str = typer.Option("EDA-отчёт", help="Заголовок отчёта."),
     min_missing_share: float = typer.Option(0.1, help="Минимальная доля пропусков для включения в отчёт проблемных колонок."),
+    heatmap_max_columns: int = typer.Option(
+        50, min=2, help="Максимум колонок на тепловой карте корреляции; для более широких данных – см. --heatmap-mode."
+    ),
+    heatmap_mode: str = typer.Option(
+        "top",
+        help="Широкие данные: top – подблок самых коррелирующих колонок, tiles – обзор и плитки (порядок по кластеризации).",
+    ),
+    target: Optional[str] = typer.Option(
+        None, help="Целевая колонка: баланс классов, информативность признаков и подозрения на утечку."
+    ),
     json_summary: bool = typer.Option(False, help="Сохранить JSON-сводку по датасету"),
+    artifact: bool = typer.Option(
+        False, help="Сохранить бинарный артефакт профиля dataset.edaprof (сводка, таблицы, скетчи)."
+    ),
+    sections: Optional[str] = typer.Option(
+        None,
+        help="Секции отчёта через запятую (например, summary,missing). По умолчанию – все, кроме json и artifact.",
+    ),
+    jobs: int = typer.Option(1, min=1, help="Сколько независимых секций считать параллельно."),
+    workers: Optional[int] = typer.Option(None, min=1, help="Число процессов для шардов (по умолчанию – число ядер)."),
+    profile: bool = typer.Option(False, "--profile", help=PROFILE_OPTION_HELP),
+    trace_out: Optional[str] = typer.Option(None, help=TRACE_OUT_OPTION_HELP),
 ) -> None:
     """
     Сгенерировать полный EDA-отчёт:
@@ -79,155 +208,301 @@ def report(
     - корреляционная матрица;
     - top-k категорий по категориальным признакам;
     - картинки: гистограммы, матрица пропусков, heatmap корреляции.
+
+    Считаются только выбранные секции и то, что им нужно.
+    Для каталога/маски сводка собирается из профилей шардов (в пуле процессов),
+    а в отчёт добавляется разбивка по шардам (shards.csv).
     """
-    out_root = Path(out_dir)
-    out_root.mkdir(parents=True, exist_ok=True)
-
-    df = _load_csv(Path(path), sep=sep, encoding=encoding)
-
-    # 1. Обзор
-    summary = summarize_dataset(df)
-    summary_df = flatten_summary_for_print(summary)
-    missing_df = missing_table(df)
-    corr_df = correlation_matrix(df)
-    top_cats = top_categories(df, top_k=top_k_categories)
-
-    # 2. Качество в целом
-    quality_flags = compute_quality_flags(summary, missing_df)
-
-    # 3. Сохраняем табличные артефакты
-    summary_df.to_csv(out_root / "summary.csv", index=False)
-    if not missing_df.empty:
-        missing_df.to_csv(out_root / "missing.csv", index=True)
-    if not corr_df.empty:
-        corr_df.to_csv(out_root / "correlation.csv", index=True)
-    save_top_categories_tables(top_cats, out_root / "top_categories")
-
-    # 4. Markdown-отчёт
-    md_path = out_root / "report.md"
-    with md_path.open("w", encoding="utf-8") as f:
-        f.write(f"# {report_title}\n\n")
-        f.write(f"Исходный файл: `{Path(path).name}`\n\n")
-        f.write(f"Строк: **{summary.n_rows}**, столбцов: **{summary.n_cols}**\n\n")
-
-        f.write("## Качество данных (эвристики)\n\n")
-        f.write(f"- Оценка качества: **{quality_flags['quality_score']:.2f}**\n")
-        f.write(f"- Макс. доля пропусков по колонке: **{quality_flags['max_missing_share']:.2%}**\n")
-        f.write(f"- Слишком мало строк: **{quality_flags['too_few_rows']}**\n")
-        f.write(f"- Слишком много колонок: **{quality_flags['too_many_columns']}**\n")
-        f.write(f"- Слишком много пропусков: **{quality_flags['too_many_missing']}**\n")
-        f.write(f"- Наличие константных колонок: **{quality_flags['has_constant_columns']}**\n")
-        f.write(f"- Наличие категориальных признаков с высокой кардинальностью: **{quality_flags['has_high_cardinality_categoricals']}**\n")
-        f.write(f"- Наличие числовых колонок с большим количеством нулей: **{quality_flags['has_many_zero_values']}**\n")
-        f.write(f"- Наличие подозрительных дубликатов ID: **{quality_flags['has_suspicious_id_duplicates']}**\n\n")
-        
-        f.write(f"## Параметры отчёта\n\n")
-        f.write(f"- Минимальная доля пропусков для проблемных колонок: **{min_missing_share:.2%}**\n")
-        f.write(f"- Количество top-категорий: **{top_k_categories}**\n")
-        f.write(f"- Максимум колонок для гистограмм: **{max_hist_columns}**\n\n")
-
-        f.write("## Колонки\n\n")
-        f.write("См. файл `summary.csv`.\n\n")
-
-        f.write("## Пропуски\n\n")
-        if missing_df.empty:
-            f.write("Пропусков нет или датасет пуст.\n\n")
-        else:
-            f.write("См. файлы `missing.csv` и `missing_matrix.png`.\n\n")
+    from .report import HEATMAP_MODES, ReportConfig, ReportContext, parse_sections, run_report
+    from .shards import is_multi_source, load_shards_frame, merge_shards, shard_table
+    from .target import TargetNotFound
 
-        f.write("## Корреляция числовых признаков\n\n")
-        if corr_df.empty:
-            f.write("Недостаточно числовых колонок для корреляции.\n\n")
-        else:
-            f.write("См. `correlation.csv` и `correlation_heatmap.png`.\n\n")
+    if heatmap_mode not in HEATMAP_MODES:
+        raise typer.BadParameter(f"Допустимо: {', '.join(HEATMAP_MODES)}", param_hint="--heatmap-mode")
+
+    with _tracing(profile, trace_out, json_path=Path(out_dir) / "profile.json"):
+        multi_source = is_multi_source(path)
+        try:
+            section_names = parse_sections(sections)
+        except ValueError as exc:
+            raise typer.BadParameter(str(exc), param_hint="--sections") from exc
+        if json_summary and "json" not in section_names:
+            section_names.append("json")
+        if artifact and "artifact" not in section_names:
+            section_names.append("artifact")
+        if multi_source and sections is None:
+            section_names.append("shards")
 
-        f.write("## Категориальные признаки\n\n")
-        if not top_cats:
-            f.write("Категориальные/строковые признаки не найдены.\n\n")
+        if multi_source:
+            shards, dialect = _profile_shards(path, sep, encoding, workers)
+            sources = [shard.path for shard in shards]
+            load_frame = lambda: load_shards_frame(sources, dialect)  # noqa: E731
+            source_name = path
         else:
-            f.write("См. файлы в папке `top_categories/`.\n\n")
-
-        f.write("## Гистограммы числовых колонок\n\n")
-        f.write("См. файлы `hist_*.png`.\n")
-
-    # 5. Картинки
-    plot_histograms_per_column(df, out_root, max_columns=max_hist_columns)
-    plot_missing_matrix(df, out_root / "missing_matrix.png")
-    plot_correlation_heatmap(df, out_root / "correlation_heatmap.png")
-    
-    # 6. JSON-сводка 
-    if json_summary:
-        import json
-        # Создаём компактную сводку
-        json_summary_data = {
-            "n_rows": summary.n_rows,
-            "n_cols": summary.n_cols,
-            "quality_score": quality_flags["quality_score"],
-            "problematic_columns": []
-        }
-        
-        # Добавляем информацию о проблемных колонках
-        if quality_flags["too_many_missing"]:
-            for col in summary.columns:
-                if col.missing_share > 0.5:
-                    json_summary_data["problematic_columns"].append({
-                        "name": col.name,
-                        "issue": "too_many_missing",
-                        "missing_share": col.missing_share
-                    })
-        
-        if quality_flags["has_constant_columns"]:
-            for col_name in quality_flags["constant_columns"]:
-                json_summary_data["problematic_columns"].append({
-                    "name": col_name,
-                    "issue": "constant_column",
-                    "unique_values": 1
-                })
-        
-        if quality_flags["has_high_cardinality_categoricals"]:
-            for col_name in quality_flags["high_cardinality_categoricals"]:
-                col = next(c for c in summary.columns if c.name == col_name)
-                cardinality_ratio = col.unique / summary.n_rows if summary.n_rows > 0 else 0
-                json_summary_data["problematic_columns"].append({
-                    "name": col_name,
-                    "issue": "high_cardinality",
-                    "cardinality_ratio": cardinality_ratio,
-                    "unique_count": col.unique
-                })
-        
-        if quality_flags["has_many_zero_values"]:
-            for col_name in quality_flags["many_zero_columns"]:
-                col = next(c for c in summary.columns if c.name == col_name)
-                zero_ratio = col.zeros / col.non_null if col.non_null > 0 else 0
-                json_summary_data["problematic_columns"].append({
-                    "name": col_name,
-                    "issue": "many_zero_values",
-                    "zero_ratio": zero_ratio,
-                    "zero_count": col.zeros
-                })
-        
-        if quality_flags["has_suspicious_id_duplicates"]:
-            for col_name in quality_flags["suspicious_id_columns"]:
-                col = next(c for c in summary.columns if c.name == col_name)
-                json_summary_data["problematic_columns"].append({
-                    "name": col_name,
-                    "issue": "suspicious_id_duplicates",
-                    "unique_count": col.unique
-                })
-        
-        # Сохраняем JSON-сводку
-        json_path = out_root / "summary.json"
-        with open(json_path, "w", encoding="utf-8") as f:
-            json.dump(json_summary_data, f, indent=2, ensure_ascii=False)
-        
-        typer.echo(f"- JSON-сводка: {json_path}")
-
-    typer.echo(f"Отчёт сгенерирован в каталоге: {out_root}")
-    typer.echo(f"- Основной markdown: {md_path}")
-    typer.echo("- Табличные файлы: summary.csv, missing.csv, correlation.csv, top_categories/*.csv")
-    typer.echo("- Графики: hist_*.png, missing_matrix.png, correlation_heatmap.png")
-    if json_summary:
-        typer.echo("- JSON-файл: summary.json")
+            source = Path(path)
+            dialect = _dialect(source, sep, encoding)
+            load_frame = lambda: _load_csv(source, dialect)  # noqa: E731
+            source_name = source.name
+
+        out_root = Path(out_dir)
+        out_root.mkdir(parents=True, exist_ok=True)
+
+        config = ReportConfig(
+            source_name=source_name,
+            out_root=out_root,
+            max_hist_columns=max_hist_columns,
+            top_k_categories=top_k_categories,
+            report_title=report_title,
+            min_missing_share=min_missing_share,
+            max_heatmap_columns=heatmap_max_columns,
+            heatmap_mode=heatmap_mode,
+            target=target,
+        )
+        ctx = ReportContext(config, load_frame=load_frame)
+        if multi_source:
+            # Табличные секции берём из объединённого профиля – сырые данные
+            # загрузятся только если запрошены графики или корреляция
+            merged = merge_shards(shards)
+            ctx.results["dataset_profile"] = merged
+            ctx.results["dataset_summary"] = merged.to_summary()
+            ctx.results["missing_df"] = merged.missing_table()
+            ctx.results["top_cats"] = merged.top_categories(top_k=top_k_categories)
+            ctx.results["hist_counts"] = merged.histograms()
+            ctx.results["shard_table"] = shard_table(shards)
+            if target is None:
+                ctx.results["target_profile"] = None
+        try:
+            results = run_report(ctx, section_names, jobs=jobs)
+        except TargetNotFound as exc:
+            raise typer.BadParameter(str(exc), param_hint="--target") from exc
+
+        typer.echo(f"Отчёт сгенерирован в каталоге: {out_root}")
+        for name in section_names:
+            written = ", ".join(str(p.relative_to(out_root)) for p in results[name])
+            typer.echo(f"- {name}: {written or 'нет данных'}")
+
+
+@app.command()
+def diff(
+    old_path: str = typer.Argument(..., help="Путь к «старому» CSV-файлу или артефакту профиля (.edaprof)."),
+    new_path: str = typer.Argument(..., help="Путь к «новому» CSV-файлу или артефакту профиля (.edaprof)."),
+    sep: Optional[str] = typer.Option(None, help=SEP_OPTION_HELP),
+    encoding: Optional[str] = typer.Option(None, help=ENCODING_OPTION_HELP),
+    top_k_categories: int = typer.Option(5, help="Сколько сильнее всего сдвинувшихся категорий показывать."),
+    json_out: Optional[str] = typer.Option(None, help="Сохранить отчёт о дрифте в JSON-файл."),
+    cache: bool = typer.Option(True, help="Переиспользовать профили неизменённых файлов из кэша."),
+    profile: bool = typer.Option(False, "--profile", help=PROFILE_OPTION_HELP),
+    trace_out: Optional[str] = typer.Option(None, help=TRACE_OUT_OPTION_HELP),
+) -> None:
+    """
+    Сравнить два CSV-файла (например, вчерашнюю и сегодняшнюю выгрузку):
+    дрифт по колонкам – PSI, KS, сдвиг долей категорий и доли пропусков.
+
+    Файлы профилируются потоково по очереди, целиком в память не загружаются.
+    Вместо CSV можно передать артефакт профиля (report --artifact) – тогда
+    исходные данные не читаются вовсе.
+    """
+    from .artifact import is_artifact, load_profile
+    from .drift import compare_profiles, flatten_drift_for_print
+    from .profiling import ProfileCache, cached_profile_csv
+
+    with _tracing(profile, trace_out):
+        profile_cache = ProfileCache() if cache else None
+        profiles = []
+        for raw_path in (old_path, new_path):
+            source = Path(raw_path)
+            if not source.exists():
+                raise typer.BadParameter(f"Файл '{source}' не найден")
+            if is_artifact(source):
+                try:
+                    profiles.append(load_profile(source).profile)
+                except (OSError, ValueError) as exc:
+                    raise typer.BadParameter(f"Не удалось прочитать артефакт профиля: {exc}") from exc
+                continue
+            try:
+                dialect = _dialect(source, sep, encoding)
+                profiles.append(cached_profile_csv(source, dialect, cache=profile_cache))
+            except Exception as exc:  # noqa: BLE001
+                raise typer.BadParameter(f"Не удалось прочитать CSV: {exc}") from exc
+
+        drift_report = compare_profiles(profiles[0], profiles[1], top_k=top_k_categories)
+
+        typer.echo(f"Строк: {drift_report.n_rows_old} -> {drift_report.n_rows_new}")
+        typer.echo(f"Колонок с дрифтом: {len(drift_report.drifted_columns)} из {len(drift_report.columns)}")
+        typer.echo("\nКолонки:")
+        typer.echo(flatten_drift_for_print(drift_report).to_string(index=False))
+
+        if json_out:
+            from .serialize import write_json
+
+            write_json(Path(json_out), drift_report.to_dict())
+            typer.echo(f"\nJSON-отчёт о дрифте: {json_out}")
+
+
+@app.command()
+def dashboard(
+    paths: List[str] = typer.Argument(..., help="Артефакты профилей (.edaprof), каталоги с ними или glob-маски."),
+    out: str = typer.Option("dashboard.html", help="Куда записать HTML-дашборд."),
+    title: str = typer.Option("EDA-дашборд", help="Заголовок дашборда."),
+    profile: bool = typer.Option(False, "--profile", help=PROFILE_OPTION_HELP),
+    trace_out: Optional[str] = typer.Option(None, help=TRACE_OUT_OPTION_HELP),
+) -> None:
+    """
+    Собрать один самодостаточный HTML-дашборд по артефактам профилей многих датасетов
+    (report --artifact). Исходные данные не читаются: гистограммы, корреляция
+    и частые значения берутся из артефактов; детали колонок строятся по клику.
+    """
+    from .dashboard import find_artifacts, write_dashboard
+
+    with _tracing(profile, trace_out):
+        artifacts = find_artifacts(paths)
+        if not artifacts:
+            raise typer.BadParameter("Не найдено ни одного артефакта профиля (.edaprof)")
+        try:
+            with stage("dashboard", rows=len(artifacts)):
+                written = write_dashboard(Path(out), artifacts, title=title)
+        except (OSError, ValueError) as exc:
+            raise typer.BadParameter(f"Не удалось прочитать артефакт профиля: {exc}") from exc
+        typer.echo(f"Датасетов: {len(artifacts)}")
+        typer.echo(f"Дашборд: {written}")
+
+
+@app.command()
+def bench(
+    scales: Optional[str] = typer.Option(
+        None, help="Масштабы ROWSxCOLS через запятую (по умолчанию 1000x10,50000x20,200000x50)."
+    ),
+    repeat: int = typer.Option(3, min=1, help="Сколько раз повторять каждый замер (берётся минимум)."),
+    out: str = typer.Option("bench.json", help="Куда сохранить результаты (JSON)."),
+    baseline: Optional[str] = typer.Option(None, help="JSON предыдущего прогона для сравнения."),
+    threshold: float = typer.Option(0.2, help="Допустимый рост времени относительно baseline (0.2 = 20%)."),
+    only: Optional[str] = typer.Option(None, help="Какие бенчмарки запускать, через запятую."),
+    dtype_mix: Optional[str] = typer.Option(None, help="Смесь типов колонок, например int=0.5,category=0.5."),
+    missing_rate: float = typer.Option(0.05, help="Доля пропусков в колонках."),
+    cardinality: int = typer.Option(20, help="Число категорий в категориальных колонках."),
+    zero_share: float = typer.Option(0.1, help="Доля нулей в числовых колонках."),
+    seed: int = typer.Option(0, help="Seed генератора синтетических данных."),
+    memory: bool = typer.Option(True, help="Мерить пиковое потребление памяти."),
+) -> None:
+    """
+    Бенчмарк функций ядра и полного отчёта на синтетических данных нескольких масштабов.
+    С --baseline сравнивает с предыдущим прогоном и завершается с кодом 1 при регрессии.
+    """
+    from .bench import DEFAULT_SCALES, compare_results, load_results, parse_scales, run_benchmarks, save_results
+    from .synth import SyntheticSpec, parse_dtype_mix
+
+    try:
+        spec = SyntheticSpec(
+            missing_rate=missing_rate,
+            cardinality=cardinality,
+            zero_share=zero_share,
+            seed=seed,
+        )
+        if dtype_mix:
+            spec.dtype_mix = parse_dtype_mix(dtype_mix)
+        results = run_benchmarks(
+            parse_scales(scales or DEFAULT_SCALES),
+            spec=spec,
+            repeat=repeat,
+            names=[name.strip() for name in only.split(",")] if only else None,
+            measure_memory=memory,
+            progress=typer.echo,
+        )
+    except ValueError as exc:
+        raise typer.BadParameter(str(exc)) from exc
+
+    save_results(results, Path(out))
+    typer.echo(f"\nРезультаты сохранены: {out}")
+
+    if baseline:
+        comparison = compare_results(load_results(Path(baseline)), results, threshold=threshold)
+        typer.echo("\nСравнение с baseline:")
+        typer.echo(comparison.to_string(index=False))
+        regressions = comparison[comparison["regression"]]
+        if not regressions.empty:
+            typer.echo(f"\nРегрессии: {len(regressions)}")
+            raise typer.Exit(code=1)
+
+
+@app.command()
+def watch(
+    path: str = typer.Argument(..., help="Каталог, куда приходят CSV-файлы (в т.ч. сжатые)."),
+    out_dir: str = typer.Option("reports", help="Куда писать профили и отчёты: по подкаталогу на файл."),
+    interval: float = typer.Option(2.0, min=0.01, help="Период опроса каталога, секунды."),
+    settle: float = typer.Option(
+        2.0, min=0.0, help="Сколько секунд размер и mtime файла не должны меняться, чтобы он считался дописанным."
+    ),
+    workers: Optional[int] = typer.Option(None, min=1, help="Число процессов-воркеров (по умолчанию – число ядер)."),
+    once: bool = typer.Option(False, "--once", help="Обработать то, что уже лежит в каталоге, и выйти."),
+) -> None:
+    """
+    Непрерывно профилировать файлы, появляющиеся в каталоге: для каждого нового
+    или изменённого CSV – dataset.edaprof, summary.json, таблицы и SVG-гистограммы.
+    Дописанные в конец файлы профилируются инкрементально (читается только хвост).
+    """
+    import os
+
+    from .watch import Watcher, WatchResult
+
+    root = Path(path)
+    if not root.is_dir():
+        raise typer.BadParameter(f"Каталог '{path}' не найден")
+
+    def report_result(result: WatchResult) -> None:
+        name = result.path.name
+        if result.mode == "error":
+            typer.echo(f"[ошибка] {name}: {result.state.error}", err=True)
+            return
+        added = f"+{result.new_rows} строк, " if result.mode == "append" else ""
+        typer.echo(
+            f"[{result.mode}] {name}: {added}всего {result.state.n_rows} строк "
+            f"за {result.elapsed:.2f} с -> {result.out_dir}"
+        )
+
+    watcher = Watcher(root, Path(out_dir), workers=workers or os.cpu_count() or 1, settle=settle)
+    typer.echo(f"Наблюдение за {root} (опрос раз в {interval} с, Ctrl+C – выход)")
+    try:
+        watcher.run(interval=interval, on_result=report_result, once=once)
+    except KeyboardInterrupt:
+        typer.echo("Остановлено.")
+
+
+@app.command()
+def serve(
+    host: str = typer.Option("127.0.0.1", help="Адрес, на котором слушать."),
+    port: int = typer.Option(8000, help="Порт."),
+    workers: int = typer.Option(1, min=1, help="Число процессов-воркеров."),
+    warmup: bool = typer.Option(True, help="Прогреть пайплайн в каждом воркере до приёма запросов."),
+    graceful_timeout: int = typer.Option(
+        30, min=1, help="Сколько секунд при остановке ждать незавершённые запросы и задачи."
+    ),
+    log_level: str = typer.Option("info", help="Уровень логов uvicorn и сервиса."),
+) -> None:
+    """
+    Запустить HTTP-сервис качества данных (eda_cli.api:app) в нескольких процессах.
+
+    Каждый воркер до приёма трафика импортирует ядро и делает пробный прогон
+    профилирования. По SIGINT/SIGTERM новые задачи не принимаются, а начатые
+    дорабатываются в пределах --graceful-timeout.
+    """
+    import os
+
+    import uvicorn
+
+    # Воркеры uvicorn – отдельные процессы (spawn), настройки передаём через окружение
+    os.environ["EDA_API_WARMUP"] = "1" if warmup else "0"
+    os.environ["EDA_DRAIN_TIMEOUT"] = str(graceful_timeout)
+    os.environ.setdefault("EDA_LOG_LEVEL", log_level.upper())
+
+    uvicorn.run(
+        "eda_cli.api:app",
+        host=host,
+        port=port,
+        workers=workers,
+        log_level=log_level.lower(),
+        timeout_graceful_shutdown=graceful_timeout,
+        access_log=False,
+    )
 
 
 if __name__ == "__main__":
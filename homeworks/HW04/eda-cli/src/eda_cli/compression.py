@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import bz2
+import gzip
+import io
+import queue
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, BinaryIO, Iterator, Optional, Union
+
+# Сжатые CSV читаются потоково: распаковка идёт блоками прямо в чанковый парсер,
+# без промежуточного файла на диске.
+
+MAGIC_BYTES = {
+    b"\x1f\x8b": "gzip",
+    b"BZh": "bz2",
+    b"\x28\xb5\x2f\xfd": "zstd",
+}
+EXTENSIONS = {
+    ".gz": "gzip",
+    ".gzip": "gzip",
+    ".bz2": "bz2",
+    ".zst": "zstd",
+    ".zstd": "zstd",
+}
+# Маски файлов, которые считаются (возможно, сжатыми) CSV
+CSV_PATTERNS = ("*.csv", "*.csv.gz", "*.csv.bz2", "*.csv.zst")
+
+READ_AHEAD_BLOCK = 1 << 20
+READ_AHEAD_DEPTH = 4
+# zstd распаковывается быстрее, чем парсится CSV, – передача блоков между потоками
+# ему только мешает; фоновая распаковка нужна медленным gzip/bz2
+READ_AHEAD_CODECS = ("gzip", "bz2")
+
+Source = Union[str, Path, IO[bytes], IO[str]]
+
+
+def compression_from_name(name: str) -> Optional[str]:
+    return EXTENSIONS.get(Path(name).suffix.lower())
+
+
+def compression_from_magic(header: bytes) -> Optional[str]:
+    for magic, codec in MAGIC_BYTES.items():
+        if header.startswith(magic):
+            return codec
+    return None
+
+
+def _peek_header(stream: BinaryIO, size: int = 4) -> bytes:
+    if hasattr(stream, "peek"):
+        return stream.peek(size)[:size]
+    if stream.seekable():
+        pos = stream.tell()
+        header = stream.read(size)
+        stream.seek(pos)
+        return header
+    return b""
+
+
+def _zstd_reader(stream: BinaryIO) -> BinaryIO:
+    try:
+        import zstandard
+    except ImportError as exc:  # опциональная зависимость
+        raise ValueError(
+            "Для чтения .zst нужен пакет zstandard: uv sync --extra zstd (или pip install zstandard)"
+        ) from exc
+    return zstandard.ZstdDecompressor().stream_reader(stream, read_size=READ_AHEAD_BLOCK, closefd=False)
+
+
+def _decompressor(stream: BinaryIO, codec: str) -> BinaryIO:
+    if codec == "gzip":
+        return gzip.GzipFile(fileobj=stream, mode="rb")
+    if codec == "bz2":
+        return bz2.BZ2File(stream, mode="rb")
+    if codec == "zstd":
+        return _zstd_reader(stream)
+    raise ValueError(f"Неизвестный формат сжатия: {codec}")
+
+
+class ReadAheadReader(io.RawIOBase):
+    """
+    Распаковка в фоновом потоке: пока парсер разбирает очередной чанк,
+    следующий блок уже распаковывается (zlib и bz2 отпускают GIL).
+    Очередь ограничена, так что памяти занято не больше depth блоков.
+    """
+
+    def __init__(self, raw: BinaryIO, block_size: int = READ_AHEAD_BLOCK, depth: int = READ_AHEAD_DEPTH) -> None:
+        super().__init__()
+        self._raw = raw
+        self._block_size = block_size
+        self._queue: "queue.Queue[object]" = queue.Queue(maxsize=depth)
+        self._stop = threading.Event()
+        self._buffer = memoryview(b"")
+        self._eof = False
+        self._thread = threading.Thread(target=self._pump, name="eda-read-ahead", daemon=True)
+        self._thread.start()
+
+    def _put(self, item: object) -> bool:
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _pump(self) -> None:
+        try:
+            while True:
+                block = self._raw.read(self._block_size)
+                if not self._put(block) or not block:
+                    return
+        except BaseException as exc:  # noqa: BLE001 – передаём ошибку читающему потоку
+            self._put(exc)
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        while not self._buffer and not self._eof:
+            item = self._queue.get()
+            if isinstance(item, BaseException):
+                raise item
+            if not item:
+                self._eof = True
+            else:
+                self._buffer = memoryview(item)
+        n = min(len(b), len(self._buffer))
+        b[:n] = self._buffer[:n]
+        self._buffer = self._buffer[n:]
+        return n
+
+    def close(self) -> None:
+        if not self.closed:
+            self._stop.set()
+            self._thread.join()
+            self._raw.close()
+        super().close()
+
+
+@contextmanager
+def open_source(
+    source: Source,
+    compression: Optional[str] = "infer",
+    name: Optional[str] = None,
+    read_ahead: bool = True,
+) -> Iterator[IO]:
+    """
+    Открывает CSV-источник (путь или file-like) и возвращает поток уже
+    распакованных байт. compression="infer" – по расширению имени, а если
+    оно ничего не говорит – по первым байтам (magic bytes).
+    Закрывает только то, что открыла сама; чужой file-like остаётся открытым.
+    """
+    if isinstance(source, io.TextIOBase):
+        yield source
+        return
+
+    owned = isinstance(source, (str, Path))
+    stream: BinaryIO = open(source, "rb") if owned else source  # type: ignore[assignment]
+    try:
+        codec = compression
+        if codec == "infer":
+            label = name or (str(source) if owned else getattr(source, "name", "")) or ""
+            codec = compression_from_name(str(label)) or compression_from_magic(_peek_header(stream))
+        if not codec:
+            yield stream
+            return
+
+        reader = _decompressor(stream, codec)
+        if read_ahead and codec in READ_AHEAD_CODECS:
+            reader = io.BufferedReader(ReadAheadReader(reader), buffer_size=1 << 16)
+        try:
+            yield reader
+        finally:
+            reader.close()
+    finally:
+        if owned:
+            stream.close()
@@ -1,11 +1,20 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, asdict
-from typing import Any, Dict, List, Optional, Sequence
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Sequence
 
+import numpy as np
 import pandas as pd
 from pandas.api import types as ptypes
 
+from .instrument import traced
+from .temporal import profile_temporal
+from .text import profile_text
+
+if TYPE_CHECKING:
+    from .target import TargetProfile
+
 
 @dataclass
 class ColumnSummary:
@@ -22,6 +31,9 @@ class ColumnSummary:
     max: Optional[float] = None
     mean: Optional[float] = None
     std: Optional[float] = None
+    text: Optional[Dict[str, Any]] = None  # статистика строк (text.TextProfile) для текстовых колонок
+    temporal: Optional[Dict[str, Any]] = None  # профиль дат (temporal.TemporalProfile), если колонка – даты
+    approximate: bool = False  # unique/top посчитаны не по всем значениям (тип менялся между частями файла)
 
     def to_dict(self) -> Dict[str, Any]:
         return asdict(self)
@@ -41,6 +53,49 @@ class DatasetSummary:
         }
 
 
+# Первый блок при поиске примеров; каждый следующий больше в EXAMPLE_BLOCK_GROWTH раз
+EXAMPLE_BLOCK_ROWS = 256
+EXAMPLE_BLOCK_GROWTH = 4
+
+
+def example_values(s: pd.Series, k: int = 3, exclude: Iterable[str] = ()) -> List[str]:
+    """
+    Первые k различных непустых значений колонки (в порядке появления) как строки.
+
+    Колонка просматривается блоками растущего размера с ранним выходом: в строки
+    переводятся только уникальные значения просмотренных блоков, а не вся колонка.
+    Значения из exclude (уже найденные ранее, например в прошлых чанках) пропускаются.
+    """
+    seen = set(exclude)
+    found: List[str] = []
+    start, block = 0, EXAMPLE_BLOCK_ROWS
+    while start < len(s) and len(found) < k:
+        uniques = s.iloc[start : start + block].dropna().drop_duplicates()
+        # Разные значения могут давать одинаковую строку (1 и "1"), поэтому по k за раз
+        for pos in range(0, len(uniques), k):
+            for text in uniques.iloc[pos : pos + k].astype(str):
+                if text not in seen:
+                    seen.add(text)
+                    found.append(text)
+                    if len(found) == k:
+                        return found
+        start += block
+        block *= EXAMPLE_BLOCK_GROWTH
+    return found
+
+
+# Доля значений класса (по выборке), начиная с которой колонка считается «числами/датами в строках»
+TEXT_TYPE_SHARE = 0.95
+# Доля пустых строк и строк из пробелов, начиная с которой это считается проблемой
+BLANK_STRING_SHARE = 0.1
+# Даты: данные «устарели», если последняя дата старше STALE_AFTER_DAYS дней;
+# разрыв – от GAP_MIN_DAYS дней и в GAP_FACTOR раз длиннее среднего шага между днями с данными
+STALE_AFTER_DAYS = 30
+GAP_MIN_DAYS = 7
+GAP_FACTOR = 5.0
+
+
+@traced()
 def summarize_dataset(
     df: pd.DataFrame,
     example_values_per_column: int = 3,
@@ -67,11 +122,7 @@ def summarize_dataset(
         unique = int(s.nunique(dropna=True))
 
         # Примерные значения выводим как строки
-        examples = (
-            s.dropna().astype(str).unique()[:example_values_per_column].tolist()
-            if non_null > 0
-            else []
-        )
+        examples = example_values(s, example_values_per_column) if non_null > 0 else []
 
         is_numeric = bool(ptypes.is_numeric_dtype(s))
         min_val: Optional[float] = None
@@ -89,6 +140,9 @@ def summarize_dataset(
         else:
             zeros = 0
 
+        text_stats = profile_text(s) if not is_numeric and non_null > 0 else None
+        temporal_stats = profile_temporal(s) if not is_numeric and non_null > 0 else None
+
         columns.append(
             ColumnSummary(
                 name=name,
@@ -104,12 +158,15 @@ def summarize_dataset(
                 max=max_val,
                 mean=mean_val,
                 std=std_val,
+                text=text_stats,
+                temporal=temporal_stats,
             )
         )
 
     return DatasetSummary(n_rows=n_rows, n_cols=n_cols, columns=columns)
 
 
+@traced()
 def missing_table(df: pd.DataFrame) -> pd.DataFrame:
     """
     Таблица пропусков по колонкам: count/share.
@@ -131,6 +188,7 @@ def missing_table(df: pd.DataFrame) -> pd.DataFrame:
     return result
 
 
+@traced()
 def correlation_matrix(df: pd.DataFrame) -> pd.DataFrame:
     """
     Корреляция Пирсона для числовых колонок.
@@ -141,6 +199,71 @@ def correlation_matrix(df: pd.DataFrame) -> pd.DataFrame:
     return numeric_df.corr(numeric_only=True)
 
 
+def strongest_correlated(corr: pd.DataFrame, max_columns: int) -> List[str]:
+    """
+    max_columns колонок матрицы corr с наибольшим |r| к какой-нибудь другой колонке
+    (в исходном порядке). Для узких матриц – все колонки.
+    """
+    columns = list(corr.columns)
+    if len(columns) <= max_columns:
+        return columns
+    off_diagonal = np.abs(corr.to_numpy(dtype="float64"))
+    np.fill_diagonal(off_diagonal, np.nan)
+    all_nan = np.isnan(off_diagonal).all(axis=1)
+    off_diagonal[all_nan] = 0.0
+    strength = np.nan_to_num(np.nanmax(off_diagonal, axis=1), nan=0.0)
+    keep = np.sort(np.argsort(-strength, kind="stable")[:max_columns])
+    return [columns[i] for i in keep]
+
+
+@traced()
+def cluster_order(corr: pd.DataFrame) -> List[str]:
+    """
+    Порядок колонок по иерархической кластеризации (средняя связь, расстояние 1 - |r|):
+    сильно связанные колонки оказываются рядом, и на тепловой карте видны блоки.
+    NN-chain – O(p^2) по времени и памяти, без scipy; NaN считается нулевой корреляцией.
+    """
+    columns = list(corr.columns)
+    n = len(columns)
+    if n < 3:
+        return columns
+    dist = 1.0 - np.abs(np.nan_to_num(corr.to_numpy(dtype="float64"), nan=0.0))
+    np.fill_diagonal(dist, np.inf)
+    size = np.ones(n)
+    members: List[List[int]] = [[i] for i in range(n)]
+    chain: List[int] = []
+    remaining = n
+
+    while remaining > 1:
+        if not chain:
+            chain.append(next(i for i in range(n) if members[i]))
+        a = chain[-1]
+        b = int(np.argmin(dist[a]))
+        # При равенстве расстояний предпочитаем предыдущий элемент цепочки – иначе цикл
+        if len(chain) > 1 and dist[a, chain[-2]] <= dist[a, b]:
+            b = chain[-2]
+        if len(chain) < 2 or b != chain[-2]:
+            chain.append(b)
+            continue
+
+        # a и b – взаимные ближайшие соседи: сливаем b в a (формула Ланса – Уильямса)
+        chain.pop()
+        chain.pop()
+        merged = (size[a] * dist[a] + size[b] * dist[b]) / (size[a] + size[b])
+        dist[a, :] = merged
+        dist[:, a] = merged
+        dist[b, :] = np.inf
+        dist[:, b] = np.inf
+        dist[a, a] = np.inf
+        size[a] += size[b]
+        members[a] = members[a] + members[b]
+        members[b] = []
+        remaining -= 1
+
+    return [columns[i] for i in next(m for m in members if m)]
+
+
+@traced()
 def top_categories(
     df: pd.DataFrame,
     max_columns: int = 5,
@@ -176,12 +299,19 @@ def top_categories(
     return result
 
 
-def compute_quality_flags(summary: DatasetSummary, missing_df: pd.DataFrame) -> Dict[str, Any]:
+@traced()
+def compute_quality_flags(
+    summary: DatasetSummary,
+    missing_df: pd.DataFrame,
+    target: Optional[TargetProfile] = None,
+) -> Dict[str, Any]:
     """
     Простейшие эвристики «качества» данных:
     - слишком много пропусков;
     - подозрительно мало строк;
     и т.п.
+    С target (target.profile_target) добавляются флаги готовности к обучению:
+    пропуски в таргете, дисбаланс классов, подозрения на утечку.
     """
     flags: Dict[str, Any] = {}
     flags["too_few_rows"] = summary.n_rows < 100
@@ -233,6 +363,71 @@ def compute_quality_flags(summary: DatasetSummary, missing_df: pd.DataFrame) ->
     flags["has_suspicious_id_duplicates"] = len(suspicious_id_duplicates) > 0
     flags["suspicious_id_columns"] = suspicious_id_duplicates
 
+    # Текстовые колонки: числа и даты, записанные строками, пустые строки, битая кодировка
+    numeric_as_text = []
+    date_as_text = []
+    blank_string_columns = []
+    encoding_anomaly_columns = []
+    for col in summary.columns:
+        if not col.text:
+            continue
+        if col.text["numeric_like_share"] >= TEXT_TYPE_SHARE:
+            numeric_as_text.append(col.name)
+        elif col.text["date_like_share"] >= TEXT_TYPE_SHARE:
+            date_as_text.append(col.name)
+        if (col.text["empty"] + col.text["whitespace_only"]) / col.text["count"] > BLANK_STRING_SHARE:
+            blank_string_columns.append(col.name)
+        if col.text["encoding_anomaly_share"] > 0:
+            encoding_anomaly_columns.append(col.name)
+
+    flags["has_numeric_stored_as_text"] = len(numeric_as_text) > 0
+    flags["numeric_as_text_columns"] = numeric_as_text
+    flags["has_dates_stored_as_text"] = len(date_as_text) > 0
+    flags["date_as_text_columns"] = date_as_text
+    flags["has_blank_strings"] = len(blank_string_columns) > 0
+    flags["blank_string_columns"] = blank_string_columns
+    flags["has_encoding_anomalies"] = len(encoding_anomaly_columns) > 0
+    flags["encoding_anomaly_columns"] = encoding_anomaly_columns
+
+    # Колонки дат: давно не обновлялись, есть длинные разрывы, даты-заглушки или из будущего
+    stale_columns = []
+    gapped_columns = []
+    sentinel_columns = []
+    # max в профиле – наивное время в UTC, поэтому и «сейчас» берём в UTC
+    stale_before = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=STALE_AFTER_DAYS)
+    for col in summary.columns:
+        temporal = col.temporal
+        if not temporal:
+            continue
+        if temporal["max"] is not None and datetime.fromisoformat(temporal["max"]) < stale_before:
+            stale_columns.append(col.name)
+        if temporal["days_with_rows"] > 1:
+            typical_step = temporal["span_days"] / (temporal["days_with_rows"] - 1)
+            if temporal["max_gap_days"] >= max(GAP_MIN_DAYS, GAP_FACTOR * typical_step):
+                gapped_columns.append(col.name)
+        if temporal["future"] + temporal["sentinel"] > 0:
+            sentinel_columns.append(col.name)
+
+    flags["has_stale_datetime_columns"] = len(stale_columns) > 0
+    flags["stale_datetime_columns"] = stale_columns
+    flags["has_datetime_gaps"] = len(gapped_columns) > 0
+    flags["datetime_gap_columns"] = gapped_columns
+    flags["has_datetime_sentinels"] = len(sentinel_columns) > 0
+    flags["datetime_sentinel_columns"] = sentinel_columns
+
+    # Таргет: размеченные строки, баланс классов, признаки с почти детерминированной связью
+    if target is not None:
+        from .target import IMBALANCE_RATIO
+
+        imbalance_ratio = target.imbalance_ratio()
+        flags["target"] = target.name
+        flags["has_missing_target"] = target.missing > 0
+        flags["has_constant_target"] = int((target.class_counts > 0).sum()) <= 1
+        flags["has_class_imbalance"] = imbalance_ratio is not None and imbalance_ratio > IMBALANCE_RATIO
+        flags["leakage_columns"] = target.leakage_columns()
+        flags["has_leakage_suspects"] = len(flags["leakage_columns"]) > 0
+        flags["target_profile"] = target.to_dict()
+
     # Простейший «скор» качества
     score = 1.0
     score -= max_missing_share  # чем больше пропусков, тем хуже
@@ -250,6 +445,21 @@ def compute_quality_flags(summary: DatasetSummary, missing_df: pd.DataFrame) ->
         score -= 0.1
     if flags["has_suspicious_id_duplicates"]:
         score -= 0.1
+    if flags["has_numeric_stored_as_text"]:
+        score -= 0.05
+    if flags["has_encoding_anomalies"]:
+        score -= 0.05
+    if flags["has_datetime_sentinels"]:
+        score -= 0.05
+    if target is not None:
+        if flags["has_constant_target"]:
+            score -= 0.3
+        if flags["has_leakage_suspects"]:
+            score -= 0.2
+        if flags["has_class_imbalance"]:
+            score -= 0.1
+        if flags["has_missing_target"]:
+            score -= 0.05
 
     score = max(0.0, min(1.0, score))
     flags["quality_score"] = score
@@ -257,6 +467,122 @@ def compute_quality_flags(summary: DatasetSummary, missing_df: pd.DataFrame) ->
     return flags
 
 
+def build_json_summary(summary: DatasetSummary, quality_flags: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Компактная JSON-сводка по датасету (то, что пишется в summary.json
+    и отдаётся эндпоинтом /summary-from-csv):
+    размеры, оценка качества и список проблемных колонок.
+    """
+    json_summary_data: Dict[str, Any] = {
+        "n_rows": summary.n_rows,
+        "n_cols": summary.n_cols,
+        "quality_score": float(quality_flags["quality_score"]),
+        "problematic_columns": [],
+    }
+    problematic: List[Dict[str, Any]] = json_summary_data["problematic_columns"]
+    by_name = {c.name: c for c in summary.columns}
+
+    if quality_flags["too_many_missing"]:
+        for col in summary.columns:
+            if col.missing_share > 0.5:
+                problematic.append({
+                    "name": col.name,
+                    "issue": "too_many_missing",
+                    "missing_share": col.missing_share,
+                })
+
+    if quality_flags["has_constant_columns"]:
+        for col_name in quality_flags["constant_columns"]:
+            problematic.append({
+                "name": col_name,
+                "issue": "constant_column",
+                "unique_values": 1,
+            })
+
+    if quality_flags["has_high_cardinality_categoricals"]:
+        for col_name in quality_flags["high_cardinality_categoricals"]:
+            col = by_name[col_name]
+            cardinality_ratio = col.unique / summary.n_rows if summary.n_rows > 0 else 0
+            problematic.append({
+                "name": col_name,
+                "issue": "high_cardinality",
+                "cardinality_ratio": cardinality_ratio,
+                "unique_count": col.unique,
+            })
+
+    if quality_flags["has_many_zero_values"]:
+        for col_name in quality_flags["many_zero_columns"]:
+            col = by_name[col_name]
+            zero_ratio = col.zeros / col.non_null if col.non_null > 0 else 0
+            problematic.append({
+                "name": col_name,
+                "issue": "many_zero_values",
+                "zero_ratio": zero_ratio,
+                "zero_count": col.zeros,
+            })
+
+    if quality_flags["has_suspicious_id_duplicates"]:
+        for col_name in quality_flags["suspicious_id_columns"]:
+            col = by_name[col_name]
+            problematic.append({
+                "name": col_name,
+                "issue": "suspicious_id_duplicates",
+                "unique_count": col.unique,
+            })
+
+    text_issues = (
+        ("numeric_as_text_columns", "numeric_stored_as_text", "numeric_like_share"),
+        ("date_as_text_columns", "date_stored_as_text", "date_like_share"),
+        ("encoding_anomaly_columns", "encoding_anomalies", "encoding_anomaly_share"),
+    )
+    for flag_name, issue, share_key in text_issues:
+        for col_name in quality_flags.get(flag_name, []):
+            problematic.append({
+                "name": col_name,
+                "issue": issue,
+                share_key: by_name[col_name].text[share_key],
+            })
+    for col_name in quality_flags.get("stale_datetime_columns", []):
+        problematic.append({
+            "name": col_name,
+            "issue": "stale_datetime",
+            "max": by_name[col_name].temporal["max"],
+        })
+    for col_name in quality_flags.get("datetime_gap_columns", []):
+        temporal = by_name[col_name].temporal
+        problematic.append({
+            "name": col_name,
+            "issue": "datetime_gaps",
+            "max_gap_days": temporal["max_gap_days"],
+            "max_gap_start": temporal["max_gap_start"],
+        })
+    for col_name in quality_flags.get("datetime_sentinel_columns", []):
+        temporal = by_name[col_name].temporal
+        problematic.append({
+            "name": col_name,
+            "issue": "datetime_sentinels",
+            "future": temporal["future"],
+            "sentinel": temporal["sentinel"],
+        })
+    target_profile = quality_flags.get("target_profile")
+    for col_name in quality_flags.get("leakage_columns", []):
+        problematic.append({
+            "name": col_name,
+            "issue": "target_leakage",
+            "mutual_info": target_profile["mutual_info"][col_name],
+            "correlation": target_profile["correlation"].get(col_name),
+        })
+    for col_name in quality_flags.get("blank_string_columns", []):
+        text = by_name[col_name].text
+        problematic.append({
+            "name": col_name,
+            "issue": "blank_strings",
+            "blank_share": (text["empty"] + text["whitespace_only"]) / text["count"],
+        })
+
+    return json_summary_data
+
+
 def flatten_summary_for_print(summary: DatasetSummary) -> pd.DataFrame:
     """
     Превращает DatasetSummary в табличку для более удобного вывода.
@@ -0,0 +1,330 @@
+from __future__ import annotations
+
+import base64
+import glob
+import html
+import math
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .artifact import ARTIFACT_SUFFIX, ProfileArtifact, is_artifact, load_profile
+from .core import build_json_summary, compute_quality_flags, strongest_correlated
+from .serialize import dumps
+
+# HTML-дашборд по артефактам профилей (*.edaprof) сразу для многих датасетов.
+# Исходные данные не читаются: гистограммы, корреляция и top-значения берутся
+# из артефактов. Файл самодостаточный (без внешних скриптов и картинок).
+# Чтобы отчёт на тысячи колонок открывался сразу, данные каждого датасета лежат
+# в отдельном <script type="application/json"> и разбираются только при открытии
+# датасета; таблица колонок рисуется страницами, детали колонки – по клику.
+
+TOP_VALUES = 10
+MAX_CORR_COLUMNS = 1000  # шире – в дашборд попадают колонки с самыми сильными связями
+
+
+def find_artifacts(paths: Sequence[str]) -> List[Path]:
+    """Артефакты по путям: файл, каталог (рекурсивно *.edaprof) или glob-маска; без повторов."""
+    found: List[Path] = []
+    for raw in paths:
+        path = Path(raw)
+        if path.is_dir():
+            candidates = sorted(path.rglob(f"*{ARTIFACT_SUFFIX}"))
+        elif path.exists():
+            candidates = [path]
+        else:
+            candidates = [Path(p) for p in sorted(glob.glob(raw, recursive=True))]
+        for candidate in candidates:
+            if candidate.is_file() and candidate not in found and is_artifact(candidate):
+                found.append(candidate)
+    return found
+
+
+def dataset_name(path: Path, artifact: ProfileArtifact) -> str:
+    """Имя датасета: источник из meta (report пишет его туда), иначе – по пути."""
+    source = artifact.meta.get("source")
+    if source:
+        return str(source)
+    # report кладёт артефакт как <каталог отчёта>/dataset.edaprof – имя каталога информативнее
+    return path.parent.name if path.stem == "dataset" and path.parent.name else path.stem
+
+
+def _num(value: Any, digits: int = 6) -> Optional[float]:
+    """Число для JSON: NaN/inf и None – null (JSON.parse не понимает NaN)."""
+    if value is None:
+        return None
+    value = float(value)
+    return round(value, digits) if math.isfinite(value) else None
+
+
+def _encode_correlation(corr: pd.DataFrame, max_columns: int = MAX_CORR_COLUMNS) -> Optional[Dict[str, Any]]:
+    """
+    Матрица корреляций в компактном виде: int8 (r * 127, NaN – -128) в base64.
+    Для очень широких данных остаются max_columns колонок с наибольшим |r| к остальным.
+    """
+    if corr.empty:
+        return None
+    keep = strongest_correlated(corr, max_columns)
+    values = corr.loc[keep, keep].to_numpy(dtype="float64")
+    columns = [str(name) for name in keep]
+    quantized = np.where(np.isnan(values), -128, np.rint(np.clip(values, -1.0, 1.0) * 127)).astype("int8")
+    return {
+        "columns": columns,
+        "n_total": int(corr.shape[1]),
+        "b64": base64.b64encode(quantized.tobytes()).decode("ascii"),
+    }
+
+
+def _dataset_data(index: int, name: str, path: Path, artifact: ProfileArtifact) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """(строка сводной таблицы, детальные данные датасета) для дашборда."""
+    summary = artifact.summary
+    flags = compute_quality_flags(summary, artifact.missing)
+    issues: Dict[str, List[str]] = {}
+    for item in build_json_summary(summary, flags)["problematic_columns"]:
+        issues.setdefault(item["name"], []).append(item["issue"])
+
+    entry = {
+        "id": index,
+        "name": name,
+        "path": str(path),
+        "n_rows": summary.n_rows,
+        "n_cols": summary.n_cols,
+        "quality_score": _num(flags["quality_score"], 3),
+        "max_missing_share": _num(flags["max_missing_share"], 4),
+        "flags": sorted(key for key, value in flags.items() if value is True),
+        "n_problem_columns": len(issues),
+    }
+
+    columns = [
+        [
+            col.name,
+            col.dtype,
+            _num(col.missing_share, 4),
+            col.unique,
+            _num(col.min),
+            _num(col.max),
+            _num(col.mean),
+            _num(col.std),
+            col.is_numeric,
+        ]
+        for col in summary.columns
+    ]
+    histograms = {
+        name: [_num(edges[0]), _num(edges[-1]), *(int(c) for c in counts)]
+        for name, (counts, edges) in artifact.histograms.items()
+    }
+    top = {}
+    for col in artifact.profile.columns.values():
+        if not col.is_numeric:
+            values = col.top.top(TOP_VALUES)
+            if values:
+                top[col.name] = [[str(value), int(count)] for value, count in values]
+
+    detail = {
+        "columns": columns,
+        "hist": histograms,
+        "top": top,
+        "issues": issues,
+        "corr": _encode_correlation(artifact.correlation),
+    }
+    return entry, detail
+
+
+def _json_script(element_id: str, data: Any) -> str:
+    # "</" внутри JSON закрыл бы тег script раньше времени
+    payload = dumps(data).decode("utf-8").replace("</", "<\\/")
+    return f'<script type="application/json" id="{element_id}">{payload}</script>'
+
+
+def build_dashboard(datasets: Sequence[Tuple[Path, ProfileArtifact]], title: str = "EDA-дашборд") -> str:
+    """HTML-дашборд по уже загруженным артефактам [(путь, артефакт), ...]."""
+    index = []
+    blocks = []
+    for i, (path, artifact) in enumerate(datasets):
+        entry, detail = _dataset_data(i, dataset_name(path, artifact), path, artifact)
+        index.append(entry)
+        blocks.append(_json_script(f"ds-{i}", detail))
+    return (
+        _TEMPLATE.replace("{{title}}", html.escape(title))
+        .replace("{{index}}", _json_script("index", index))
+        .replace("{{datasets}}", "\n".join(blocks))
+    )
+
+
+def write_dashboard(out_path: Path, artifact_paths: Sequence[Path], title: str = "EDA-дашборд") -> Path:
+    """Загружает артефакты (mmap, без исходных данных) и пишет дашборд в out_path."""
+    datasets = [(Path(p), load_profile(Path(p))) for p in artifact_paths]
+    out_path = Path(out_path)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    out_path.write_text(build_dashboard(datasets, title), encoding="utf-8")
+    return out_path
+
+
+_TEMPLATE = """<!DOCTYPE html>
+<html lang="ru">
+<head>
+<meta charset="utf-8">
+<title>{{title}}</title>
+<style>
+body { font: 14px/1.4 system-ui, sans-serif; margin: 0; color: #222; }
+header { padding: 12px 20px; background: #2f3e4e; color: #fff; }
+header h1 { margin: 0; font-size: 20px; }
+main { padding: 16px 20px; }
+table { border-collapse: collapse; width: 100%; }
+th, td { padding: 4px 8px; border-bottom: 1px solid #e4e4e4; text-align: left; white-space: nowrap; }
+th { background: #f4f6f8; position: sticky; top: 0; }
+tr.clickable { cursor: pointer; }
+tr.clickable:hover { background: #eef4fb; }
+tr.problem td:first-child { border-left: 3px solid #d9534f; }
+.num { text-align: right; font-variant-numeric: tabular-nums; }
+.score-good { color: #2e7d32; } .score-mid { color: #ef6c00; } .score-bad { color: #c62828; }
+.layout { display: flex; gap: 20px; align-items: flex-start; }
+.columns { flex: 1 1 60%; max-height: 75vh; overflow: auto; }
+.detail { flex: 1 1 40%; position: sticky; top: 10px; }
+.tag { display: inline-block; background: #fdecea; color: #a33; border-radius: 3px; padding: 0 5px; margin: 1px; font-size: 12px; }
+.muted { color: #888; }
+button, input { font: inherit; }
+#back { margin-bottom: 10px; }
+canvas { image-rendering: pixelated; border: 1px solid #ddd; }
+</style>
+</head>
+<body>
+<header><h1>{{title}}</h1></header>
+<main id="app"></main>
+{{index}}
+{{datasets}}
+<script>
+"use strict";
+const PAGE = 200;
+const INDEX = JSON.parse(document.getElementById("index").textContent);
+const cache = {};
+const app = document.getElementById("app");
+
+function esc(s) {
+  return String(s).replace(/[&<>"']/g, c => ({"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;", "'": "&#39;"}[c]));
+}
+function fmt(x, digits) {
+  if (x === null || x === undefined) return "";
+  if (typeof x !== "number") return esc(x);
+  if (digits === 0) return x.toLocaleString("ru-RU", {maximumFractionDigits: 0});
+  return Math.abs(x) >= 1e6 || (x !== 0 && Math.abs(x) < 1e-3) ? x.toExponential(2) : x.toLocaleString("ru-RU", {maximumFractionDigits: digits === undefined ? 3 : digits});
+}
+function pct(x) { return x === null ? "" : (x * 100).toFixed(1) + "%"; }
+function scoreClass(s) { return s >= 0.7 ? "score-good" : s >= 0.4 ? "score-mid" : "score-bad"; }
+function dataset(id) {
+  // Данные датасета разбираются только при первом открытии
+  if (!cache[id]) cache[id] = JSON.parse(document.getElementById("ds-" + id).textContent);
+  return cache[id];
+}
+
+function renderIndex() {
+  let rows = INDEX.map(d => `<tr class="clickable" data-id="${d.id}">
+    <td>${esc(d.name)}</td><td class="num">${fmt(d.n_rows, 0)}</td><td class="num">${fmt(d.n_cols, 0)}</td>
+    <td class="num ${scoreClass(d.quality_score)}">${fmt(d.quality_score, 2)}</td>
+    <td class="num">${pct(d.max_missing_share)}</td><td class="num">${d.n_problem_columns}</td>
+    <td>${d.flags.map(f => `<span class="tag">${esc(f)}</span>`).join("")}</td></tr>`).join("");
+  app.innerHTML = `<p class="muted">Датасетов: ${INDEX.length}</p>
+    <table><thead><tr><th>Датасет</th><th>Строк</th><th>Колонок</th><th>Качество</th>
+    <th>Макс. пропусков</th><th>Проблемных колонок</th><th>Флаги</th></tr></thead><tbody>${rows}</tbody></table>`;
+  app.querySelectorAll("tr[data-id]").forEach(tr => tr.onclick = () => { location.hash = "ds-" + tr.dataset.id; });
+}
+
+function renderDataset(id) {
+  const meta = INDEX[id], data = dataset(id);
+  let filter = "", shown = PAGE;
+  app.innerHTML = `<button id="back">← Все датасеты</button>
+    <h2>${esc(meta.name)}</h2>
+    <p>Строк: ${fmt(meta.n_rows, 0)}, колонок: ${fmt(meta.n_cols, 0)},
+    качество: <b class="${scoreClass(meta.quality_score)}">${fmt(meta.quality_score, 2)}</b>
+    <span class="muted">(${esc(meta.path)})</span></p>
+    <p><input id="filter" placeholder="Фильтр по имени колонки" size="40">
+    <label><input type="checkbox" id="only-problems"> только проблемные</label>
+    ${data.corr ? '<button id="corr-btn">Корреляция</button>' : ""}</p>
+    <div class="layout"><div class="columns"><table><thead><tr><th>Колонка</th><th>Тип</th><th>Пропуски</th>
+    <th>Уникальных</th><th>min</th><th>max</th><th>mean</th><th>std</th></tr></thead><tbody id="rows"></tbody></table>
+    <p><button id="more">Показать ещё</button> <span id="count" class="muted"></span></p></div>
+    <div class="detail" id="detail"><p class="muted">Выберите колонку, чтобы увидеть подробности.</p></div></div>`;
+  document.getElementById("back").onclick = () => { location.hash = ""; };
+  const onlyProblems = document.getElementById("only-problems");
+
+  function matching() {
+    return data.columns.filter(c => (!filter || c[0].toLowerCase().includes(filter)) && (!onlyProblems.checked || data.issues[c[0]]));
+  }
+  function draw() {
+    const cols = matching();
+    document.getElementById("rows").innerHTML = cols.slice(0, shown).map((c, i) => `<tr class="clickable${data.issues[c[0]] ? " problem" : ""}" data-name="${esc(c[0])}">
+      <td>${esc(c[0])}</td><td>${esc(c[1])}</td><td class="num">${pct(c[2])}</td><td class="num">${fmt(c[3], 0)}</td>
+      <td class="num">${fmt(c[4])}</td><td class="num">${fmt(c[5])}</td><td class="num">${fmt(c[6])}</td><td class="num">${fmt(c[7])}</td></tr>`).join("");
+    document.getElementById("count").textContent = `показано ${Math.min(shown, cols.length)} из ${cols.length}`;
+    document.getElementById("more").style.display = shown < cols.length ? "" : "none";
+    document.querySelectorAll("#rows tr").forEach(tr => tr.onclick = () => renderColumn(data, tr.dataset.name));
+  }
+  document.getElementById("filter").oninput = e => { filter = e.target.value.toLowerCase(); shown = PAGE; draw(); };
+  onlyProblems.onchange = () => { shown = PAGE; draw(); };
+  document.getElementById("more").onclick = () => { shown += PAGE; draw(); };
+  if (data.corr) document.getElementById("corr-btn").onclick = () => renderCorrelation(data.corr);
+  draw();
+}
+
+function histogramSvg(h) {
+  const [lo, hi, ...counts] = h, w = 360, ht = 140, max = Math.max(1, ...counts), bw = w / counts.length;
+  const bars = counts.map((c, i) => `<rect x="${(i * bw).toFixed(1)}" y="${(ht - c / max * ht).toFixed(1)}" width="${(bw - 1).toFixed(1)}" height="${(c / max * ht).toFixed(1)}" fill="#4a7ab5"><title>${fmt(c, 0)}</title></rect>`).join("");
+  return `<svg width="${w}" height="${ht + 18}" viewBox="0 0 ${w} ${ht + 18}">${bars}
+    <text x="0" y="${ht + 14}" font-size="11">${fmt(lo)}</text><text x="${w}" y="${ht + 14}" font-size="11" text-anchor="end">${fmt(hi)}</text></svg>`;
+}
+
+function renderColumn(data, name) {
+  const c = data.columns.find(col => col[0] === name), box = document.getElementById("detail");
+  let out = `<h3>${esc(name)}</h3><p>Тип: ${esc(c[1])}, пропусков: ${pct(c[2])}, уникальных: ${fmt(c[3], 0)}</p>`;
+  if (data.issues[name]) out += `<p>${data.issues[name].map(i => `<span class="tag">${esc(i)}</span>`).join("")}</p>`;
+  if (data.hist[name]) out += `<p class="muted">Гистограмма (оценка по выборке)</p>` + histogramSvg(data.hist[name]);
+  if (data.top[name]) {
+    out += `<table><thead><tr><th>Значение</th><th>Частота</th></tr></thead><tbody>` +
+      data.top[name].map(([v, n]) => `<tr><td>${esc(v)}</td><td class="num">${fmt(n, 0)}</td></tr>`).join("") + `</tbody></table>`;
+  }
+  box.innerHTML = out;
+}
+
+function renderCorrelation(corr) {
+  const box = document.getElementById("detail"), p = corr.columns.length;
+  const bytes = Uint8Array.from(atob(corr.b64), ch => ch.charCodeAt(0));
+  const values = new Int8Array(bytes.buffer);
+  const size = Math.min(p, 600), canvas = document.createElement("canvas");
+  canvas.width = canvas.height = size;
+  const ctx = canvas.getContext("2d"), img = ctx.createImageData(size, size);
+  for (let y = 0; y < size; y++) {
+    const row = Math.floor(y * p / size);
+    for (let x = 0; x < size; x++) {
+      const v = values[row * p + Math.floor(x * p / size)], k = 4 * (y * size + x);
+      const r = v === -128 ? 0 : v / 127, a = Math.abs(r);
+      img.data[k] = r > 0 ? 255 : Math.round(255 * (1 - a));
+      img.data[k + 1] = Math.round(255 * (1 - a));
+      img.data[k + 2] = r < 0 ? 255 : Math.round(255 * (1 - a));
+      img.data[k + 3] = v === -128 ? 40 : 255;
+    }
+  }
+  ctx.putImageData(img, 0, 0);
+  canvas.style.width = canvas.style.height = Math.max(size, 360) + "px";
+  box.innerHTML = `<h3>Корреляция</h3><p class="muted">${p < corr.n_total ? `${p} из ${corr.n_total} колонок с самыми сильными связями` : `${p} колонок`}; красный – r &gt; 0, синий – r &lt; 0</p><p id="corr-tip">&nbsp;</p>`;
+  box.appendChild(canvas);
+  canvas.onmousemove = e => {
+    const rect = canvas.getBoundingClientRect();
+    const i = Math.floor((e.clientY - rect.top) / rect.height * p), j = Math.floor((e.clientX - rect.left) / rect.width * p);
+    if (i < 0 || j < 0 || i >= p || j >= p) return;
+    const v = values[i * p + j];
+    document.getElementById("corr-tip").textContent = `${corr.columns[i]} × ${corr.columns[j]}: ${v === -128 ? "—" : (v / 127).toFixed(2)}`;
+  };
+}
+
+function route() {
+  const m = location.hash.match(/^#ds-(\\d+)$/);
+  if (m && INDEX[+m[1]]) renderDataset(+m[1]); else renderIndex();
+}
+window.onhashchange = route;
+route();
+</script>
+</body>
+</html>
+"""
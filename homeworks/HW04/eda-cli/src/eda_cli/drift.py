@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from .instrument import traced
+from .profiling import ColumnProfile, DatasetProfile
+from .sketches import ks_statistic, psi
+
+# Пороги, после которых колонка считается «поехавшей»
+PSI_THRESHOLD = 0.2
+KS_THRESHOLD = 0.1
+CATEGORY_SHIFT_THRESHOLD = 0.1
+MISSING_DELTA_THRESHOLD = 0.05
+
+
+@dataclass
+class ColumnDrift:
+    name: str
+    status: str  # "both" | "added" | "removed"
+    dtype_old: Optional[str] = None
+    dtype_new: Optional[str] = None
+    missing_share_old: Optional[float] = None
+    missing_share_new: Optional[float] = None
+    missing_share_delta: Optional[float] = None
+    psi: Optional[float] = None
+    ks: Optional[float] = None
+    category_shift: Optional[float] = None  # total variation distance по долям категорий
+    top_shifts: List[Dict[str, Any]] = field(default_factory=list)
+    drifted: bool = False
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass
+class DriftReport:
+    n_rows_old: int
+    n_rows_new: int
+    columns: List[ColumnDrift]
+
+    @property
+    def drifted_columns(self) -> List[str]:
+        return [c.name for c in self.columns if c.drifted]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "n_rows_old": self.n_rows_old,
+            "n_rows_new": self.n_rows_new,
+            "drifted_columns": self.drifted_columns,
+            "columns": [c.to_dict() for c in self.columns],
+        }
+
+
+def _missing_share(col: ColumnProfile) -> float:
+    return float(col.missing / col.count) if col.count > 0 else 0.0
+
+
+def _category_shift(old: ColumnProfile, new: ColumnProfile, top_k: int) -> Tuple[float, List[Dict[str, Any]]]:
+    """
+    TVD между распределениями категорий по top-k скетчам.
+    Значения, вытесненные из скетча, попадают в общую корзину «прочее».
+    """
+    old_shares = old.top.shares()
+    new_shares = new.top.shares()
+    keys = set(old_shares) | set(new_shares)
+    diffs = {key: new_shares.get(key, 0.0) - old_shares.get(key, 0.0) for key in keys}
+    other_old = 1.0 - sum(old_shares.values()) if old_shares else 0.0
+    other_new = 1.0 - sum(new_shares.values()) if new_shares else 0.0
+    tvd = 0.5 * (sum(abs(d) for d in diffs.values()) + abs(other_new - other_old))
+
+    top = sorted(diffs.items(), key=lambda item: -abs(item[1]))[:top_k]
+    shifts = [
+        {
+            "value": key,
+            "share_old": old_shares.get(key, 0.0),
+            "share_new": new_shares.get(key, 0.0),
+            "delta": delta,
+        }
+        for key, delta in top
+    ]
+    return float(tvd), shifts
+
+
+def compare_columns(old: ColumnProfile, new: ColumnProfile, top_k: int = 5) -> ColumnDrift:
+    drift = ColumnDrift(
+        name=old.name,
+        status="both",
+        dtype_old=old.dtype,
+        dtype_new=new.dtype,
+        missing_share_old=_missing_share(old),
+        missing_share_new=_missing_share(new),
+    )
+    drift.missing_share_delta = drift.missing_share_new - drift.missing_share_old
+
+    if old.is_numeric and new.is_numeric:
+        drift.psi = psi(old.sample.values, new.sample.values)
+        drift.ks = ks_statistic(old.sample.values, new.sample.values)
+    elif not old.is_numeric and not new.is_numeric:
+        drift.category_shift, drift.top_shifts = _category_shift(old, new, top_k)
+
+    drift.drifted = (
+        abs(drift.missing_share_delta) > MISSING_DELTA_THRESHOLD
+        or old.is_numeric != new.is_numeric
+        or (drift.psi is not None and drift.psi > PSI_THRESHOLD)
+        or (drift.ks is not None and drift.ks > KS_THRESHOLD)
+        or (drift.category_shift is not None and drift.category_shift > CATEGORY_SHIFT_THRESHOLD)
+    )
+    return drift
+
+
+@traced()
+def compare_profiles(old: DatasetProfile, new: DatasetProfile, top_k: int = 5) -> DriftReport:
+    """
+    Сравнивает два профиля поколоночно: сдвиг доли пропусков, PSI и KS
+    по выборкам числовых колонок, сдвиг долей категорий по top-k скетчам.
+    Исходные данные не нужны – только профили.
+    """
+    columns: List[ColumnDrift] = []
+    for name, old_col in old.columns.items():
+        new_col = new.columns.get(name)
+        if new_col is None:
+            columns.append(ColumnDrift(name=name, status="removed", dtype_old=old_col.dtype, drifted=True))
+        else:
+            columns.append(compare_columns(old_col, new_col, top_k=top_k))
+    for name, new_col in new.columns.items():
+        if name not in old.columns:
+            columns.append(ColumnDrift(name=name, status="added", dtype_new=new_col.dtype, drifted=True))
+    return DriftReport(n_rows_old=old.n_rows, n_rows_new=new.n_rows, columns=columns)
+
+
+def flatten_drift_for_print(report: DriftReport) -> pd.DataFrame:
+    rows = [
+        {
+            "name": c.name,
+            "status": c.status,
+            "missing_delta": c.missing_share_delta,
+            "psi": c.psi,
+            "ks": c.ks,
+            "category_shift": c.category_shift,
+            "drifted": c.drifted,
+        }
+        for c in report.columns
+    ]
+    return pd.DataFrame(rows)
@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, TypeVar
+
+try:  # нет на Windows
+    import resource
+except ImportError:  # pragma: no cover
+    resource = None  # type: ignore[assignment]
+
+# Поэтапная телеметрия: время (wall/CPU), строки в секунду и память по стадиям
+# пайплайна. Трейсер включается через use_tracer(); без него stage()/traced()
+# почти ничего не стоят – одна проверка ContextVar.
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def current_rss_mib() -> Optional[float]:
+    """Текущий RSS процесса (Linux, /proc), иначе None."""
+    try:
+        with open("/proc/self/statm", "rb") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE / 2**20
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def peak_rss_mib() -> Optional[float]:
+    """Пиковый RSS процесса с момента запуска (ru_maxrss: КиБ на Linux, байты на macOS)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+@dataclass
+class StageTiming:
+    name: str
+    start_ms: float  # от создания трейсера
+    wall_ms: float
+    cpu_ms: float  # CPU-время потока, в котором шла стадия
+    rows: Optional[int] = None
+    rows_per_sec: Optional[float] = None
+    rss_delta_mib: Optional[float] = None
+    peak_rss_mib: Optional[float] = None
+    thread: str = ""
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class Tracer:
+    """Собирает StageTiming по стадиям; потокобезопасен (стадии секций отчёта идут параллельно)."""
+
+    def __init__(self) -> None:
+        self.stages: List[StageTiming] = []
+        self._t0 = time.perf_counter()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name: str, rows: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Замер одной стадии. Число строк можно передать сразу или выставить
+        по ходу: `with tracer.stage("parse") as st: ...; st["rows"] = len(df)`.
+        """
+        record: Dict[str, Any] = {"rows": rows}
+        rss_before = current_rss_mib()
+        cpu_start = time.thread_time()
+        wall_start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            wall = time.perf_counter() - wall_start
+            cpu = time.thread_time() - cpu_start
+            rss_after = current_rss_mib()
+            n_rows = record.get("rows")
+            timing = StageTiming(
+                name=name,
+                start_ms=(wall_start - self._t0) * 1000.0,
+                wall_ms=wall * 1000.0,
+                cpu_ms=cpu * 1000.0,
+                rows=n_rows,
+                rows_per_sec=n_rows / wall if n_rows is not None and wall > 0 else None,
+                rss_delta_mib=rss_after - rss_before if rss_after is not None and rss_before is not None else None,
+                peak_rss_mib=peak_rss_mib(),
+                thread=threading.current_thread().name,
+            )
+            with self._lock:
+                self.stages.append(timing)
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        return [s.to_dict() for s in sorted(self.stages, key=lambda s: s.start_ms)]
+
+    def to_table(self):
+        import pandas as pd
+
+        return pd.DataFrame(self.to_dicts())
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """Формат Chrome Trace Event (открывается в chrome://tracing и ui.perfetto.dev)."""
+        pid = os.getpid()
+        threads: Dict[str, int] = {}
+        events: List[Dict[str, Any]] = []
+        for s in sorted(self.stages, key=lambda s: s.start_ms):
+            tid = threads.setdefault(s.thread, len(threads) + 1)
+            events.append(
+                {
+                    "name": s.name,
+                    "cat": "eda_cli",
+                    "ph": "X",
+                    "ts": s.start_ms * 1000.0,
+                    "dur": s.wall_ms * 1000.0,
+                    "pid": pid,
+                    "tid": tid,
+                    "args": {
+                        "cpu_ms": s.cpu_ms,
+                        "rows": s.rows,
+                        "rows_per_sec": s.rows_per_sec,
+                        "rss_delta_mib": s.rss_delta_mib,
+                        "peak_rss_mib": s.peak_rss_mib,
+                    },
+                }
+            )
+        for thread_name, tid in threads.items():
+            events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": thread_name}})
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def save_json(self, path: Path) -> None:
+        Path(path).write_text(json.dumps(self.to_dicts(), indent=2, ensure_ascii=False), encoding="utf-8")
+
+    def save_chrome_trace(self, path: Path) -> None:
+        Path(path).write_text(json.dumps(self.to_chrome_trace()), encoding="utf-8")
+
+
+_current_tracer: ContextVar[Optional[Tracer]] = ContextVar("eda_cli_tracer", default=None)
+
+
+def current_tracer() -> Optional[Tracer]:
+    return _current_tracer.get()
+
+
+@contextmanager
+def use_tracer(tracer: Tracer) -> Iterator[Tracer]:
+    """Делает tracer активным в текущем контексте (и в контекстах, скопированных из него)."""
+    token = _current_tracer.set(tracer)
+    try:
+        yield tracer
+    finally:
+        _current_tracer.reset(token)
+
+
+@contextmanager
+def stage(name: str, rows: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+    """Стадия активного трейсера; без трейсера – пустая обёртка."""
+    tracer = _current_tracer.get()
+    if tracer is None:
+        yield {"rows": rows}
+        return
+    with tracer.stage(name, rows) as record:
+        yield record
+
+
+def traced(name: Optional[str] = None) -> Callable[[F], F]:
+    """
+    Декоратор для функций ядра/визуализации: оборачивает вызов в stage().
+    Если первый аргумент похож на DataFrame, его число строк идёт в rows.
+    """
+
+    def decorator(func: F) -> F:
+        stage_name = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            tracer = _current_tracer.get()
+            if tracer is None:
+                return func(*args, **kwargs)
+            first = args[0] if args else None
+            rows = int(first.shape[0]) if hasattr(first, "shape") and len(first.shape) == 2 else None
+            with tracer.stage(stage_name, rows):
+                return func(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
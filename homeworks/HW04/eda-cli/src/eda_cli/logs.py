@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import copy
+import json
+import logging
+import os
+import queue
+import random
+import sys
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import IO, Any, Dict, Iterator, Optional
+
+# Структурные JSON-логи для HTTP-сервиса. Запись в лог на пути запроса – только
+# put_nowait в ограниченную очередь; форматирование и вывод идут в отдельном
+# потоке QueueListener. Если очередь переполнена, запись отбрасывается, а не ждёт.
+
+REQUEST_ID_HEADER = "X-Request-ID"
+DEFAULT_QUEUE_SIZE = 10_000
+
+_request_id: ContextVar[Optional[str]] = ContextVar("eda_cli_request_id", default=None)
+_listener: Optional[QueueListener] = None
+_handler: Optional["NonBlockingQueueHandler"] = None
+
+# Служебные атрибуты LogRecord, которые не надо дублировать в JSON
+_RESERVED = set(vars(logging.makeLogRecord({}))) | {"message", "fields", "request_id", "exc"}
+
+
+def new_request_id() -> str:
+    return uuid.uuid4().hex[:16]
+
+
+def current_request_id() -> Optional[str]:
+    return _request_id.get()
+
+
+@contextmanager
+def request_context(request_id: Optional[str] = None) -> Iterator[str]:
+    """Делает request_id текущим: он попадёт во все записи лога внутри запроса."""
+    rid = request_id or new_request_id()
+    token = _request_id.set(rid)
+    try:
+        yield rid
+    finally:
+        _request_id.reset(token)
+
+
+class RequestIdFilter(logging.Filter):
+    """Запоминает request_id в записи в потоке запроса – listener работает в своём потоке, без контекста."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if getattr(record, "request_id", None) is None:
+            record.request_id = _request_id.get()
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """Одна запись – одна JSON-строка: ts, level, logger, event, request_id и поля из extra."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload: Dict[str, Any] = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "event": record.getMessage(),
+        }
+        request_id = getattr(record, "request_id", None)
+        if request_id is not None:
+            payload["request_id"] = request_id
+        payload.update(getattr(record, "fields", None) or {})
+        for key, value in vars(record).items():
+            if key not in _RESERVED and not key.startswith("_"):
+                payload[key] = value
+        # exc – трейсбек, отформатированный в NonBlockingQueueHandler.prepare до постановки в очередь
+        exc = getattr(record, "exc", None)
+        if exc is None and record.exc_info:
+            exc = self.formatException(record.exc_info)
+        if exc:
+            payload["exc"] = exc
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """QueueHandler, который при переполненной очереди отбрасывает запись и считает потери."""
+
+    def __init__(self, log_queue: "queue.Queue[logging.LogRecord]") -> None:
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """
+        Стандартный prepare склеивает трейсбек с сообщением и обнуляет exc_info.
+        Здесь сообщение остаётся как есть, а трейсбек кладётся в record.exc для JsonFormatter.
+        """
+        record = copy.copy(record)
+        record.msg = record.message = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc = logging.Formatter().formatException(record.exc_info)
+        elif record.exc_text:
+            record.exc = record.exc_text
+        record.exc_info = None
+        record.exc_text = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def configure_logging(
+    level: Optional[str] = None,
+    stream: Optional[IO[str]] = None,
+    queue_size: int = DEFAULT_QUEUE_SIZE,
+    logger_name: str = "eda_cli",
+) -> logging.Logger:
+    """
+    Подключает к логгеру eda_cli очередь и фоновый поток вывода JSON в stream (stdout).
+    Повторный вызов ничего не делает, пока не вызван shutdown_logging().
+    Уровень по умолчанию – из EDA_LOG_LEVEL (INFO).
+    """
+    global _listener, _handler
+    logger = logging.getLogger(logger_name)
+    if _listener is not None:
+        return logger
+
+    log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(maxsize=queue_size)
+    output = logging.StreamHandler(stream or sys.stdout)
+    output.setFormatter(JsonFormatter())
+    _listener = QueueListener(log_queue, output, respect_handler_level=False)
+    _handler = NonBlockingQueueHandler(log_queue)
+    _handler.addFilter(RequestIdFilter())
+
+    logger.addHandler(_handler)
+    logger.setLevel((level or os.environ.get("EDA_LOG_LEVEL", "INFO")).upper())
+    logger.propagate = False
+    _listener.start()
+    return logger
+
+
+def dropped_log_records() -> int:
+    """Сколько записей отброшено из-за переполненной очереди с момента configure_logging()."""
+    return _handler.dropped if _handler is not None else 0
+
+
+def shutdown_logging(logger_name: str = "eda_cli") -> int:
+    """Дописывает очередь, останавливает фоновый поток; возвращает число отброшенных записей."""
+    global _listener, _handler
+    if _listener is None or _handler is None:
+        return 0
+    _listener.stop()
+    logging.getLogger(logger_name).removeHandler(_handler)
+    dropped = _handler.dropped
+    _listener = None
+    _handler = None
+    return dropped
+
+
+def should_sample(rate: float) -> bool:
+    return rate >= 1.0 or (rate > 0.0 and random.random() < rate)
+
+
+def log_event(
+    logger: logging.Logger,
+    event: str,
+    sample_rate: float = 1.0,
+    level: int = logging.INFO,
+    **fields: Any,
+) -> None:
+    """
+    Структурная запись: event + произвольные поля. sample_rate < 1 пишет только
+    часть записей (для частых эндпоинтов); сэмплинг решается до сборки записи.
+    """
+    if not logger.isEnabledFor(level) or not should_sample(sample_rate):
+        return
+    if sample_rate < 1.0:
+        fields["sample_rate"] = sample_rate
+    logger.log(level, event, extra={"fields": fields})
@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import bisect
+import math
+import threading
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Метрики в текстовом формате Prometheus (exposition format 0.0.4) без внешних
+# зависимостей. Запись на горячем пути не берёт блокировок: у каждого потока своя
+# «шарда» значений, которую пишет только он; при чтении /metrics шарды суммируются.
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS: Tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+SIZE_BUCKETS: Tuple[float, ...] = tuple(float(2**p) for p in range(10, 31, 2))  # 1 КиБ .. 1 ГиБ
+ROWS_BUCKETS: Tuple[float, ...] = (10.0, 100.0, 1e3, 1e4, 1e5, 1e6, 1e7)
+
+LabelValues = Tuple[str, ...]
+
+
+class _ThreadShards:
+    """Словарь значений на каждый поток; блокировка только при первом обращении потока."""
+
+    def __init__(self) -> None:
+        self._local = threading.local()
+        self._shards: List[dict] = []
+        self._lock = threading.Lock()
+
+    def local(self) -> dict:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = {}
+            with self._lock:
+                self._shards.append(shard)
+            self._local.shard = shard
+        return shard
+
+    def snapshot(self) -> List[dict]:
+        with self._lock:
+            shards = list(self._shards)
+        # dict.copy() атомарен под GIL – поток-владелец может писать параллельно
+        return [shard.copy() for shard in shards]
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._shards = _ThreadShards()
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name}: ожидаются метки {self.labelnames}, получено {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _labels(self, key: LabelValues, extra: Optional[Tuple[str, str]] = None) -> str:
+        pairs = list(zip(self.labelnames, key))
+        if extra is not None:
+            pairs.append(extra)
+        if not pairs:
+            return ""
+        return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+    def collect(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        shard = self._shards.local()
+        key = self._key(labels)
+        shard[key] = shard.get(key, 0.0) + amount
+
+    def values(self) -> Dict[LabelValues, float]:
+        total: Dict[LabelValues, float] = {}
+        for shard in self._shards.snapshot():
+            for key, value in shard.items():
+                total[key] = total.get(key, 0.0) + value
+        return total
+
+    def collect(self) -> List[str]:
+        return [f"{self.name}{self._labels(key)} {_format(value)}" for key, value in sorted(self.values().items())]
+
+
+class Gauge(Counter):
+    """Гейдж «в работе»: inc/dec могут идти из разных потоков – сумма по шардам всё равно верна."""
+
+    kind = "gauge"
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> None:
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels: str) -> None:
+        shard = self._shards.local()
+        key = self._key(labels)
+        state = shard.get(key)
+        if state is None:
+            # [счётчики по корзинам (+Inf последней), сумма, количество]
+            state = shard[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        state[0][bisect.bisect_left(self.buckets, value)] += 1
+        state[1] += value
+        state[2] += 1
+
+    def values(self) -> Dict[LabelValues, Tuple[List[int], float, int]]:
+        total: Dict[LabelValues, Tuple[List[int], float, int]] = {}
+        for shard in self._shards.snapshot():
+            for key, (counts, value_sum, count) in shard.items():
+                acc = total.get(key)
+                if acc is None:
+                    total[key] = (list(counts), value_sum, count)
+                else:
+                    total[key] = ([a + b for a, b in zip(acc[0], counts)], acc[1] + value_sum, acc[2] + count)
+        return total
+
+    def collect(self) -> List[str]:
+        lines = []
+        for key, (counts, value_sum, count) in sorted(self.values().items()):
+            cumulative = 0
+            for bound, bucket_count in zip((*self.buckets, math.inf), counts):
+                cumulative += bucket_count
+                lines.append(f"{self.name}_bucket{self._labels(key, ('le', _format(bound)))} {cumulative}")
+            lines.append(f"{self.name}_sum{self._labels(key)} {_format(value_sum)}")
+            lines.append(f"{self.name}_count{self._labels(key)} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Метрика {metric.name} уже зарегистрирована")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, help, labelnames))  # type: ignore[return-value]
+
+    def gauge(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, help, labelnames))  # type: ignore[return-value]
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> Histogram:
+        return self.register(Histogram(name, help, labelnames, buckets))  # type: ignore[return-value]
+
+    def metrics(self) -> Iterable[_Metric]:
+        return self._metrics.values()
+
+    def render(self) -> str:
+        """Все метрики в текстовом формате Prometheus."""
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.collect())
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
@@ -0,0 +1,397 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+import os
+import pickle
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import IO, Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+from pandas.api import types as ptypes
+
+from .cancel import check_cancelled
+from .compression import open_source
+from .core import ColumnSummary, DatasetSummary, example_values
+from .instrument import stage
+from .sketches import DistinctSketch, SampleSketch, TopKSketch
+from .sniff import CsvDialect
+from .temporal import TemporalProfile, infer_datetime_format
+from .text import TextProfile, is_text_column
+
+# Версия формата профиля: при изменении полей/скетчей старые записи кэша игнорируются
+PROFILE_VERSION = 5
+DEFAULT_CHUNKSIZE = 100_000
+HIST_BINS = 20
+
+CsvSource = Union[str, Path, IO[bytes], IO[str]]
+
+
+def column_seed(name: Any) -> int:
+    """Seed выборки колонки: стабилен между запусками и шардами, но у разных колонок разный."""
+    return int.from_bytes(hashlib.sha1(str(name).encode("utf-8")).digest()[:8], "little")
+
+
+def _merge_dtype(left: str, right: str) -> str:
+    """Тип колонки, если в разных чанках pandas вывел разные типы."""
+    if left == right:
+        return left
+    if ptypes.is_numeric_dtype(ptypes.pandas_dtype(left)) and ptypes.is_numeric_dtype(ptypes.pandas_dtype(right)):
+        return "float64"
+    return "object"
+
+
+@dataclass
+class ColumnProfile:
+    """
+    Потоковый (слияемый) профиль одной колонки.
+    Числовые моменты считаются по формулам Чана, остальное – скетчами.
+    """
+
+    name: str
+    dtype: str = ""
+    count: int = 0  # строк учтено (включая пропуски)
+    missing: int = 0
+    is_numeric: bool = True
+    numeric_count: int = 0
+    mean: float = 0.0
+    m2: float = 0.0  # сумма квадратов отклонений от среднего
+    min: Optional[float] = None
+    max: Optional[float] = None
+    zeros: int = 0
+    example_values: List[str] = field(default_factory=list)
+    distinct: DistinctSketch = field(default_factory=DistinctSketch)
+    sample: Optional[SampleSketch] = None  # None – пустая выборка с seed по имени колонки
+    top: TopKSketch = field(default_factory=TopKSketch)
+    text: TextProfile = field(default_factory=TextProfile)
+    # Формат дат угадывается один раз – по первому чанку с непустыми значениями
+    temporal: Optional[TemporalProfile] = None
+    temporal_checked: bool = False
+    # Тип менялся между чанками/шардами: значения числовой части не попали в unique и top
+    approximate: bool = False
+
+    def __post_init__(self) -> None:
+        if self.sample is None:
+            self.sample = SampleSketch(seed=column_seed(self.name))
+
+    def _drop_numeric(self) -> None:
+        """
+        Колонка оказалась нечисловой: числовые моменты и выборка больше не описывают её.
+        Хэши чисел (float64) несравнимы с хэшами строк, поэтому отбрасываются и они,
+        а колонка, в которой были непустые числа, помечается approximate.
+        """
+        self.approximate = self.approximate or len(self.distinct.hashes) > 0
+        self.numeric_count = 0
+        self.mean = self.m2 = 0.0
+        self.min = self.max = None
+        self.zeros = 0
+        self.sample = SampleSketch(self.sample.capacity, seed=column_seed(self.name))
+        self.distinct = DistinctSketch(self.distinct.k)
+
+    def _update_moments(self, n: int, mean: float, m2: float, min_val: float, max_val: float) -> None:
+        if n == 0:
+            return
+        total = self.numeric_count + n
+        delta = mean - self.mean
+        self.mean += delta * n / total
+        self.m2 += m2 + delta * delta * self.numeric_count * n / total
+        self.numeric_count = total
+        self.min = min_val if self.min is None else min(self.min, min_val)
+        self.max = max_val if self.max is None else max(self.max, max_val)
+
+    def _add_examples(self, values: List[str], k: int) -> None:
+        for value in values:
+            if len(self.example_values) >= k:
+                break
+            if value not in self.example_values:
+                self.example_values.append(value)
+
+    def update(self, s: pd.Series, example_values_per_column: int = 3) -> None:
+        chunk_dtype = str(s.dtype)
+        self.dtype = chunk_dtype if not self.dtype else _merge_dtype(self.dtype, chunk_dtype)
+        if self.is_numeric and not ptypes.is_numeric_dtype(s):
+            self.is_numeric = False
+            self._drop_numeric()
+
+        non_null = s.dropna()
+        self.count += len(s)
+        self.missing += len(s) - len(non_null)
+
+        missing_examples = example_values_per_column - len(self.example_values)
+        if missing_examples > 0 and not non_null.empty:
+            # Добираем примеры из чанка, пока их меньше k; дальше чанки не просматриваются
+            self.example_values.extend(example_values(non_null, missing_examples, exclude=self.example_values))
+
+        if self.is_numeric:
+            values = non_null.to_numpy(dtype="float64")
+            if len(values):
+                chunk_mean = float(values.mean())
+                self._update_moments(
+                    len(values),
+                    chunk_mean,
+                    float(((values - chunk_mean) ** 2).sum()),
+                    float(values.min()),
+                    float(values.max()),
+                )
+                self.zeros += int((values == 0).sum())
+                self.sample.update(values)
+            # Хэшируем как float64, чтобы int/float-чанки давали одинаковые хэши
+            self.distinct.update(pd.Series(values))
+        else:
+            # В строки переводятся только уникальные значения чанка, а не весь столбец
+            counts = non_null.value_counts()
+            counts.index = counts.index.astype(str)
+            self.distinct.update(pd.Series(counts.index))
+            self.top.update(counts)
+            if is_text_column(s):
+                self.text.update(non_null)
+            if not self.temporal_checked and not non_null.empty:
+                self.temporal_checked = True
+                fmt = infer_datetime_format(non_null)
+                if fmt is not None:
+                    self.temporal = TemporalProfile(fmt)
+            if self.temporal is not None:
+                self.temporal.update(non_null)
+
+    def merge(self, other: "ColumnProfile") -> "ColumnProfile":
+        self.dtype = other.dtype if not self.dtype else _merge_dtype(self.dtype, other.dtype or self.dtype)
+        if self.is_numeric and not other.is_numeric:
+            self.is_numeric = False
+            self._drop_numeric()
+        self.count += other.count
+        self.missing += other.missing
+        self._add_examples(other.example_values, max(len(self.example_values), len(other.example_values)))
+        if self.is_numeric and other.min is not None and other.max is not None:
+            self._update_moments(other.numeric_count, other.mean, other.m2, other.min, other.max)
+            self.zeros += other.zeros
+            self.sample.merge(other.sample)
+        if not self.is_numeric and other.is_numeric:
+            # Числовой шард в нечисловой колонке: его хэши и значения не сливаются (см. _drop_numeric)
+            self.approximate = self.approximate or len(other.distinct.hashes) > 0
+        else:
+            self.distinct.merge(other.distinct)
+        self.approximate = self.approximate or other.approximate
+        self.top.merge(other.top)
+        self.text.merge(other.text)
+        if other.temporal is not None:
+            if self.temporal is None:
+                self.temporal = TemporalProfile(other.temporal.format)
+            self.temporal.merge(other.temporal)
+        self.temporal_checked = self.temporal_checked or other.temporal_checked
+        return self
+
+    @property
+    def non_null(self) -> int:
+        return self.count - self.missing
+
+    def histogram(self, bins: int = HIST_BINS) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Оценка гистограммы (counts, edges): выборка, пересчитанная на все числовые
+        значения; границы бинов – по точным min/max. None для нечисловых и пустых колонок.
+        """
+        if not self.is_numeric or len(self.sample) == 0 or self.min is None or self.max is None:
+            return None
+        if not (math.isfinite(self.min) and math.isfinite(self.max)):
+            return None
+        counts, edges = np.histogram(self.sample.values, bins=bins, range=(self.min, self.max))
+        scale = self.numeric_count / len(self.sample)
+        return np.rint(counts * scale).astype("int64"), edges
+
+    def to_summary(self) -> ColumnSummary:
+        has_stats = self.is_numeric and self.numeric_count > 0
+        std = math.sqrt(self.m2 / (self.numeric_count - 1)) if has_stats and self.numeric_count > 1 else float("nan")
+        return ColumnSummary(
+            name=self.name,
+            dtype=self.dtype,
+            non_null=self.non_null,
+            missing=self.missing,
+            missing_share=float(self.missing / self.count) if self.count > 0 else 0.0,
+            unique=self.distinct.estimate(),
+            example_values=list(self.example_values),
+            is_numeric=self.is_numeric,
+            zeros=self.zeros if self.is_numeric else 0,
+            min=self.min if has_stats else None,
+            max=self.max if has_stats else None,
+            mean=self.mean if has_stats else None,
+            std=std if has_stats else None,
+            text=None if self.is_numeric else self.text.to_dict(),
+            temporal=None if self.is_numeric or self.temporal is None else self.temporal.to_dict(),
+            approximate=self.approximate,
+        )
+
+
+@dataclass
+class DatasetProfile:
+    """Слияемый профиль датасета: из него получаются DatasetSummary и таблицы отчёта."""
+
+    n_rows: int = 0
+    columns: Dict[str, ColumnProfile] = field(default_factory=dict)
+    source: str = ""
+
+    def update(self, df: pd.DataFrame, example_values_per_column: int = 3) -> None:
+        for name in df.columns:
+            col = self.columns.get(name)
+            if col is None:
+                # Колонка появилась не с первого чанка: предыдущие строки – пропуски
+                col = self.columns[name] = ColumnProfile(name=name, count=self.n_rows, missing=self.n_rows)
+            col.update(df[name], example_values_per_column)
+        for name, col in self.columns.items():
+            if name not in df.columns:
+                col.count += len(df)
+                col.missing += len(df)
+        self.n_rows += len(df)
+
+    def merge(self, other: "DatasetProfile") -> "DatasetProfile":
+        for name, other_col in other.columns.items():
+            col = self.columns.get(name)
+            if col is None:
+                self.columns[name] = col = ColumnProfile(name=name, count=self.n_rows, missing=self.n_rows)
+            col.merge(other_col)
+        for name, col in self.columns.items():
+            if name not in other.columns:
+                col.count += other.n_rows
+                col.missing += other.n_rows
+        self.n_rows += other.n_rows
+        return self
+
+    def to_summary(self) -> DatasetSummary:
+        return DatasetSummary(
+            n_rows=self.n_rows,
+            n_cols=len(self.columns),
+            columns=[col.to_summary() for col in self.columns.values()],
+        )
+
+    def missing_table(self) -> pd.DataFrame:
+        """Аналог core.missing_table, но без исходных данных."""
+        if self.n_rows == 0:
+            return pd.DataFrame(columns=["missing_count", "missing_share"])
+        total = pd.Series({name: col.missing for name, col in self.columns.items()}, dtype="int64")
+        return pd.DataFrame(
+            {
+                "missing_count": total,
+                "missing_share": total / self.n_rows,
+            }
+        ).sort_values("missing_share", ascending=False)
+
+    def histograms(self, bins: int = HIST_BINS) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+        """Гистограммы (counts, edges) всех числовых колонок по скетчам (см. ColumnProfile.histogram)."""
+        result: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        for name, col in self.columns.items():
+            hist = col.histogram(bins)
+            if hist is not None:
+                result[name] = hist
+        return result
+
+    def top_categories(self, max_columns: int = 5, top_k: int = 5) -> Dict[str, pd.DataFrame]:
+        """Аналог core.top_categories по top-k скетчам."""
+        result: Dict[str, pd.DataFrame] = {}
+        candidates = [col for col in self.columns.values() if not col.is_numeric]
+        for col in candidates[:max_columns]:
+            top = col.top.top(top_k)
+            if not top:
+                continue
+            counts = np.array([count for _, count in top])
+            result[col.name] = pd.DataFrame(
+                {
+                    "value": [value for value, _ in top],
+                    "count": counts,
+                    "share": counts / counts.sum(),
+                }
+            )
+        return result
+
+
+def profile_frame(df: pd.DataFrame, source: str = "") -> DatasetProfile:
+    profile = DatasetProfile(source=source)
+    profile.update(df)
+    return profile
+
+
+def profile_csv(
+    source: CsvSource,
+    dialect: Optional[CsvDialect] = None,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+) -> DatasetProfile:
+    """
+    Потоково профилирует CSV: читает по chunksize строк и обновляет скетчи,
+    так что в памяти одновременно находится только один чанк.
+    Сжатые файлы (.gz/.bz2/.zst) распаковываются на лету.
+    dialect – формат файла (см. sniff.sniff_path), по умолчанию «запятая, UTF-8, с заголовком».
+    """
+    dialect = dialect or CsvDialect()
+    name = str(source) if isinstance(source, (str, Path)) else getattr(source, "name", "") or ""
+    profile = DatasetProfile(source=name)
+    with stage("profile_csv") as st, open_source(source, name=name) as stream:
+        with pd.read_csv(stream, chunksize=chunksize, **dialect.read_csv_kwargs()) as reader:
+            for chunk in reader:
+                profile.update(chunk)
+                check_cancelled()
+        st["rows"] = profile.n_rows
+    return profile
+
+
+# ---------- Кэш профилей на диске ----------
+
+
+def default_cache_dir() -> Path:
+    return Path(os.environ.get("EDA_CLI_CACHE_DIR", Path.home() / ".cache" / "eda_cli"))
+
+
+class ProfileCache:
+    """
+    Кэш профилей в каталоге: ключ – путь, размер, mtime файла и параметры чтения.
+    Изменённый файл получает новый ключ, поэтому инвалидация не нужна.
+    """
+
+    def __init__(self, root: Optional[Path] = None) -> None:
+        self.root = Path(root) if root is not None else default_cache_dir()
+
+    def key_for_content(self, sha256: str, **params: Any) -> str:
+        """Ключ по хэшу содержимого – для загрузок, у которых нет пути и mtime."""
+        raw = json.dumps([PROFILE_VERSION, f"sha256:{sha256}", params], sort_keys=True)
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def key_for(self, path: Path, **params: Any) -> str:
+        st = path.stat()
+        raw = json.dumps(
+            [PROFILE_VERSION, str(path.resolve()), st.st_size, st.st_mtime_ns, params],
+            sort_keys=True,
+        )
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.root / f"{key}.pkl"
+
+    def get(self, key: str) -> Optional[DatasetProfile]:
+        try:
+            with self._path(key).open("rb") as f:
+                return pickle.load(f)
+        except Exception:  # noqa: BLE001 – битый/старый кэш просто пересчитываем
+            return None
+
+    def put(self, key: str, profile: DatasetProfile) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp = self._path(key).with_suffix(".tmp")
+        with tmp.open("wb") as f:
+            pickle.dump(profile, f, protocol=pickle.HIGHEST_PROTOCOL)
+        tmp.replace(self._path(key))
+
+
+def cached_profile_csv(
+    path: Path,
+    dialect: Optional[CsvDialect] = None,
+    cache: Optional[ProfileCache] = None,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+) -> DatasetProfile:
+    """profile_csv с кэшем: повторный запуск на неизменённом файле не перечитывает его."""
+    if cache is None:
+        return profile_csv(path, dialect=dialect, chunksize=chunksize)
+    key = cache.key_for(path, **(dialect or CsvDialect()).read_csv_kwargs())
+    profile = cache.get(key)
+    if profile is None:
+        profile = profile_csv(path, dialect=dialect, chunksize=chunksize)
+        cache.put(key, profile)
+    return profile
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import io
+from time import monotonic
+from typing import Any, BinaryIO, Dict, Iterator, Optional
+
+from .compression import open_source
+from .core import compute_quality_flags
+from .profiling import DatasetProfile
+from .serialize import dumps
+from .validation import DEFAULT_CHUNK_ROWS, UploadLimits, iter_csv_chunks
+
+# Потоковое профилирование с событиями для долгих загрузок. Профиль обновляется
+# по чанкам (как в profile_csv), а после каждого чанка наружу отдаётся событие:
+#   progress – прочитано байт/строк, текущая стадия;
+#   partial  – сводка по колонкам на текущий момент (не чаще partial_interval секунд);
+#   result   – итоговая сводка и флаги качества.
+# Клиент видит первые результаты сразу и может оборвать ненужную задачу:
+# генератор не читает дальше, пока не отдано предыдущее событие.
+
+Event = Dict[str, Any]
+
+DEFAULT_PARTIAL_INTERVAL = 1.0
+
+
+class CountingReader(io.RawIOBase):
+    """Прозрачная обёртка над потоком, считающая прочитанные (сжатые) байты."""
+
+    def __init__(self, raw: BinaryIO) -> None:
+        super().__init__()
+        self._raw = raw
+        self.bytes_read = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        data = self._raw.read(len(b))
+        n = len(data)
+        b[:n] = data
+        self.bytes_read += n
+        return n
+
+
+def _bool_flags(flags: Dict[str, Any]) -> Dict[str, bool]:
+    return {key: bool(value) for key, value in flags.items() if isinstance(value, bool)}
+
+
+def iter_profile_events(
+    raw: BinaryIO,
+    name: str = "",
+    total_bytes: Optional[int] = None,
+    limits: Optional[UploadLimits] = None,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    partial_interval: float = DEFAULT_PARTIAL_INTERVAL,
+) -> Iterator[Event]:
+    """
+    События профилирования CSV из потока raw (сжатие определяется как в open_source).
+    total_bytes – размер загрузки, если известен (для доли в progress).
+    Ошибки чтения и лимитов – UploadRejected из iter_csv_chunks, на том чанке, где они возникли.
+    """
+    start = monotonic()
+    counter = CountingReader(raw)
+    profile = DatasetProfile(source=name)
+    last_partial: Optional[float] = None
+
+    def progress(stage: str, chunks: int) -> Event:
+        return {
+            "event": "progress",
+            "stage": stage,
+            "bytes_read": counter.bytes_read,
+            "total_bytes": total_bytes,
+            "fraction": min(1.0, counter.bytes_read / total_bytes) if total_bytes else None,
+            "rows": profile.n_rows,
+            "chunks": chunks,
+            "elapsed_ms": (monotonic() - start) * 1000.0,
+        }
+
+    chunks = 0
+    # BufferedReader даёт peek() – по нему open_source узнаёт сжатие по magic bytes
+    with open_source(io.BufferedReader(counter), name=name) as stream:
+        for chunk in iter_csv_chunks(stream, limits, chunk_rows):
+            profile.update(chunk)
+            chunks += 1
+            yield progress("profile", chunks)
+            now = monotonic()
+            if last_partial is None or now - last_partial >= partial_interval:
+                last_partial = now
+                yield {"event": "partial", "rows": profile.n_rows, "columns": profile.to_summary().columns}
+
+    yield progress("summarize", chunks)
+    summary = profile.to_summary()
+    flags = compute_quality_flags(summary, profile.missing_table())
+    yield {
+        "event": "result",
+        "n_rows": summary.n_rows,
+        "n_cols": summary.n_cols,
+        "quality_score": flags["quality_score"],
+        "flags": _bool_flags(flags),
+        "columns": summary.columns,
+        "elapsed_ms": (monotonic() - start) * 1000.0,
+    }
+
+
+def encode_ndjson(event: Event) -> bytes:
+    """Одно событие – одна строка JSON (application/x-ndjson)."""
+    return dumps(event) + b"\n"
+
+
+def encode_sse(event: Event) -> bytes:
+    """Server-Sent Events: тип события в поле event, остальное – JSON в data."""
+    payload = {key: value for key, value in event.items() if key != "event"}
+    return b"event: " + event["event"].encode("ascii") + b"\ndata: " + dumps(payload) + b"\n\n"
@@ -0,0 +1,464 @@
+from __future__ import annotations
+
+import contextvars
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from .core import (
+    build_json_summary,
+    cluster_order,
+    compute_quality_flags,
+    correlation_matrix,
+    flatten_summary_for_print,
+    missing_table,
+    summarize_dataset,
+    top_categories,
+)
+from .artifact import ARTIFACT_SUFFIX, ProfileArtifact, save_profile
+from .cancel import check_cancelled
+from .instrument import stage
+from .profiling import profile_frame
+from .serialize import write_json
+from .target import profile_target
+from .viz import (
+    CORR_HEATMAP_MAX_COLUMNS,
+    histogram_counts,
+    plot_correlation_heatmap,
+    plot_correlation_tiles,
+    plot_histogram_grid,
+    plot_histograms_per_column,
+    plot_missing_matrix,
+    save_top_categories_tables,
+)
+
+
+@dataclass
+class ReportConfig:
+    """Параметры отчёта, общие для всех секций."""
+
+    source_name: str
+    out_root: Path
+    max_hist_columns: int = 6
+    top_k_categories: int = 5
+    report_title: str = "EDA-отчёт"
+    min_missing_share: float = 0.1
+    max_heatmap_columns: int = CORR_HEATMAP_MAX_COLUMNS
+    heatmap_mode: str = "top"  # см. HEATMAP_MODES
+    target: Optional[str] = None  # целевая колонка для флагов готовности к обучению
+
+
+# Тепловая карта для широких данных (колонок больше max_heatmap_columns):
+# top – подблок самых коррелирующих колонок, tiles – обзор и детальные плитки
+HEATMAP_MODES = ("top", "tiles")
+
+
+@dataclass(frozen=True)
+class Section:
+    """
+    Узел графа отчёта.
+
+    public=True – секция, которую можно запросить через --sections
+    (обычно пишет артефакт на диск); public=False – промежуточный результат
+    (DataFrame, сводка, флаги), который считается только если нужен кому-то ещё.
+    """
+
+    name: str
+    func: Callable[["ReportContext"], Any]
+    deps: Tuple[str, ...] = ()
+    public: bool = True
+
+
+class ReportContext:
+    """
+    Состояние одного прогона отчёта: конфиг, загрузчик данных
+    и уже посчитанные результаты узлов (каждый узел считается ровно один раз).
+    """
+
+    def __init__(self, config: ReportConfig, load_frame: Callable[[], pd.DataFrame]) -> None:
+        self.config = config
+        self.load_frame = load_frame
+        self.results: Dict[str, Any] = {}
+
+    def __getitem__(self, name: str) -> Any:
+        return self.results[name]
+
+
+SECTIONS: Dict[str, Section] = {}
+
+
+def _section(name: str, deps: Sequence[str] = (), public: bool = True):
+    def decorator(func: Callable[[ReportContext], Any]) -> Callable[[ReportContext], Any]:
+        SECTIONS[name] = Section(name=name, func=func, deps=tuple(deps), public=public)
+        return func
+
+    return decorator
+
+
+# ---------- Промежуточные узлы ----------
+
+
+@_section("frame", public=False)
+def _frame(ctx: ReportContext) -> pd.DataFrame:
+    return ctx.load_frame()
+
+
+@_section("dataset_summary", deps=["frame"], public=False)
+def _dataset_summary(ctx: ReportContext):
+    return summarize_dataset(ctx["frame"])
+
+
+@_section("missing_df", deps=["frame"], public=False)
+def _missing_df(ctx: ReportContext) -> pd.DataFrame:
+    return missing_table(ctx["frame"])
+
+
+@_section("corr_df", deps=["frame"], public=False)
+def _corr_df(ctx: ReportContext) -> pd.DataFrame:
+    return correlation_matrix(ctx["frame"])
+
+
+@_section("top_cats", deps=["frame"], public=False)
+def _top_cats(ctx: ReportContext) -> Dict[str, pd.DataFrame]:
+    return top_categories(ctx["frame"], top_k=ctx.config.top_k_categories)
+
+
+@_section("corr_order", deps=["corr_df"], public=False)
+def _corr_order(ctx: ReportContext) -> List[str]:
+    corr = ctx["corr_df"]
+    if corr.shape[1] <= ctx.config.max_heatmap_columns:
+        return list(corr.columns)
+    return cluster_order(corr)
+
+
+@_section("shard_table", public=False)
+def _shard_table(ctx: ReportContext) -> pd.DataFrame:
+    # Для одиночного файла шардов нет; при профилировании каталога/маски
+    # таблица подставляется заранее (см. cli.report и shards.shard_table)
+    return pd.DataFrame()
+
+
+@_section("hist_counts", deps=["frame"], public=False)
+def _hist_counts(ctx: ReportContext):
+    return histogram_counts(ctx["frame"])
+
+
+@_section("dataset_profile", deps=["frame"], public=False)
+def _dataset_profile(ctx: ReportContext):
+    # Для шардов подставляется объединённый профиль (см. cli.report)
+    return profile_frame(ctx["frame"], source=ctx.config.source_name)
+
+
+@_section("target_profile", deps=["frame"], public=False)
+def _target_profile(ctx: ReportContext):
+    # Без таргета для шардов узел подставляется заранее (None), чтобы не грузить сырые данные
+    target = ctx.config.target
+    return profile_target(ctx["frame"], target) if target is not None else None
+
+
+@_section("quality_flags", deps=["dataset_summary", "missing_df", "target_profile"], public=False)
+def _quality_flags(ctx: ReportContext) -> Dict[str, Any]:
+    return compute_quality_flags(ctx["dataset_summary"], ctx["missing_df"], target=ctx["target_profile"])
+
+
+# ---------- Секции-артефакты ----------
+
+
+@_section("summary", deps=["dataset_summary"])
+def _summary_csv(ctx: ReportContext) -> List[Path]:
+    out_path = ctx.config.out_root / "summary.csv"
+    flatten_summary_for_print(ctx["dataset_summary"]).to_csv(out_path, index=False)
+    return [out_path]
+
+
+@_section("missing", deps=["missing_df"])
+def _missing_csv(ctx: ReportContext) -> List[Path]:
+    missing_df = ctx["missing_df"]
+    if missing_df.empty:
+        return []
+    out_path = ctx.config.out_root / "missing.csv"
+    missing_df.to_csv(out_path, index=True)
+    return [out_path]
+
+
+@_section("correlation", deps=["corr_df"])
+def _correlation_csv(ctx: ReportContext) -> List[Path]:
+    corr_df = ctx["corr_df"]
+    if corr_df.empty:
+        return []
+    out_path = ctx.config.out_root / "correlation.csv"
+    corr_df.to_csv(out_path, index=True)
+    return [out_path]
+
+
+@_section("top_categories", deps=["top_cats"])
+def _top_categories_csv(ctx: ReportContext) -> List[Path]:
+    return save_top_categories_tables(ctx["top_cats"], ctx.config.out_root / "top_categories")
+
+
+@_section("shards", deps=["shard_table"])
+def _shards_csv(ctx: ReportContext) -> List[Path]:
+    table = ctx["shard_table"]
+    if table.empty:
+        return []
+    out_path = ctx.config.out_root / "shards.csv"
+    table.to_csv(out_path, index=False)
+    return [out_path]
+
+
+@_section("histograms", deps=["frame"])
+def _histograms(ctx: ReportContext) -> List[Path]:
+    return plot_histograms_per_column(
+        ctx["frame"], ctx.config.out_root, max_columns=ctx.config.max_hist_columns
+    )
+
+
+@_section("histogram_grid", deps=["hist_counts"])
+def _histogram_grid(ctx: ReportContext) -> List[Path]:
+    return plot_histogram_grid(ctx["hist_counts"], ctx.config.out_root)
+
+
+@_section("missing_matrix", deps=["frame"])
+def _missing_matrix(ctx: ReportContext) -> List[Path]:
+    return [plot_missing_matrix(ctx["frame"], ctx.config.out_root / "missing_matrix.png")]
+
+
+@_section("correlation_heatmap", deps=["frame", "corr_df", "corr_order"])
+def _correlation_heatmap(ctx: ReportContext) -> List[Path]:
+    cfg = ctx.config
+    corr = ctx["corr_df"]
+    if cfg.heatmap_mode == "tiles" and corr.shape[1] > cfg.max_heatmap_columns:
+        return plot_correlation_tiles(corr, cfg.out_root, order=ctx["corr_order"], tile_size=cfg.max_heatmap_columns)
+    out_path = cfg.out_root / "correlation_heatmap.png"
+    return [
+        plot_correlation_heatmap(
+            ctx["frame"], out_path, corr=corr, max_columns=cfg.max_heatmap_columns, order=ctx["corr_order"]
+        )
+    ]
+
+
+@_section("json", deps=["dataset_summary", "quality_flags"])
+def _json_summary(ctx: ReportContext) -> List[Path]:
+    json_summary_data = build_json_summary(ctx["dataset_summary"], ctx["quality_flags"])
+    return [write_json(ctx.config.out_root / "summary.json", json_summary_data)]
+
+
+@_section("artifact", deps=["dataset_profile", "dataset_summary", "missing_df", "corr_df", "top_cats", "hist_counts"])
+def _artifact(ctx: ReportContext) -> List[Path]:
+    artifact = ProfileArtifact(
+        profile=ctx["dataset_profile"],
+        summary=ctx["dataset_summary"],
+        missing=ctx["missing_df"],
+        correlation=ctx["corr_df"],
+        top_categories=ctx["top_cats"],
+        meta={"source": ctx.config.source_name, "title": ctx.config.report_title},
+        histograms=ctx["hist_counts"],
+    )
+    return [save_profile(ctx.config.out_root / f"dataset{ARTIFACT_SUFFIX}", artifact)]
+
+
+@_section("markdown", deps=["dataset_summary", "missing_df", "corr_df", "top_cats", "quality_flags", "shard_table"])
+def _markdown(ctx: ReportContext) -> List[Path]:
+    cfg = ctx.config
+    summary = ctx["dataset_summary"]
+    missing_df = ctx["missing_df"]
+    corr_df = ctx["corr_df"]
+    top_cats = ctx["top_cats"]
+    quality_flags = ctx["quality_flags"]
+    shards = ctx["shard_table"]
+
+    md_path = cfg.out_root / "report.md"
+    with md_path.open("w", encoding="utf-8") as f:
+        f.write(f"# {cfg.report_title}\n\n")
+        f.write(f"Исходный файл: `{cfg.source_name}`\n\n")
+        f.write(f"Строк: **{summary.n_rows}**, столбцов: **{summary.n_cols}**\n\n")
+
+        f.write("## Качество данных (эвристики)\n\n")
+        f.write(f"- Оценка качества: **{quality_flags['quality_score']:.2f}**\n")
+        f.write(f"- Макс. доля пропусков по колонке: **{quality_flags['max_missing_share']:.2%}**\n")
+        f.write(f"- Слишком мало строк: **{quality_flags['too_few_rows']}**\n")
+        f.write(f"- Слишком много колонок: **{quality_flags['too_many_columns']}**\n")
+        f.write(f"- Слишком много пропусков: **{quality_flags['too_many_missing']}**\n")
+        f.write(f"- Наличие константных колонок: **{quality_flags['has_constant_columns']}**\n")
+        f.write(f"- Наличие категориальных признаков с высокой кардинальностью: **{quality_flags['has_high_cardinality_categoricals']}**\n")
+        f.write(f"- Наличие числовых колонок с большим количеством нулей: **{quality_flags['has_many_zero_values']}**\n")
+        f.write(f"- Наличие подозрительных дубликатов ID: **{quality_flags['has_suspicious_id_duplicates']}**\n\n")
+
+        if "target" in quality_flags:
+            target = quality_flags["target_profile"]
+            f.write(f"## Таргет `{target['name']}`\n\n")
+            task = "классификация" if target["kind"] == "classification" else "регрессия"
+            f.write(f"- Задача: **{task}**, размеченных строк: **{target['n_labeled']}**, без таргета: **{target['missing']}**\n")
+            if target["classes"] is not None:
+                classes = ", ".join(f"`{label}`: {count}" for label, count in list(target["classes"].items())[:10])
+                f.write(f"- Классы: {classes}\n")
+                f.write(f"- Дисбаланс классов: **{quality_flags['has_class_imbalance']}**\n")
+            leakage = ", ".join(f"`{name}`" for name in quality_flags["leakage_columns"]) or "нет"
+            f.write(f"- Подозрение на утечку таргета: {leakage}\n")
+            top = list(target["mutual_info"].items())[:5]
+            if top:
+                informative = ", ".join(f"`{name}` ({score:.2f})" for name, score in top)
+                f.write(f"- Самые информативные признаки (доля энтропии таргета): {informative}\n")
+            f.write("\n")
+
+        f.write("## Параметры отчёта\n\n")
+        f.write(f"- Минимальная доля пропусков для проблемных колонок: **{cfg.min_missing_share:.2%}**\n")
+        f.write(f"- Количество top-категорий: **{cfg.top_k_categories}**\n")
+        f.write(f"- Максимум колонок для гистограмм: **{cfg.max_hist_columns}**\n\n")
+
+        if not shards.empty:
+            f.write("## Шарды\n\n")
+            f.write(f"Файлов: **{len(shards)}**. Подробности по каждому – в `shards.csv`.\n\n")
+            worst = shards.sort_values("quality_score").head(5)
+            for _, row in worst.iterrows():
+                f.write(
+                    f"- `{row['shard']}`: строк {row['n_rows']}, "
+                    f"оценка качества {row['quality_score']:.2f}, "
+                    f"макс. доля пропусков {row['max_missing_share']:.2%}\n"
+                )
+            f.write("\n")
+
+        f.write("## Колонки\n\n")
+        f.write("См. файл `summary.csv`.\n\n")
+
+        f.write("## Пропуски\n\n")
+        if missing_df.empty:
+            f.write("Пропусков нет или датасет пуст.\n\n")
+        else:
+            f.write("См. файлы `missing.csv` и `missing_matrix.png`.\n\n")
+
+        f.write("## Корреляция числовых признаков\n\n")
+        if corr_df.empty:
+            f.write("Недостаточно числовых колонок для корреляции.\n\n")
+        else:
+            heatmap = "`correlation_heatmap.png`"
+            if corr_df.shape[1] > cfg.max_heatmap_columns:
+                if cfg.heatmap_mode == "tiles":
+                    heatmap = "`correlation_overview.png` и плитки `correlation_tile_*.png`"
+                else:
+                    heatmap += f" (top-{cfg.max_heatmap_columns} самых коррелирующих колонок из {corr_df.shape[1]})"
+            f.write(f"См. `correlation.csv` и {heatmap}.\n\n")
+
+        f.write("## Категориальные признаки\n\n")
+        if not top_cats:
+            f.write("Категориальные/строковые признаки не найдены.\n\n")
+        else:
+            f.write("См. файлы в папке `top_categories/`.\n\n")
+
+        f.write("## Гистограммы числовых колонок\n\n")
+        f.write("См. файлы `hist_*.png`; все колонки сразу – в `histograms_*.svg`.\n")
+    return [md_path]
+
+
+DEFAULT_SECTIONS: Tuple[str, ...] = (
+    "summary",
+    "missing",
+    "correlation",
+    "top_categories",
+    "markdown",
+    "histograms",
+    "histogram_grid",
+    "missing_matrix",
+    "correlation_heatmap",
+)
+
+
+def public_sections() -> List[str]:
+    return [name for name, section in SECTIONS.items() if section.public]
+
+
+def parse_sections(value: Optional[str]) -> List[str]:
+    """
+    Разбирает строку вида "summary,missing" в список имён секций.
+    Пустое значение означает набор секций по умолчанию.
+    """
+    if not value:
+        return list(DEFAULT_SECTIONS)
+    names = [part.strip() for part in value.split(",") if part.strip()]
+    unknown = [name for name in names if name not in SECTIONS or not SECTIONS[name].public]
+    if unknown:
+        raise ValueError(
+            f"Неизвестные секции: {', '.join(unknown)}. "
+            f"Доступны: {', '.join(public_sections())}"
+        )
+    return names
+
+
+def resolve_sections(names: Iterable[str], precomputed: Iterable[str] = ()) -> List[str]:
+    """
+    Замыкание по зависимостям в топологическом порядке:
+    только те узлы, которые реально нужны запрошенным секциям.
+    Узлы из precomputed (и их зависимости) уже посчитаны и пропускаются.
+    """
+    order: List[str] = []
+    visiting: set = set()
+    done: set = set(precomputed)
+
+    def visit(name: str) -> None:
+        if name in done:
+            return
+        if name not in SECTIONS:
+            raise ValueError(f"Неизвестная секция: {name}")
+        if name in visiting:
+            raise ValueError(f"Циклическая зависимость в секции: {name}")
+        visiting.add(name)
+        for dep in SECTIONS[name].deps:
+            visit(dep)
+        visiting.discard(name)
+        done.add(name)
+        order.append(name)
+
+    for name in names:
+        if name not in done:
+            visit(name)
+    return order
+
+
+def _run_node(ctx: ReportContext, name: str) -> Any:
+    check_cancelled()
+    section = SECTIONS[name]
+    if not section.public:
+        # Промежуточные узлы замеряются самими функциями ядра (instrument.traced)
+        return section.func(ctx)
+    with stage(f"section:{name}"):
+        return section.func(ctx)
+
+
+def run_report(ctx: ReportContext, names: Iterable[str], jobs: int = 1) -> Dict[str, Any]:
+    """
+    Выполняет запрошенные секции и их зависимости.
+    При jobs > 1 независимые узлы выполняются параллельно в пуле потоков.
+    Результаты, заранее положенные в ctx.results, не пересчитываются.
+    Возвращает словарь {имя узла: результат}.
+    """
+    order = resolve_sections(names, precomputed=ctx.results)
+
+    if jobs <= 1:
+        for name in order:
+            if name not in ctx.results:
+                ctx.results[name] = _run_node(ctx, name)
+        return ctx.results
+
+    remaining = {name: set(SECTIONS[name].deps) - set(ctx.results) for name in order if name not in ctx.results}
+    running: Dict[Future, str] = {}
+
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        while remaining or running:
+            ready = [name for name, deps in remaining.items() if not deps]
+            for name in ready:
+                del remaining[name]
+                # Копируем контекст, чтобы в потоке был виден активный трейсер
+                running[pool.submit(contextvars.copy_context().run, _run_node, ctx, name)] = name
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                name = running.pop(future)
+                # Исключение пробрасываем сразу: остальные узлы уже не нужны
+                ctx.results[name] = future.result()
+                for deps in remaining.values():
+                    deps.discard(name)
+
+    return ctx.results
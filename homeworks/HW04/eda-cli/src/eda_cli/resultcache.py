@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+# Кэш готовых результатов HTTP-сервиса (закодированный JSON) по хэшу содержимого
+# загруженного файла. Два уровня LRU, оба ограничены по байтам: в памяти процесса
+# и в каталоге на диске (общем для воркеров uvicorn). Порядок на диске – по mtime:
+# попадание «трогает» файл, вытесняются самые давно использованные.
+
+DEFAULT_MEMORY_BYTES = 64 * 2**20
+DEFAULT_DISK_BYTES = 512 * 2**20
+
+
+class ResultCache:
+    def __init__(
+        self,
+        root: Optional[Path] = None,
+        max_memory_bytes: int = DEFAULT_MEMORY_BYTES,
+        max_disk_bytes: int = DEFAULT_DISK_BYTES,
+    ) -> None:
+        """root=None или max_disk_bytes=0 – только память."""
+        self.root = Path(root) if root is not None and max_disk_bytes > 0 else None
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self._memory_bytes = 0
+        self._disk_bytes: Optional[int] = None  # считается при первой записи
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, key: str) -> Path:
+        assert self.root is not None
+        return self.root / f"{key}.json"
+
+    def _remember(self, key: str, value: bytes) -> None:
+        """Кладёт значение в память и вытесняет старые записи сверх лимита (под self._lock)."""
+        if len(value) > self.max_memory_bytes:
+            return
+        old = self._memory.pop(key, None)
+        if old is not None:
+            self._memory_bytes -= len(old)
+        self._memory[key] = value
+        self._memory_bytes += len(value)
+        while self._memory_bytes > self.max_memory_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            value = self._memory.get(key)
+            if value is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return value
+        value = self._read_disk(key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self._remember(key, value)
+            self.hits += 1
+        return value
+
+    def put(self, key: str, value: bytes) -> None:
+        with self._lock:
+            self._remember(key, value)
+        self._write_disk(key, value)
+
+    # ---------- Диск ----------
+
+    def _read_disk(self, key: str) -> Optional[bytes]:
+        if self.root is None:
+            return None
+        path = self._path(key)
+        try:
+            value = path.read_bytes()
+            os.utime(path)
+        except OSError:
+            return None
+        return value
+
+    def _write_disk(self, key: str, value: bytes) -> None:
+        if self.root is None or len(value) > self.max_disk_bytes:
+            return
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+            path = self._path(key)
+            # Запись через временный файл: другой воркер не увидит половину JSON
+            tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp.write_bytes(value)
+            tmp.replace(path)
+        except OSError:
+            return
+        with self._lock:
+            if self._disk_bytes is None:
+                self._disk_bytes = sum(p.stat().st_size for p in self.root.glob("*.json"))
+            else:
+                self._disk_bytes += len(value)
+            over = self._disk_bytes > self.max_disk_bytes
+        if over:
+            self._evict_disk()
+
+    def _evict_disk(self) -> None:
+        """Удаляет самые давно использованные файлы, пока каталог не уложится в лимит."""
+        assert self.root is not None
+        entries = []
+        for path in self.root.glob("*.json"):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime_ns, st.st_size, path))
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total -= size
+        with self._lock:
+            self._disk_bytes = total
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import dataclasses
+import json
+import math
+from datetime import date, datetime
+from pathlib import Path, PurePath
+from typing import Any, Iterable, Iterator, Mapping, Optional
+
+import numpy as np
+
+try:  # необязательное ускорение: uv sync --extra fast (или pip install orjson)
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore[assignment]
+
+# Сериализация результатов в JSON. С orjson dataclass'ы (DatasetSummary, ColumnSummary)
+# и NumPy-значения кодируются напрямую, без промежуточных словарей asdict() и без
+# float() на каждое значение; без orjson – тот же результат через json с default().
+# Для очень широких сводок есть потоковая запись: элементы больших списков
+# (колонки, проблемные колонки) кодируются и отдаются по одному.
+
+HAS_ORJSON = orjson is not None
+
+_ORJSON_OPTIONS = (orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS) if HAS_ORJSON else 0
+
+
+def _finite(obj: Any) -> Any:
+    """NaN/inf -> None (как пишет orjson): в строгом JSON таких литералов нет."""
+    if isinstance(obj, float):
+        return obj if math.isfinite(obj) else None
+    if isinstance(obj, dict):
+        return {key: _finite(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_finite(value) for value in obj]
+    return obj
+
+
+def _default(obj: Any) -> Any:
+    """То, что не умеет кодировать сам сериализатор: NumPy, dataclass, даты, пути."""
+    if isinstance(obj, np.generic):
+        return _finite(obj.item())
+    if isinstance(obj, np.ndarray):
+        return _finite(obj.tolist())
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return _finite(dataclasses.asdict(obj))
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, PurePath):
+        return str(obj)
+    raise TypeError(f"Объект типа {type(obj).__name__} не сериализуется в JSON")
+
+
+def dumps(obj: Any, indent: bool = False) -> bytes:
+    """JSON в UTF-8 (без экранирования не-ASCII); indent=True – отступ в 2 пробела."""
+    if HAS_ORJSON:
+        options = _ORJSON_OPTIONS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(obj, default=_default, option=options)
+    return json.dumps(
+        _finite(obj),
+        default=_default,
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=2 if indent else None,
+        separators=None if indent else (",", ":"),
+    ).encode("utf-8")
+
+
+def loads(data: bytes | str) -> Any:
+    return orjson.loads(data) if HAS_ORJSON else json.loads(data)
+
+
+def iter_json(fields: Mapping[str, Any], streamed: Optional[Mapping[str, Iterable[Any]]] = None) -> Iterator[bytes]:
+    """
+    JSON-объект кусками: сначала обычные поля, затем списки из streamed, каждый
+    элемент которых кодируется отдельно. Итерируемые в streamed могут быть ленивыми –
+    в памяти одновременно находится только один закодированный элемент.
+    """
+    yield b"{"
+    first = True
+    for key, value in fields.items():
+        yield (b"" if first else b",") + dumps(key) + b":" + dumps(value)
+        first = False
+    for key, items in (streamed or {}).items():
+        yield (b"" if first else b",") + dumps(key) + b":["
+        first = False
+        for i, item in enumerate(items):
+            yield (b"," if i else b"") + dumps(item)
+        yield b"]"
+    yield b"}"
+
+
+def write_json(path: Path, obj: Any) -> Path:
+    """Весь объект в файл с отступами (как json.dump(indent=2))."""
+    path = Path(path)
+    path.write_bytes(dumps(obj, indent=True))
+    return path
+
+
+def write_json_stream(path: Path, chunks: Iterable[bytes]) -> Path:
+    """Кусочки из iter_json() в файл – без сборки всего документа в памяти."""
+    path = Path(path)
+    with open(path, "wb") as f:
+        for chunk in chunks:
+            f.write(chunk)
+    return path
+
+
+def iter_dataset_summary(summary: Any, extra: Optional[Mapping[str, Any]] = None) -> Iterator[bytes]:
+    """Полная сводка DatasetSummary с колонками, закодированными по одной."""
+    fields = {"n_rows": summary.n_rows, "n_cols": summary.n_cols, **(extra or {})}
+    return iter_json(fields, {"columns": summary.columns})
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import glob
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from .compression import CSV_PATTERNS, open_source
+from .core import compute_quality_flags
+from .profiling import DEFAULT_CHUNKSIZE, DatasetProfile, profile_csv
+from .sniff import CsvDialect
+
+# Какие файлы в каталоге считаются шардами датасета (в т.ч. сжатые)
+SHARD_PATTERNS: Tuple[str, ...] = CSV_PATTERNS
+
+
+def is_glob(path: str) -> bool:
+    return glob.has_magic(path)
+
+
+def is_multi_source(path: str) -> bool:
+    """Каталог или glob-маска – датасет из нескольких шардов."""
+    return is_glob(path) or Path(path).is_dir()
+
+
+def expand_sources(path: str) -> List[Path]:
+    """
+    Разворачивает путь в отсортированный список файлов:
+    каталог – все подходящие файлы в нём, glob-маска – совпадения, иначе – сам файл.
+    """
+    if is_glob(path):
+        return sorted(Path(p) for p in glob.glob(path, recursive=True) if Path(p).is_file())
+    p = Path(path)
+    if p.is_dir():
+        found = {f for pattern in SHARD_PATTERNS for f in p.glob(pattern) if f.is_file()}
+        return sorted(found)
+    return [p]
+
+
+@dataclass
+class ShardProfile:
+    path: Path
+    profile: DatasetProfile
+
+
+def _profile_one(path: Path, dialect: Optional[CsvDialect], chunksize: int) -> ShardProfile:
+    return ShardProfile(path=path, profile=profile_csv(path, dialect=dialect, chunksize=chunksize))
+
+
+def profile_shards(
+    paths: Sequence[Path],
+    dialect: Optional[CsvDialect] = None,
+    workers: Optional[int] = None,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+) -> List[ShardProfile]:
+    """
+    Профилирует шарды параллельно в пуле процессов (каждый шард – потоково по чанкам).
+    Порядок результата совпадает с порядком paths.
+    """
+    workers = workers or os.cpu_count() or 1
+    job = partial(_profile_one, dialect=dialect, chunksize=chunksize)
+    if workers <= 1 or len(paths) <= 1:
+        return [job(p) for p in paths]
+    with ProcessPoolExecutor(max_workers=min(workers, len(paths))) as pool:
+        return list(pool.map(job, paths))
+
+
+def merge_shards(shards: Sequence[ShardProfile]) -> DatasetProfile:
+    merged = DatasetProfile(source=", ".join(str(s.path) for s in shards))
+    for shard in shards:
+        merged.merge(shard.profile)
+    return merged
+
+
+def shard_table(shards: Sequence[ShardProfile]) -> pd.DataFrame:
+    """
+    Разбивка по шардам, чтобы быстро найти «плохой»:
+    размер, пропуски, оценка качества и отличия схемы от объединённой.
+    """
+    all_columns: List[str] = []
+    for shard in shards:
+        all_columns.extend(name for name in shard.profile.columns if name not in all_columns)
+
+    rows = []
+    for shard in shards:
+        profile = shard.profile
+        summary = profile.to_summary()
+        flags = compute_quality_flags(summary, profile.missing_table())
+        missing_columns = [name for name in all_columns if name not in profile.columns]
+        rows.append(
+            {
+                "shard": shard.path.name,
+                "n_rows": summary.n_rows,
+                "n_cols": summary.n_cols,
+                "max_missing_share": flags["max_missing_share"],
+                "quality_score": flags["quality_score"],
+                "missing_columns": ",".join(missing_columns),
+            }
+        )
+    return pd.DataFrame(rows)
+
+
+def load_shards_frame(paths: Sequence[Path], dialect: Optional[CsvDialect] = None) -> pd.DataFrame:
+    """Полный DataFrame по всем шардам – нужен только секциям, которым нужны сырые данные (графики, корреляция)."""
+    frames = []
+    for p in paths:
+        with open_source(p) as stream:
+            frames.append(pd.read_csv(stream, **(dialect or CsvDialect()).read_csv_kwargs()))
+    return pd.concat(frames, ignore_index=True)
@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Небольшие «скетчи» – компактные состояния, которые обновляются по чанкам
+# и сливаются между собой (merge). Благодаря им профиль файла можно посчитать
+# потоково, не держа весь DataFrame в памяти, и объединять профили шардов.
+
+
+class SampleSketch:
+    """
+    Равномерная выборка фиксированного размера (bottom-k по случайным приоритетам).
+
+    Каждому значению присваивается случайный приоритет, храним capacity значений
+    с наименьшими приоритетами. Слияние двух скетчей – снова k наименьших,
+    т.е. равномерная выборка из объединения. По выборке считаем квантили, CDF и т.п.
+    """
+
+    def __init__(self, capacity: int = 2048, seed: int = 0) -> None:
+        self.capacity = capacity
+        self.values = np.empty(0, dtype="float64")
+        self.priorities = np.empty(0, dtype="float64")
+        self._rng = np.random.default_rng(seed)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def _keep_smallest(self, values: np.ndarray, priorities: np.ndarray) -> None:
+        if len(values) > self.capacity:
+            idx = np.argpartition(priorities, self.capacity - 1)[: self.capacity]
+            values, priorities = values[idx], priorities[idx]
+        self.values, self.priorities = values, priorities
+
+    def update(self, values: np.ndarray) -> None:
+        values = np.asarray(values, dtype="float64")
+        if len(values) == 0:
+            return
+        priorities = self._rng.random(len(values))
+        self._keep_smallest(
+            np.concatenate([self.values, values]),
+            np.concatenate([self.priorities, priorities]),
+        )
+
+    def merge(self, other: "SampleSketch") -> "SampleSketch":
+        self._keep_smallest(
+            np.concatenate([self.values, other.values]),
+            np.concatenate([self.priorities, other.priorities]),
+        )
+        return self
+
+    def sorted_values(self) -> np.ndarray:
+        return np.sort(self.values)
+
+    def quantiles(self, qs: Sequence[float]) -> np.ndarray:
+        if len(self.values) == 0:
+            return np.full(len(qs), np.nan)
+        return np.quantile(self.values, qs)
+
+
+class TopKSketch:
+    """
+    Частые значения по алгоритму Misra–Gries (с возможностью слияния).
+
+    Пока различных значений не больше capacity, счётчики точные;
+    дальше редкие значения вытесняются, а частые недооцениваются не более
+    чем на total / capacity. total – число учтённых непустых значений.
+    """
+
+    def __init__(self, capacity: int = 256) -> None:
+        self.capacity = capacity
+        self.counts: Dict[str, int] = {}
+        self.total = 0
+
+    def _trim(self) -> None:
+        if len(self.counts) <= self.capacity:
+            return
+        threshold = sorted(self.counts.values(), reverse=True)[self.capacity]
+        self.counts = {k: c - threshold for k, c in self.counts.items() if c > threshold}
+
+    def update(self, value_counts: pd.Series) -> None:
+        """value_counts – результат Series.value_counts() по очередному чанку."""
+        counts = self.counts
+        for value, count in zip(value_counts.index.astype(str), value_counts.to_numpy()):
+            counts[value] = counts.get(value, 0) + int(count)
+        self.total += int(value_counts.sum())
+        self._trim()
+
+    def merge(self, other: "TopKSketch") -> "TopKSketch":
+        for value, count in other.counts.items():
+            self.counts[value] = self.counts.get(value, 0) + count
+        self.total += other.total
+        self._trim()
+        return self
+
+    def top(self, k: int) -> List[Tuple[str, int]]:
+        return sorted(self.counts.items(), key=lambda item: (-item[1], item[0]))[:k]
+
+    def shares(self) -> Dict[str, float]:
+        if self.total == 0:
+            return {}
+        return {value: count / self.total for value, count in self.counts.items()}
+
+
+class DistinctSketch:
+    """
+    Оценка числа уникальных значений методом KMV (k minimum values).
+
+    Храним k наименьших 64-битных хэшей. Пока различных хэшей меньше k,
+    ответ точный; иначе оценка (k - 1) / (k-й хэш / 2^64).
+    """
+
+    def __init__(self, k: int = 4096) -> None:
+        self.k = k
+        self.hashes = np.empty(0, dtype="uint64")
+
+    def _keep(self, hashes: np.ndarray) -> None:
+        self.hashes = np.unique(hashes)[: self.k]
+
+    def update(self, values: pd.Series) -> None:
+        if values.empty:
+            return
+        hashes = pd.util.hash_pandas_object(values, index=False).to_numpy()
+        self._keep(np.concatenate([self.hashes, hashes]))
+
+    def merge(self, other: "DistinctSketch") -> "DistinctSketch":
+        self._keep(np.concatenate([self.hashes, other.hashes]))
+        return self
+
+    def estimate(self) -> int:
+        if len(self.hashes) < self.k:
+            return int(len(self.hashes))
+        kth = float(self.hashes[self.k - 1]) / 2.0**64
+        return int(round((self.k - 1) / kth))
+
+
+def psi(
+    expected: np.ndarray,
+    actual: np.ndarray,
+    bins: int = 10,
+    eps: float = 1e-4,
+) -> Optional[float]:
+    """
+    Population Stability Index по двум выборкам.
+    Границы бинов – квантили «ожидаемой» (старой) выборки.
+    """
+    if len(expected) == 0 or len(actual) == 0:
+        return None
+    edges = np.unique(np.quantile(expected, np.linspace(0.0, 1.0, bins + 1)))
+    if len(edges) < 2:
+        # Константная колонка: два «бина» – значение равно константе или нет
+        constant = edges[0]
+        expected_share = np.array([np.mean(expected == constant), np.mean(expected != constant)])
+        actual_share = np.array([np.mean(actual == constant), np.mean(actual != constant)])
+    else:
+        inner = edges[1:-1]
+        expected_share = np.bincount(np.searchsorted(inner, expected, side="right"), minlength=len(edges) - 1) / len(expected)
+        actual_share = np.bincount(np.searchsorted(inner, actual, side="right"), minlength=len(edges) - 1) / len(actual)
+    expected_share = np.clip(expected_share, eps, None)
+    actual_share = np.clip(actual_share, eps, None)
+    return float(np.sum((actual_share - expected_share) * np.log(actual_share / expected_share)))
+
+
+def ks_statistic(a: np.ndarray, b: np.ndarray) -> Optional[float]:
+    """Статистика Колмогорова–Смирнова: max |F_a(x) - F_b(x)|."""
+    if len(a) == 0 or len(b) == 0:
+        return None
+    a = np.sort(a)
+    b = np.sort(b)
+    grid = np.concatenate([a, b])
+    cdf_a = np.searchsorted(a, grid, side="right") / len(a)
+    cdf_b = np.searchsorted(b, grid, side="right") / len(b)
+    return float(np.max(np.abs(cdf_a - cdf_b)))
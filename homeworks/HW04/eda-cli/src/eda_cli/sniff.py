@@ -0,0 +1,234 @@
+from __future__ import annotations
+
+import codecs
+import hashlib
+import json
+import re
+from collections import Counter
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# Быстрое определение формата CSV по первым килобайтам: кодировка (BOM, валидный
+# UTF-8, иначе cp1251 – типичный случай русскоязычных выгрузок из Excel/1С),
+# разделитель, кавычки и наличие заголовка. Читается только SNIFF_BYTES байт;
+# результат для файла кэшируется на диске по пути, размеру и mtime.
+
+SNIFF_BYTES = 16 * 1024
+# Версия эвристик: при её смене закэшированные форматы пересчитываются
+SNIFF_VERSION = 2
+SNIFF_LINES = 50
+DELIMITERS = (",", ";", "\t", "|")
+QUOTECHARS = ('"', "'")
+
+BOMS: Tuple[Tuple[bytes, str], ...] = (
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+FALLBACK_ENCODING = "cp1251"
+
+_NUMBER = re.compile(r"\s*[-+]?(\d+([.,]\d*)?|[.,]\d+)([eE][-+]?\d+)?\s*$")
+_INTEGER = re.compile(r"\s*[-+]?\d+\s*$")
+_DELIMITER_NAMES = {",": "запятая", ";": "точка с запятой", "\t": "табуляция", "|": "вертикальная черта"}
+
+
+@dataclass(frozen=True)
+class CsvDialect:
+    delimiter: str = ","
+    quotechar: str = '"'
+    has_header: bool = True
+    encoding: str = "utf-8"
+    quoted: bool = False  # встречались ли поля в кавычках
+    n_columns: int = 0
+
+    def read_csv_kwargs(self) -> Dict[str, object]:
+        """Параметры для pd.read_csv."""
+        return {
+            "sep": self.delimiter,
+            "quotechar": self.quotechar,
+            "encoding": self.encoding,
+            "header": 0 if self.has_header else None,
+        }
+
+    def describe(self) -> str:
+        delimiter = _DELIMITER_NAMES.get(self.delimiter, repr(self.delimiter))
+        return (
+            f"разделитель: {delimiter}, кодировка: {self.encoding}, "
+            f"заголовок: {'да' if self.has_header else 'нет'}, кавычки: {self.quotechar}"
+        )
+
+    def to_dict(self) -> Dict[str, object]:
+        return asdict(self)
+
+
+def detect_encoding(block: bytes) -> str:
+    """BOM, иначе UTF-8, если блок валиден (обрезанный в конце символ допустим), иначе cp1251."""
+    for bom, encoding in BOMS:
+        if block.startswith(bom):
+            return encoding
+    try:
+        codecs.getincrementaldecoder("utf-8")().decode(block, final=False)
+        return "utf-8"
+    except UnicodeDecodeError:
+        return FALLBACK_ENCODING
+
+
+def _strip_quoted(line: str, quotechar: str) -> str:
+    """Строка без содержимого полей в кавычках (разделители внутри кавычек не считаются)."""
+    if quotechar not in line:
+        return line
+    parts = line.split(quotechar)
+    # Чётные части – вне кавычек; удвоенная кавычка внутри поля даёт пустую нечётную часть
+    return "".join(parts[0::2])
+
+
+def _pick_quotechar(text: str) -> str:
+    """Кавычка, которая чаще стоит вплотную к разделителю или краю строки."""
+    best, best_score = '"', 0
+    for quote in QUOTECHARS:
+        score = sum(text.count(d + quote) + text.count(quote + d) for d in DELIMITERS) + text.count("\n" + quote)
+        if score > best_score:
+            best, best_score = quote, score
+    return best
+
+
+def _pick_delimiter(lines: List[str]) -> Tuple[str, int]:
+    """
+    Разделитель с самым стабильным числом вхождений по строкам: для каждого
+    кандидата берётся мода числа вхождений и доля строк с ней. (разделитель, число колонок).
+    """
+    best: Tuple[float, int, str] = (0.0, 0, ",")
+    for delimiter in DELIMITERS:
+        counts = Counter(line.count(delimiter) for line in lines)
+        mode, freq = max(counts.items(), key=lambda item: (item[1], item[0]))
+        if mode == 0:
+            continue
+        candidate = (freq / len(lines), mode, delimiter)
+        if candidate[:2] > best[:2]:
+            best = candidate
+    _, mode, delimiter = best
+    return delimiter, mode + 1
+
+
+def _cell_class(cell: str) -> object:
+    """Класс значения для сравнения с заголовком: "int"/"float" для чисел, длина – для текста."""
+    if _NUMBER.match(cell):
+        return "int" if _INTEGER.match(cell) else "float"
+    return len(cell.strip())
+
+
+def _looks_like_header(first: List[str], rest: List[List[str]]) -> bool:
+    """
+    Голосование по колонкам, как в csv.Sniffer: ячейка первой строки голосует «за»
+    заголовок, если её класс (целое, дробное или текст определённой длины) отличается
+    от класса значений ниже, и «против», если совпадает. Числовая ячейка над текстовой
+    колонкой – тоже «за»: заголовки вида 2023 или 1st не выдают файл за безголовый.
+    При ничьей – заголовок, если значения первой строки непустые, различные
+    и не встречаются в тех же колонках ниже.
+    """
+    if not rest:
+        return not any(_NUMBER.match(cell) for cell in first)
+    votes = 0
+    for i, cell in enumerate(first):
+        column = [row[i] for row in rest if i < len(row) and row[i].strip()]
+        if not column or not cell.strip():
+            continue
+        classes = {_cell_class(value) for value in column}
+        cell_class = _cell_class(cell)
+        if classes <= {"int", "float"}:
+            column_class = "float" if "float" in classes else "int"
+            votes += 1 if cell_class != column_class else -1
+        elif not classes & {"int", "float"}:
+            if isinstance(cell_class, str):
+                votes += 1
+            elif len(classes) == 1:
+                votes += 1 if cell_class not in classes else -1
+    if votes:
+        return votes > 0
+    if any(not cell.strip() for cell in first) or len(set(first)) != len(first):
+        return False
+    return not any(cell == row[i] for row in rest for i, cell in enumerate(first) if i < len(row))
+
+
+def sniff_bytes(block: bytes) -> CsvDialect:
+    """Формат CSV по первому блоку байт (последняя, возможно обрезанная, строка не учитывается)."""
+    encoding = detect_encoding(block)
+    text = codecs.getincrementaldecoder(encoding)(errors="replace").decode(block, final=False)
+    text = text.lstrip("\ufeff")
+    lines = text.splitlines()
+    if len(lines) > 1 and not block.endswith((b"\n", b"\r")):
+        lines = lines[:-1]
+    lines = [line for line in lines[:SNIFF_LINES] if line.strip()]
+    if not lines:
+        return CsvDialect(encoding=encoding)
+
+    quotechar = _pick_quotechar(text)
+    stripped = [_strip_quoted(line, quotechar) for line in lines]
+    delimiter, n_columns = _pick_delimiter(stripped)
+
+    rows = [_split(line, delimiter, quotechar) for line in lines]
+    return CsvDialect(
+        delimiter=delimiter,
+        quotechar=quotechar,
+        has_header=_looks_like_header(rows[0], rows[1:]),
+        encoding=encoding,
+        quoted=any(quotechar in line for line in lines),
+        n_columns=n_columns,
+    )
+
+
+def _split(line: str, delimiter: str, quotechar: str) -> List[str]:
+    """Поля строки с учётом кавычек (без экранирования внутри – для эвристик хватает)."""
+    fields, current, quoted = [], [], False
+    for char in line:
+        if char == quotechar:
+            quoted = not quoted
+        elif char == delimiter and not quoted:
+            fields.append("".join(current))
+            current = []
+        else:
+            current.append(char)
+    fields.append("".join(current))
+    return fields
+
+
+# ---------- Файлы и кэш ----------
+
+
+def _cache_path(path: Path, cache_dir: Path) -> Optional[Path]:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    raw = json.dumps([SNIFF_VERSION, str(path.resolve()), st.st_size, st.st_mtime_ns, SNIFF_BYTES])
+    return cache_dir / f"{hashlib.sha1(raw.encode('utf-8')).hexdigest()}.json"
+
+
+def sniff_path(path: Path, cache_dir: Optional[Path] = None) -> CsvDialect:
+    """
+    Формат CSV-файла (в т.ч. сжатого) по первым SNIFF_BYTES байтам.
+    С cache_dir результат сохраняется и для неизменённого файла берётся из кэша.
+    """
+    from .compression import open_source
+
+    path = Path(path)
+    cached = _cache_path(path, cache_dir) if cache_dir is not None else None
+    if cached is not None:
+        try:
+            return CsvDialect(**json.loads(cached.read_text(encoding="utf-8")))
+        except (OSError, ValueError, TypeError):
+            pass
+
+    with open_source(path, read_ahead=False) as stream:
+        dialect = sniff_bytes(stream.read(SNIFF_BYTES))
+
+    if cached is not None:
+        try:
+            cached.parent.mkdir(parents=True, exist_ok=True)
+            cached.write_text(json.dumps(dialect.to_dict()), encoding="utf-8")
+        except OSError:
+            pass
+    return dialect
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List
+
+import numpy as np
+import pandas as pd
+
+# Генератор синтетических датасетов для бенчмарков и тестов:
+# воспроизводим по seed, с настраиваемой смесью типов, пропусками,
+# кардинальностью категорий и долей нулей.
+
+DEFAULT_DTYPE_MIX: Dict[str, float] = {
+    "int": 0.3,
+    "float": 0.3,
+    "category": 0.25,
+    "text": 0.1,
+    "bool": 0.05,
+}
+
+
+@dataclass
+class SyntheticSpec:
+    rows: int = 10_000
+    cols: int = 10
+    dtype_mix: Dict[str, float] = field(default_factory=lambda: dict(DEFAULT_DTYPE_MIX))
+    missing_rate: float = 0.05  # доля пропусков в каждой колонке
+    cardinality: int = 20  # число различных значений в категориальных колонках
+    zero_share: float = 0.1  # доля нулей в числовых колонках
+    seed: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def _column_kinds(spec: SyntheticSpec) -> List[str]:
+    """Раскладывает cols колонок по типам пропорционально dtype_mix (детерминированно)."""
+    total = sum(spec.dtype_mix.values())
+    kinds: List[str] = []
+    for kind, weight in spec.dtype_mix.items():
+        kinds.extend([kind] * int(round(spec.cols * weight / total)))
+    # Поправка на округление
+    kinds = kinds[: spec.cols]
+    while len(kinds) < spec.cols:
+        kinds.append(next(iter(spec.dtype_mix)))
+    return kinds
+
+
+def _column(kind: str, spec: SyntheticSpec, rng: np.random.Generator) -> pd.Series:
+    n = spec.rows
+    if kind == "int":
+        values = rng.integers(1, 1_000, size=n).astype("float64")
+    elif kind == "float":
+        values = rng.normal(100.0, 25.0, size=n)
+    elif kind == "category":
+        levels = np.array([f"cat_{i}" for i in range(max(1, spec.cardinality))], dtype=object)
+        # Zipf-подобное распределение: несколько частых категорий и длинный хвост
+        weights = 1.0 / np.arange(1, len(levels) + 1)
+        values = rng.choice(levels, size=n, p=weights / weights.sum())
+    elif kind == "text":
+        values = np.array([f"text value {i}" for i in rng.integers(0, max(n, 1), size=n)], dtype=object)
+    elif kind == "bool":
+        values = rng.random(n) < 0.5
+    else:
+        raise ValueError(f"Неизвестный тип колонки: {kind}")
+
+    s = pd.Series(values)
+    if kind in ("int", "float") and spec.zero_share > 0:
+        s[rng.random(n) < spec.zero_share] = 0.0
+    if spec.missing_rate > 0:
+        mask = rng.random(n) < spec.missing_rate
+        if kind == "bool":
+            s = s.astype(object)
+        s[mask] = None if s.dtype == object else np.nan
+    if kind == "int" and not s.isna().any():
+        s = s.astype("int64")
+    return s
+
+
+def generate_dataset(spec: SyntheticSpec) -> pd.DataFrame:
+    """Синтетический DataFrame по спецификации; одинаковый spec – одинаковые данные."""
+    rng = np.random.default_rng(spec.seed)
+    data = {}
+    for i, kind in enumerate(_column_kinds(spec)):
+        data[f"{kind}_{i}"] = _column(kind, spec, rng)
+    return pd.DataFrame(data)
+
+
+def parse_dtype_mix(value: str) -> Dict[str, float]:
+    """'int=0.5,category=0.5' -> {'int': 0.5, 'category': 0.5}"""
+    mix: Dict[str, float] = {}
+    for part in value.split(","):
+        if not part.strip():
+            continue
+        kind, sep, weight = part.partition("=")
+        kind = kind.strip()
+        if not sep or kind not in DEFAULT_DTYPE_MIX:
+            raise ValueError(
+                f"Ожидается вид ТИП=ВЕС, типы: {', '.join(DEFAULT_DTYPE_MIX)}; получено: {part!r}"
+            )
+        mix[kind] = float(weight)
+    if not mix or sum(mix.values()) <= 0:
+        raise ValueError("Сумма весов dtype_mix должна быть положительной")
+    return mix
@@ -0,0 +1,245 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from pandas.api import types as ptypes
+
+from .instrument import traced
+
+# Анализ относительно целевой колонки: «готов ли датасет к обучению».
+#   - баланс классов – np.bincount по кодам классов;
+#   - взаимная информация признак/таргет – по таблицам совместных частот
+#     бинированных значений: границы корзин (квантили для чисел, top-значения
+#     для категорий) фиксируются по первому чанку, дальше только bincount;
+#   - подозрения на утечку – почти детерминированная связь с таргетом
+#     (|r| по накопленным суммам или нормированная взаимная информация около 1).
+# Профиль обновляется по чанкам, как text.TextProfile, поэтому годится и для потокового чтения.
+
+TARGET_BINS = 16
+EDGE_SAMPLE = 50_000  # границы корзин – по равномерной выборке из первого чанка
+MAX_CLASSES = 50  # целочисленный таргет с не большим числом значений – классификация
+IMBALANCE_RATIO = 10.0  # самый частый класс во столько раз чаще самого редкого
+LEAKAGE_CORRELATION = 0.98
+LEAKAGE_MUTUAL_INFO = 0.95
+
+
+class TargetNotFound(ValueError):
+    """В данных нет колонки, указанной как таргет."""
+
+
+def _entropy(counts: np.ndarray) -> float:
+    total = counts.sum()
+    if total <= 0:
+        return 0.0
+    p = counts[counts > 0] / total
+    return float(-(p * np.log2(p)).sum())
+
+
+def _mutual_info(joint: np.ndarray) -> float:
+    """Взаимная информация (биты) по таблице совместных частот."""
+    total = joint.sum()
+    if total <= 0:
+        return 0.0
+    p = joint / total
+    px = p.sum(axis=1, keepdims=True)
+    py = p.sum(axis=0, keepdims=True)
+    nz = p > 0
+    return float(max(0.0, (p[nz] * np.log2(p[nz] / (px @ py)[nz])).sum()))
+
+
+class _FeatureBins:
+    """Корзины одного признака (зафиксированы по первому чанку) и совместные частоты с таргетом."""
+
+    def __init__(self, s: pd.Series) -> None:
+        self.numeric = ptypes.is_numeric_dtype(s) and not ptypes.is_bool_dtype(s)
+        if self.numeric:
+            values = s.to_numpy(dtype="float64", na_value=np.nan)
+            values = values[np.isfinite(values)]
+            values = values[:: max(1, values.size // EDGE_SAMPLE)]
+            edges = np.quantile(values, np.linspace(0, 1, TARGET_BINS + 1)) if values.size else np.array([])
+            self.edges = np.unique(edges)[1:-1]
+            self.n_bins = len(self.edges) + 1
+        else:
+            self.categories = pd.Index(s.value_counts(dropna=True).index[: TARGET_BINS - 1])
+            self.n_bins = len(self.categories) + 1  # последняя – «остальные»
+        # Плюс отдельная корзина для пропусков: пропуски тоже могут «знать» таргет
+        self.joint = np.zeros((self.n_bins + 1, 0), dtype="int64")
+        self.moments = np.zeros(6)  # n, sx, sy, sxx, syy, sxy для корреляции с числовым таргетом
+
+    def codes(self, s: pd.Series) -> np.ndarray:
+        missing = s.isna().to_numpy()
+        if self.numeric:
+            values = s.to_numpy(dtype="float64", na_value=np.nan)
+            codes = np.searchsorted(self.edges, values, side="right")
+            missing |= ~np.isfinite(values)
+        else:
+            codes = pd.Categorical(s, categories=self.categories).codes.astype("int64")
+            codes[codes < 0] = self.n_bins - 1
+        codes[missing] = self.n_bins
+        return codes
+
+    def update(self, s: pd.Series, target_codes: np.ndarray, n_classes: int, y: Optional[np.ndarray]) -> None:
+        if self.joint.shape[1] < n_classes:
+            self.joint = np.pad(self.joint, ((0, 0), (0, n_classes - self.joint.shape[1])))
+        codes = self.codes(s)
+        labeled = target_codes >= 0
+        flat = codes[labeled] * n_classes + target_codes[labeled]
+        self.joint += np.bincount(flat, minlength=self.joint.size).reshape(self.joint.shape)
+
+        if self.numeric and y is not None:
+            x = s.to_numpy(dtype="float64", na_value=np.nan)
+            ok = np.isfinite(x) & np.isfinite(y)
+            x, yy = x[ok], y[ok]
+            self.moments += [x.size, x.sum(), yy.sum(), (x * x).sum(), (yy * yy).sum(), (x * yy).sum()]
+
+    def correlation(self) -> Optional[float]:
+        n, sx, sy, sxx, syy, sxy = self.moments
+        if n < 2:
+            return None
+        var_x, var_y = n * sxx - sx * sx, n * syy - sy * sy
+        if var_x <= 0 or var_y <= 0:
+            return None
+        return float(np.clip((n * sxy - sx * sy) / np.sqrt(var_x * var_y), -1.0, 1.0))
+
+
+class TargetProfile:
+    """
+    Накапливаемая по чанкам (update) статистика признаков относительно целевой колонки.
+    Тип задачи определяется по первому чанку: классификация для нечисловых
+    и целочисленных таргетов с не более MAX_CLASSES значениями, иначе регрессия
+    (таргет бинируется по квантилям, как числовые признаки).
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.kind: Optional[str] = None
+        self.n_labeled = 0
+        self.missing = 0
+        self.labels: List[Any] = []
+        self._label_index: Dict[Any, int] = {}
+        self._target_bins: Optional[_FeatureBins] = None
+        self.class_counts = np.zeros(0, dtype="int64")
+        self._features: Dict[str, _FeatureBins] = {}
+
+    def _detect_kind(self, y: pd.Series) -> str:
+        if not ptypes.is_numeric_dtype(y) or ptypes.is_bool_dtype(y):
+            return "classification"
+        values = y.dropna().to_numpy(dtype="float64")
+        if np.all(values == np.round(values)) and len(np.unique(values)) <= MAX_CLASSES:
+            return "classification"
+        return "regression"
+
+    def _target_codes(self, y: pd.Series) -> np.ndarray:
+        if self.kind == "regression":
+            codes = self._target_bins.codes(y)
+            codes[codes == self._target_bins.n_bins] = -1
+            return codes
+        codes, uniques = pd.factorize(y, use_na_sentinel=True)
+        if not len(uniques):
+            return codes.astype("int64")
+        mapping = np.empty(len(uniques), dtype="int64")
+        for i, label in enumerate(uniques):
+            if label not in self._label_index:
+                self._label_index[label] = len(self.labels)
+                self.labels.append(label)
+            mapping[i] = self._label_index[label]
+        return np.where(codes >= 0, mapping[np.maximum(codes, 0)], -1)
+
+    def _numeric_target(self, y: pd.Series, target_codes: np.ndarray) -> Optional[np.ndarray]:
+        """Таргет для корреляции: сам для регрессии, 0/1 для бинарной классификации, иначе None."""
+        if self.kind == "regression":
+            return y.to_numpy(dtype="float64", na_value=np.nan)
+        if len(self.labels) == 2:
+            return np.where(target_codes >= 0, target_codes, np.nan).astype("float64")
+        return None
+
+    def update(self, df: pd.DataFrame) -> None:
+        y = df[self.name]
+        if self.kind is None:
+            self.kind = self._detect_kind(y)
+            if self.kind == "regression":
+                self._target_bins = _FeatureBins(y)
+        target_codes = self._target_codes(y)
+        n_classes = self._target_bins.n_bins if self.kind == "regression" else len(self.labels)
+        labeled = target_codes >= 0
+        self.n_labeled += int(labeled.sum())
+        self.missing += int((~labeled).sum())
+        counts = np.bincount(target_codes[labeled], minlength=n_classes)
+        self.class_counts = np.pad(self.class_counts, (0, n_classes - len(self.class_counts))) + counts
+
+        y_numeric = self._numeric_target(y, target_codes)
+        for column in df.columns:
+            if column == self.name:
+                continue
+            s = df[column]
+            bins = self._features.get(str(column))
+            if bins is None:
+                bins = self._features[str(column)] = _FeatureBins(s)
+            bins.update(s, target_codes, n_classes, y_numeric)
+
+    # ---------- Результаты ----------
+
+    def imbalance_ratio(self) -> Optional[float]:
+        """Во сколько раз самый частый класс чаще самого редкого (только классификация)."""
+        if self.kind != "classification" or not self.class_counts.size:
+            return None
+        present = self.class_counts[self.class_counts > 0]
+        return float(present.max() / present.min()) if present.size else None
+
+    def mutual_info(self) -> Dict[str, float]:
+        """
+        Нормированная взаимная информация признак/таргет: I(X; Y) / H(Y) в [0, 1] –
+        какую долю неопределённости таргета снимает признак. По убыванию.
+        """
+        h_target = _entropy(self.class_counts)
+        if h_target <= 0:
+            return {name: 0.0 for name in self._features}
+        scores = {name: min(1.0, _mutual_info(bins.joint) / h_target) for name, bins in self._features.items()}
+        return dict(sorted(scores.items(), key=lambda item: -item[1]))
+
+    def correlations(self) -> Dict[str, float]:
+        """Корреляция Пирсона числовых признаков с таргетом (регрессия или бинарная классификация)."""
+        result = {}
+        for name, bins in self._features.items():
+            r = bins.correlation()
+            if r is not None:
+                result[name] = r
+        return result
+
+    def leakage_columns(self) -> List[str]:
+        mutual_info = self.mutual_info()
+        correlations = self.correlations()
+        return [
+            name
+            for name in self._features
+            if abs(correlations.get(name, 0.0)) >= LEAKAGE_CORRELATION or mutual_info[name] >= LEAKAGE_MUTUAL_INFO
+        ]
+
+    def to_dict(self) -> Dict[str, Any]:
+        classes = None
+        if self.kind == "classification":
+            order = np.argsort(-self.class_counts, kind="stable")[:MAX_CLASSES]
+            classes = {str(self.labels[i]): int(self.class_counts[i]) for i in order}
+        return {
+            "name": self.name,
+            "kind": self.kind,
+            "n_labeled": self.n_labeled,
+            "missing": self.missing,
+            "classes": classes,
+            "imbalance_ratio": self.imbalance_ratio(),
+            "mutual_info": self.mutual_info(),
+            "correlation": self.correlations(),
+            "leakage_columns": self.leakage_columns(),
+        }
+
+
+@traced()
+def profile_target(df: pd.DataFrame, target: str) -> TargetProfile:
+    """TargetProfile по DataFrame целиком. Нет такой колонки – TargetNotFound."""
+    if target not in df.columns:
+        raise TargetNotFound(f"Колонка таргета '{target}' не найдена")
+    profile = TargetProfile(target)
+    profile.update(df)
+    return profile
@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import re
+import time
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from pandas.api import types as ptypes
+
+# Колонки с датами: формат угадывается по небольшой выборке, затем вся колонка
+# (каждый чанк) разбирается векторно pd.to_datetime с этим форматом. Профиль
+# хранит min/max, число строк по дням (bincount) и «подозрительные» значения,
+# сливается между чанками и шардами – годится для очень длинных логов событий.
+
+DATETIME_SAMPLE_SIZE = 200
+MIN_PARSED_SHARE = 0.95  # доля разобранных значений выборки, чтобы считать колонку датой
+
+# Порядок важен: при равной доле разобранных значений выигрывает более ранний формат
+DATETIME_FORMATS: Tuple[str, ...] = (
+    "ISO8601",
+    "%d.%m.%Y",
+    "%d.%m.%Y %H:%M",
+    "%d.%m.%Y %H:%M:%S",
+    "%d/%m/%Y",
+    "%m/%d/%Y",
+    "%d/%m/%Y %H:%M",
+    "%m/%d/%Y %H:%M",
+    "%d/%m/%Y %H:%M:%S",
+    "%m/%d/%Y %H:%M:%S",
+    "%d-%m-%Y",
+    "%Y/%m/%d",
+    "%Y/%m/%d %H:%M:%S",
+)
+# Дешёвая предпроверка: число, разделитель, число, разделитель – иначе форматы даже не пробуем
+DATE_PREFIX = re.compile(r"\s*\d{1,4}[-/.]\d{1,2}[-/.]\d{1,4}")
+
+NS_PER_DAY = 86_400 * 10**9
+NATIVE_FORMAT = "native"  # колонка уже datetime64
+# Даты-заглушки: 1970-01-01 (нулевой epoch) и 1900-01-01 (Excel и старые СУБД)
+SENTINEL_DAYS = frozenset({0, -25_567})
+
+
+def _now_ns() -> int:
+    return time.time_ns()
+
+
+def _text_sample(s: pd.Series, size: int) -> pd.Series:
+    """Равномерно разнесённые по колонке непустые значения (без случайности и копии колонки)."""
+    non_null = s.dropna()
+    if len(non_null) > size:
+        non_null = non_null.iloc[np.linspace(0, len(non_null) - 1, size).astype("int64")]
+    return non_null.astype(str)
+
+
+def infer_datetime_format(s: pd.Series, sample_size: int = DATETIME_SAMPLE_SIZE) -> Optional[str]:
+    """
+    Формат дат колонки (строка для pd.to_datetime(format=...)), NATIVE_FORMAT для
+    datetime64 или None, если колонка не похожа на даты.
+    """
+    if ptypes.is_datetime64_any_dtype(s):
+        return NATIVE_FORMAT
+    if not (ptypes.is_object_dtype(s) or ptypes.is_string_dtype(s)) or isinstance(s.dtype, pd.CategoricalDtype):
+        return None
+    sample = _text_sample(s, sample_size)
+    if sample.empty or sample.str.match(DATE_PREFIX).mean() < MIN_PARSED_SHARE:
+        return None
+
+    best_format, best_share = None, 0.0
+    for fmt in DATETIME_FORMATS:
+        share = float(pd.to_datetime(sample, format=fmt, errors="coerce", utc=True).notna().mean())
+        if share > best_share:
+            best_format, best_share = fmt, share
+        if share == 1.0:
+            break
+    return best_format if best_share >= MIN_PARSED_SHARE else None
+
+
+def to_epoch_ns(s: pd.Series, fmt: str) -> Tuple[np.ndarray, int]:
+    """Непустые значения как int64 нс от epoch (UTC) и число неразобранных значений."""
+    non_null = s.dropna()
+    if fmt == NATIVE_FORMAT:
+        parsed = pd.to_datetime(non_null, utc=True)
+    else:
+        parsed = pd.to_datetime(non_null, format=fmt, errors="coerce", utc=True)
+    parsed = parsed.dropna()
+    ns = parsed.dt.tz_convert(None).astype("datetime64[ns]").to_numpy().view("int64")
+    return ns, len(non_null) - len(ns)
+
+
+def _iso(ns: Optional[int]) -> Optional[str]:
+    return None if ns is None else pd.Timestamp(ns, unit="ns").isoformat()
+
+
+class TemporalProfile:
+    """
+    Слияемый профиль колонки дат. Строки по дням хранятся разреженно
+    ({номер дня от epoch: строк}) – их столько, сколько дней покрывают данные.
+    Даты-заглушки и даты из будущего в дневные счётчики не попадают.
+    """
+
+    def __init__(self, fmt: str) -> None:
+        self.format = fmt
+        self.count = 0
+        self.unparsed = 0
+        self.min_ns: Optional[int] = None
+        self.max_ns: Optional[int] = None
+        self.day_counts: Dict[int, int] = {}
+        self.future = 0
+        self.sentinel = 0
+
+    def update(self, s: pd.Series, now_ns: Optional[int] = None) -> None:
+        ns, unparsed = to_epoch_ns(s, self.format)
+        self.unparsed += unparsed
+        if len(ns) == 0:
+            return
+        now_ns = _now_ns() if now_ns is None else now_ns
+
+        days = ns // NS_PER_DAY
+        is_sentinel = np.isin(days, list(SENTINEL_DAYS))
+        is_future = ns > now_ns
+        regular = ~(is_sentinel | is_future)
+        self.count += len(ns)
+        self.sentinel += int(is_sentinel.sum())
+        self.future += int(is_future.sum())
+
+        ns, days = ns[regular], days[regular]
+        if len(ns) == 0:
+            return
+        chunk_min, chunk_max = int(ns.min()), int(ns.max())
+        self.min_ns = chunk_min if self.min_ns is None else min(self.min_ns, chunk_min)
+        self.max_ns = chunk_max if self.max_ns is None else max(self.max_ns, chunk_max)
+
+        first_day = int(days.min())
+        counts = np.bincount(days - first_day)
+        for offset in np.flatnonzero(counts):
+            day = first_day + int(offset)
+            self.day_counts[day] = self.day_counts.get(day, 0) + int(counts[offset])
+
+    def merge(self, other: "TemporalProfile") -> "TemporalProfile":
+        self.count += other.count
+        self.unparsed += other.unparsed
+        self.future += other.future
+        self.sentinel += other.sentinel
+        if other.min_ns is not None:
+            self.min_ns = other.min_ns if self.min_ns is None else min(self.min_ns, other.min_ns)
+            self.max_ns = other.max_ns if self.max_ns is None else max(self.max_ns, other.max_ns)
+        for day, count in other.day_counts.items():
+            self.day_counts[day] = self.day_counts.get(day, 0) + count
+        return self
+
+    def gaps(self) -> Tuple[int, int, Optional[int]]:
+        """(дней без строк между min и max, самый длинный разрыв в днях, первый день этого разрыва)."""
+        if len(self.day_counts) < 2:
+            return 0, 0, None
+        days = np.sort(np.fromiter(self.day_counts, dtype="int64", count=len(self.day_counts)))
+        holes = np.diff(days) - 1
+        longest = int(np.argmax(holes))
+        max_gap = int(holes[longest])
+        return int(holes.sum()), max_gap, int(days[longest] + 1) if max_gap > 0 else None
+
+    def rows_by_month(self) -> Dict[str, int]:
+        if not self.day_counts:
+            return {}
+        days = np.fromiter(self.day_counts, dtype="int64", count=len(self.day_counts))
+        counts = np.fromiter(self.day_counts.values(), dtype="int64", count=len(self.day_counts))
+        months = days.astype("datetime64[D]").astype("datetime64[M]")
+        labels, inverse = np.unique(months, return_inverse=True)
+        totals = np.bincount(inverse, weights=counts).astype("int64")
+        return {str(label): int(total) for label, total in zip(labels, totals)}
+
+    def to_dict(self) -> Optional[Dict[str, Any]]:
+        """Сводка для ColumnSummary.temporal; None, если большая часть значений – не даты."""
+        total = self.count + self.unparsed
+        if self.count == 0 or self.count / total < 0.5:
+            return None
+        gap_days, max_gap_days, max_gap_start = self.gaps()
+        span_days = (self.max_ns - self.min_ns) / NS_PER_DAY if self.min_ns is not None else 0.0
+        return {
+            "format": self.format,
+            "count": self.count,
+            "unparsed": self.unparsed,
+            "min": _iso(self.min_ns),
+            "max": _iso(self.max_ns),
+            "span_days": span_days,
+            "days_with_rows": len(self.day_counts),
+            "rows_per_day_mean": (self.count - self.future - self.sentinel) / len(self.day_counts)
+            if self.day_counts
+            else 0.0,
+            "gap_days": gap_days,
+            "max_gap_days": max_gap_days,
+            "max_gap_start": _iso(max_gap_start * NS_PER_DAY) if max_gap_start is not None else None,
+            "rows_by_month": self.rows_by_month(),
+            "future": self.future,
+            "sentinel": self.sentinel,
+        }
+
+
+def profile_temporal(s: pd.Series, fmt: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """Временной профиль колонки или None, если колонка не похожа на даты."""
+    fmt = fmt or infer_datetime_format(s)
+    if fmt is None:
+        return None
+    profile = TemporalProfile(fmt)
+    profile.update(s)
+    return profile.to_dict()
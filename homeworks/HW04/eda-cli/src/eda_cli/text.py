@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import re
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+from pandas.api import types as ptypes
+
+# Профиль текстовых колонок: распределение длин, пустые строки и строки из пробелов
+# (векторно по всей колонке), классы значений и аномалии кодировки (регулярками
+# по случайной выборке с экстраполяцией на колонку). Профиль слияемый – считается
+# и по DataFrame целиком, и потоково по чанкам.
+
+TEXT_SAMPLE_SIZE = 2_000
+
+# Границы корзин гистограммы длин: [0], [1], [2, 4), [4, 8), ... , [1024, inf)
+LENGTH_BUCKETS = np.array([0, 1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024])
+
+PATTERNS: Dict[str, "re.Pattern[str]"] = {
+    "numeric_like": re.compile(r"\s*[-+]?(\d+([.,]\d*)?|[.,]\d+)([eE][-+]?\d+)?\s*$"),
+    "date_like": re.compile(
+        r"\s*(\d{4}[-/.]\d{1,2}[-/.]\d{1,2}|\d{1,2}[-/.]\d{1,2}[-/.]\d{2,4})"
+        r"([ T]\d{1,2}:\d{2}(:\d{2}(\.\d+)?)?)?\s*$"
+    ),
+    "email_like": re.compile(r"[^@\s]+@[^@\s]+\.[A-Za-z]{2,}$"),
+}
+# Символ замены, управляющие символы и типичная «кракозябра» UTF-8, прочитанного как latin-1/cp1252
+ENCODING_ANOMALY = re.compile("�|[\x00-\x08\x0b\x0c\x0e-\x1f\x7f-\x9f]|Ã[\x80-\xbf]|â€|Ð[\x80-\xbf]|Ñ[\x80-\x8f]")
+
+
+def is_text_column(s: pd.Series) -> bool:
+    """Колонка со строками: object или string (в т.ч. Arrow), но не category."""
+    return (ptypes.is_object_dtype(s) or ptypes.is_string_dtype(s)) and not isinstance(
+        s.dtype, pd.CategoricalDtype
+    )
+
+
+class TextProfile:
+    """
+    Слияемая статистика по строковым значениям колонки (нестроковые значения
+    в object-колонках пропускаются). Длины и пустые строки считаются точно,
+    доли классов – по выборке из каждого чанка, пересчитанной на размер чанка.
+    """
+
+    def __init__(self, sample_size: int = TEXT_SAMPLE_SIZE, seed: int = 0) -> None:
+        self.sample_size = sample_size
+        self.count = 0
+        self.empty = 0
+        self.whitespace_only = 0
+        self.len_min: Optional[int] = None
+        self.len_max: Optional[int] = None
+        self.len_sum = 0
+        self.length_hist = np.zeros(len(LENGTH_BUCKETS), dtype="int64")
+        self.sampled = 0
+        # Оценки числа значений каждого класса (выборочные доли * размер чанка)
+        self.estimates: Dict[str, float] = {name: 0.0 for name in (*PATTERNS, "encoding_anomaly")}
+        self._rng = np.random.default_rng(seed)
+
+    def update(self, s: pd.Series) -> None:
+        if ptypes.is_object_dtype(s) and ptypes.infer_dtype(s, skipna=False) == "string":
+            # Чистые строки в object: map(len) в несколько раз быстрее s.str.len()
+            lengths = np.fromiter(map(len, s.to_numpy()), dtype="int64", count=len(s))
+        else:
+            try:
+                # .str у string[pyarrow] работает на Arrow-ядрах
+                str_lengths = s.str.len()
+            except AttributeError:  # object-колонка совсем без строк (например, bool с пропусками)
+                return
+            is_str = str_lengths.notna()
+            if not is_str.all():
+                s, str_lengths = s[is_str], str_lengths[is_str]
+            lengths = str_lengths.to_numpy(dtype="int64")
+        n = len(s)
+        if n == 0:
+            return
+
+        self.count += n
+        self.empty += int((lengths == 0).sum())
+        self.whitespace_only += int(s.str.isspace().sum())
+        chunk_min, chunk_max = int(lengths.min()), int(lengths.max())
+        self.len_min = chunk_min if self.len_min is None else min(self.len_min, chunk_min)
+        self.len_max = chunk_max if self.len_max is None else max(self.len_max, chunk_max)
+        self.len_sum += int(lengths.sum())
+        self.length_hist += np.bincount(
+            np.searchsorted(LENGTH_BUCKETS, lengths, side="right") - 1, minlength=len(LENGTH_BUCKETS)
+        )
+
+        # Регулярки дорогие – только на выборке (с возвращением: O(k), а не O(n))
+        if n > self.sample_size:
+            sample = s.iloc[self._rng.integers(0, n, size=self.sample_size)]
+        else:
+            sample = s
+        scale = n / len(sample)
+        self.sampled += len(sample)
+        for name, pattern in PATTERNS.items():
+            self.estimates[name] += float(sample.str.match(pattern).sum()) * scale
+        self.estimates["encoding_anomaly"] += float(sample.str.contains(ENCODING_ANOMALY).sum()) * scale
+
+    def merge(self, other: "TextProfile") -> "TextProfile":
+        if other.count == 0:
+            return self
+        self.count += other.count
+        self.empty += other.empty
+        self.whitespace_only += other.whitespace_only
+        self.len_min = other.len_min if self.len_min is None else min(self.len_min, other.len_min)
+        self.len_max = other.len_max if self.len_max is None else max(self.len_max, other.len_max)
+        self.len_sum += other.len_sum
+        self.length_hist += other.length_hist
+        self.sampled += other.sampled
+        for name, value in other.estimates.items():
+            self.estimates[name] = self.estimates.get(name, 0.0) + value
+        return self
+
+    def length_quantile(self, q: float) -> Optional[int]:
+        """Приближённый квантиль длины: нижняя граница корзины гистограммы."""
+        if self.count == 0:
+            return None
+        cumulative = np.cumsum(self.length_hist)
+        idx = int(np.searchsorted(cumulative, q * self.count, side="left"))
+        return int(LENGTH_BUCKETS[min(idx, len(LENGTH_BUCKETS) - 1)])
+
+    def to_dict(self) -> Optional[Dict[str, Any]]:
+        """Сводка для ColumnSummary.text; None, если строковых значений не было."""
+        if self.count == 0:
+            return None
+        return {
+            "count": self.count,
+            "empty": self.empty,
+            "whitespace_only": self.whitespace_only,
+            "len_min": self.len_min,
+            "len_max": self.len_max,
+            "len_mean": self.len_sum / self.count,
+            "len_p50": self.length_quantile(0.5),
+            "len_p95": self.length_quantile(0.95),
+            "length_histogram": {
+                f">={int(bound)}": int(count) for bound, count in zip(LENGTH_BUCKETS, self.length_hist) if count
+            },
+            "sampled": self.sampled,
+            **{f"{name}_share": min(1.0, value / self.count) for name, value in self.estimates.items()},
+        }
+
+
+def profile_text(s: pd.Series, sample_size: int = TEXT_SAMPLE_SIZE) -> Optional[Dict[str, Any]]:
+    """Текстовая сводка по колонке или None, если колонка не строковая/без строк."""
+    if not is_text_column(s):
+        return None
+    profile = TextProfile(sample_size=sample_size)
+    profile.update(s.dropna())
+    return profile.to_dict()
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import codecs
+import io
+import os
+from dataclasses import dataclass
+from typing import BinaryIO, Iterator, Optional
+
+import pandas as pd
+
+from .cancel import DeadlineExceeded, check_cancelled
+from .sniff import CsvDialect, sniff_bytes
+
+# Потоковая проверка загружаемых CSV: первый блок разбирается до запуска парсера
+# (бинарные данные, формат – sniff.sniff_bytes, число колонок), дальше байты и строки
+# считаются по ходу чтения чанками. Любое нарушение – UploadRejected сразу на
+# том чанке, где оно обнаружено, без дочитывания файла.
+
+SNIFF_BLOCK = 64 * 1024
+DEFAULT_CHUNK_ROWS = 100_000
+
+
+class UploadRejected(ValueError):
+    """Загрузка отклонена: status_code – HTTP-код ответа (400/413/415), detail – пояснение."""
+
+    def __init__(self, status_code: int, detail: str) -> None:
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+@dataclass(frozen=True)
+class UploadLimits:
+    max_bytes: int = 512 * 2**20  # после распаковки
+    max_rows: int = 10_000_000
+    max_columns: int = 5_000
+
+    @classmethod
+    def from_env(cls) -> "UploadLimits":
+        """EDA_MAX_UPLOAD_MB, EDA_MAX_ROWS, EDA_MAX_COLUMNS; не заданные – по умолчанию."""
+        default = cls()
+        return cls(
+            max_bytes=int(float(os.environ.get("EDA_MAX_UPLOAD_MB", default.max_bytes / 2**20)) * 2**20),
+            max_rows=int(os.environ.get("EDA_MAX_ROWS", default.max_rows)),
+            max_columns=int(os.environ.get("EDA_MAX_COLUMNS", default.max_columns)),
+        )
+
+
+class LimitedReader(io.RawIOBase):
+    """Читает поток, возвращая сначала уже прочитанный head; больше max_bytes всего – UploadRejected(413)."""
+
+    def __init__(self, raw: BinaryIO, max_bytes: int, head: bytes = b"") -> None:
+        super().__init__()
+        self._raw = raw
+        self._head = memoryview(head)
+        self.max_bytes = max_bytes
+        self.bytes_read = len(head)
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        if self._head:
+            n = min(len(b), len(self._head))
+            b[:n] = self._head[:n]
+            self._head = self._head[n:]
+            return n
+        data = self._raw.read(len(b))
+        self.bytes_read += len(data)
+        if self.bytes_read > self.max_bytes:
+            raise UploadRejected(413, f"CSV больше допустимого размера ({self.max_bytes // 2**20} МиБ)")
+        b[: len(data)] = data
+        return len(data)
+
+
+def inspect_block(block: bytes) -> CsvDialect:
+    """Проверка первого блока: не пустой и не бинарный файл; формат – через sniff_bytes."""
+    if not block.strip():
+        raise UploadRejected(400, "CSV-файл пустой.")
+    if b"\x00" in block and not block.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        raise UploadRejected(415, "Файл похож на бинарный, а не на CSV (нулевые байты в начале файла).")
+    return sniff_bytes(block)
+
+
+def iter_csv_chunks(
+    stream: BinaryIO,
+    limits: Optional[UploadLimits] = None,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+) -> Iterator[pd.DataFrame]:
+    """
+    Чанки CSV из потока (уже распакованных) байт с проверкой лимитов.
+    Ошибка структуры (не то число полей, битая кодировка) прерывает чтение
+    на первом же плохом чанке с UploadRejected(400).
+    """
+    limits = limits or UploadLimits.from_env()
+    # Точки отмены – перед каждым чтением: при истёкшем дедлайне или ушедшем
+    # клиенте не читается и не разбирается ни один лишний чанк
+    check_cancelled()
+    head = stream.read(SNIFF_BLOCK)
+    info = inspect_block(head)
+    if info.n_columns > limits.max_columns:
+        raise UploadRejected(413, f"Слишком много колонок: {info.n_columns} (максимум {limits.max_columns}).")
+
+    reader = io.BufferedReader(LimitedReader(stream, limits.max_bytes, head=head), buffer_size=SNIFF_BLOCK)
+    rows = 0
+    try:
+        with pd.read_csv(reader, chunksize=chunk_rows, **info.read_csv_kwargs()) as chunks:
+            while True:
+                check_cancelled()
+                chunk = next(chunks, None)
+                if chunk is None:
+                    break
+                rows += len(chunk)
+                if rows > limits.max_rows:
+                    raise UploadRejected(413, f"Слишком много строк: больше {limits.max_rows}.")
+                yield chunk
+    except (pd.errors.ParserError, UnicodeDecodeError) as exc:
+        raise UploadRejected(400, f"CSV повреждён (успешно прочитано строк: {rows}): {exc}") from exc
+
+
+def read_csv_limited(
+    stream: BinaryIO,
+    limits: Optional[UploadLimits] = None,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    partial_on_deadline: bool = False,
+) -> pd.DataFrame:
+    """
+    Весь CSV как DataFrame, но с потоковой проверкой (см. iter_csv_chunks).
+    partial_on_deadline=True – при истёкшем дедлайне (cancel.DeadlineExceeded)
+    возвращаются уже прочитанные строки с пометкой df.attrs["partial"] = True.
+    """
+    chunks = []
+    partial = False
+    try:
+        for chunk in iter_csv_chunks(stream, limits, chunk_rows):
+            chunks.append(chunk)
+    except DeadlineExceeded:
+        if not partial_on_deadline:
+            raise
+        partial = True
+    if not chunks:
+        df = pd.DataFrame()
+    else:
+        df = chunks[0] if len(chunks) == 1 else pd.concat(chunks, ignore_index=True)
+    if partial:
+        df.attrs["partial"] = True
+    return df
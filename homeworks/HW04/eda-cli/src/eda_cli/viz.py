@@ -1,13 +1,30 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Dict, Iterable, List, Union
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Mapping, Optional, Tuple, Union
+from xml.sax.saxutils import escape
 
-import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 
+from .instrument import traced
+
+if TYPE_CHECKING:
+    from matplotlib.figure import Figure
+
 PathLike = Union[str, Path]
+Histogram = Tuple[np.ndarray, np.ndarray]  # (counts, edges), как у np.histogram
+
+# Используем объектный API (Figure) вместо pyplot: без глобального состояния
+# графики можно строить из нескольких потоков (см. report.run_report).
+# matplotlib импортируется при первом построении графика, а не при импорте модуля:
+# CLI-командам без картинок он не нужен.
+
+
+def _figure(**kwargs: Any) -> Figure:
+    from matplotlib.figure import Figure
+
+    return Figure(**kwargs)
 
 
 def _ensure_dir(path: PathLike) -> Path:
@@ -16,6 +33,7 @@ def _ensure_dir(path: PathLike) -> Path:
     return p
 
 
+@traced()
 def plot_histograms_per_column(
     df: pd.DataFrame,
     out_dir: PathLike,
@@ -35,7 +53,8 @@ def plot_histograms_per_column(
         if s.empty:
             continue
 
-        fig, ax = plt.subplots()
+        fig = _figure()
+        ax = fig.subplots()
         ax.hist(s.values, bins=bins)
         ax.set_title(f"Histogram of {name}")
         ax.set_xlabel(name)
@@ -44,13 +63,111 @@ def plot_histograms_per_column(
 
         out_path = out_dir / f"hist_{i+1}_{name}.png"
         fig.savefig(out_path)
-        plt.close(fig)
 
         paths.append(out_path)
 
     return paths
 
 
+def histogram_counts(df: pd.DataFrame, bins: int = 20) -> Dict[str, Histogram]:
+    """
+    Точные гистограммы числовых колонок: {колонка: (counts, edges)}.
+    Тот же формат, что у profiling.DatasetProfile.histograms() (оценка по скетчу).
+    """
+    hists: Dict[str, Histogram] = {}
+    numeric_df = df.select_dtypes(include="number")
+    for name in numeric_df.columns:
+        values = numeric_df[name].to_numpy(dtype="float64", na_value=np.nan)
+        values = values[np.isfinite(values)]
+        if values.size:
+            hists[str(name)] = np.histogram(values, bins=bins)
+    return hists
+
+
+# Small multiples: сотни гистограмм плиткой в нескольких SVG. Картинка собирается
+# строками из готовых counts, без matplotlib и без фигуры на колонку: на колонку –
+# одна группа <g> с одним <path> на все столбики, поэтому время растёт с числом
+# колонок только на формирование текста, а не на отрисовку и сохранение PNG.
+GRID_COLUMNS = 10
+GRID_PER_IMAGE = 100
+CELL_WIDTH = 150
+CELL_HEIGHT = 100
+_CELL_PAD = 6
+_TITLE_HEIGHT = 14
+_LABEL_HEIGHT = 12
+_MAX_TITLE = 24
+
+
+def _short_number(value: float) -> str:
+    return f"{value:.3g}"
+
+
+def _svg_cell(name: str, counts: np.ndarray, edges: np.ndarray, x: int, y: int) -> str:
+    plot_w = CELL_WIDTH - 2 * _CELL_PAD
+    plot_h = CELL_HEIGHT - 2 * _CELL_PAD - _TITLE_HEIGHT - _LABEL_HEIGHT
+    top = _CELL_PAD + _TITLE_HEIGHT
+    base = top + plot_h
+    peak = counts.max() if counts.size else 0
+    bar_w = plot_w / max(len(counts), 1)
+
+    bars = []
+    if peak > 0:
+        heights = counts / peak * plot_h
+        for i, h in enumerate(heights):
+            if h > 0:
+                bars.append(f"M{_CELL_PAD + i * bar_w:.1f} {base:.1f}h{bar_w:.1f}v{-h:.1f}h{-bar_w:.1f}z")
+
+    title = name if len(name) <= _MAX_TITLE else name[: _MAX_TITLE - 1] + "…"
+    return (
+        f'<g transform="translate({x},{y})"><title>{escape(name)}: n={int(counts.sum())}</title>'
+        f'<text x="{_CELL_PAD}" y="{_CELL_PAD + 10}" class="t">{escape(title)}</text>'
+        f'<path d="{"".join(bars)}" class="b"/>'
+        f'<line x1="{_CELL_PAD}" y1="{base:.1f}" x2="{_CELL_PAD + plot_w}" y2="{base:.1f}" class="a"/>'
+        f'<text x="{_CELL_PAD}" y="{base + 10:.1f}" class="l">{_short_number(edges[0])}</text>'
+        f'<text x="{_CELL_PAD + plot_w}" y="{base + 10:.1f}" class="l" text-anchor="end">'
+        f"{_short_number(edges[-1])}</text></g>"
+    )
+
+
+def _svg_page(cells: List[str], n_items: int) -> str:
+    cols = min(GRID_COLUMNS, n_items)
+    rows = -(-n_items // GRID_COLUMNS)
+    width, height = cols * CELL_WIDTH, rows * CELL_HEIGHT
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+        f'viewBox="0 0 {width} {height}" font-family="sans-serif">'
+        "<style>.t{font-size:10px}.l{font-size:8px;fill:#555}.b{fill:#4c72b0}.a{stroke:#999;stroke-width:.5}</style>"
+        f'<rect width="{width}" height="{height}" fill="#fff"/>' + "".join(cells) + "</svg>\n"
+    )
+
+
+@traced()
+def plot_histogram_grid(
+    hists: Mapping[str, Histogram],
+    out_dir: PathLike,
+    per_image: int = GRID_PER_IMAGE,
+) -> List[Path]:
+    """
+    Гистограммы всех колонок из готовых (counts, edges) плиткой по GRID_COLUMNS в ряд,
+    не больше per_image на файл: histograms_1.svg, histograms_2.svg, ...
+    Возвращает список путей к SVG (пустой, если гистограмм нет).
+    """
+    out_dir = _ensure_dir(out_dir)
+    items = list(hists.items())
+    paths: List[Path] = []
+    for page, start in enumerate(range(0, len(items), per_image), start=1):
+        chunk = items[start : start + per_image]
+        cells = []
+        for i, (name, (counts, edges)) in enumerate(chunk):
+            x, y = (i % GRID_COLUMNS) * CELL_WIDTH, (i // GRID_COLUMNS) * CELL_HEIGHT
+            cells.append(_svg_cell(name, np.asarray(counts), np.asarray(edges), x, y))
+        out_path = out_dir / f"histograms_{page}.svg"
+        out_path.write_text(_svg_page(cells, len(chunk)), encoding="utf-8")
+        paths.append(out_path)
+    return paths
+
+
+@traced()
 def plot_missing_matrix(df: pd.DataFrame, out_path: PathLike) -> Path:
     """
     Простая визуализация пропусков: где True=пропуск, False=значение.
@@ -60,12 +177,14 @@ def plot_missing_matrix(df: pd.DataFrame, out_path: PathLike) -> Path:
 
     if df.empty:
         # Рисуем пустой график
-        fig, ax = plt.subplots()
+        fig = _figure()
+        ax = fig.subplots()
         ax.text(0.5, 0.5, "Empty dataset", ha="center", va="center")
         ax.axis("off")
     else:
         mask = df.isna().values
-        fig, ax = plt.subplots(figsize=(min(12, df.shape[1] * 0.4), 4))
+        fig = _figure(figsize=(min(12, df.shape[1] * 0.4), 4))
+        ax = fig.subplots()
         ax.imshow(mask, aspect="auto", interpolation="none")
         ax.set_xlabel("Columns")
         ax.set_ylabel("Rows")
@@ -76,39 +195,138 @@ def plot_missing_matrix(df: pd.DataFrame, out_path: PathLike) -> Path:
 
     fig.tight_layout()
     fig.savefig(out_path)
-    plt.close(fig)
     return out_path
 
 
-def plot_correlation_heatmap(df: pd.DataFrame, out_path: PathLike) -> Path:
+# Широкие данные: полная p×p карта при p в тысячи нечитаема и рисуется долго.
+# Порядок колонок – core.cluster_order (считается один раз по готовой corr), дальше
+# либо подблок самых коррелирующих колонок, либо обзор с усреднением по блокам
+# плюс детальные картинки диагональных плиток (там и лежат кластеры).
+CORR_HEATMAP_MAX_COLUMNS = 50
+CORR_OVERVIEW_CELLS = 200
+
+
+def _draw_correlation(values: np.ndarray, labels: Optional[List[str]], title: str) -> Figure:
+    n = values.shape[0]
+    fig = _figure(figsize=(min(10, n), min(8, n)))
+    ax = fig.subplots()
+    im = ax.imshow(values, vmin=-1, vmax=1, cmap="coolwarm", aspect="auto", interpolation="nearest")
+    if labels is not None:
+        ax.set_xticks(range(n))
+        ax.set_xticklabels(labels, rotation=90, fontsize=8)
+        ax.set_yticks(range(n))
+        ax.set_yticklabels(labels, fontsize=8)
+    ax.set_title(title)
+    fig.colorbar(im, ax=ax, label="Pearson r")
+    return fig
+
+
+@traced()
+def plot_correlation_heatmap(
+    df: pd.DataFrame,
+    out_path: PathLike,
+    corr: Optional[pd.DataFrame] = None,
+    max_columns: int = CORR_HEATMAP_MAX_COLUMNS,
+    order: Optional[List[str]] = None,
+) -> Path:
     """
     Тепловая карта корреляции числовых признаков.
+    Если corr уже посчитана (correlation_matrix), она переиспользуется.
+    Колонок больше max_columns – рисуется подблок из max_columns самых
+    коррелирующих колонок; order (core.cluster_order) задаёт их порядок.
     """
+    from .core import strongest_correlated
+
     out_path = Path(out_path)
     out_path.parent.mkdir(parents=True, exist_ok=True)
 
-    numeric_df = df.select_dtypes(include="number")
-    if numeric_df.shape[1] < 2:
-        fig, ax = plt.subplots()
+    if corr is None:
+        corr = df.select_dtypes(include="number").corr(numeric_only=True)
+    if corr.shape[1] < 2:
+        fig = _figure()
+        ax = fig.subplots()
         ax.text(0.5, 0.5, "Not enough numeric columns for correlation", ha="center", va="center")
         ax.axis("off")
     else:
-        corr = numeric_df.corr(numeric_only=True)
-        fig, ax = plt.subplots(figsize=(min(10, corr.shape[1]), min(8, corr.shape[0])))
-        im = ax.imshow(corr.values, vmin=-1, vmax=1, cmap="coolwarm", aspect="auto")
-        ax.set_xticks(range(corr.shape[1]))
-        ax.set_xticklabels(corr.columns, rotation=90, fontsize=8)
-        ax.set_yticks(range(corr.shape[0]))
-        ax.set_yticklabels(corr.index, fontsize=8)
-        ax.set_title("Correlation heatmap")
-        fig.colorbar(im, ax=ax, label="Pearson r")
+        title = "Correlation heatmap"
+        keep = strongest_correlated(corr, max_columns)
+        if len(keep) < corr.shape[1]:
+            title += f" (top {len(keep)} of {corr.shape[1]} columns)"
+        if order is not None:
+            selected = set(keep)
+            keep = [name for name in order if name in selected]
+        fig = _draw_correlation(corr.loc[keep, keep].to_numpy(dtype="float64"), [str(c) for c in keep], title)
 
     fig.tight_layout()
     fig.savefig(out_path)
-    plt.close(fig)
     return out_path
 
 
+def _block_mean(values: np.ndarray, factor: int) -> np.ndarray:
+    """Среднее по блокам factor×factor без NaN (блок из одних NaN – NaN)."""
+    n = values.shape[0]
+    m = -(-n // factor)
+    padded = np.full((m * factor, m * factor), np.nan)
+    padded[:n, :n] = values
+    blocks = padded.reshape(m, factor, m, factor)
+    valid = ~np.isnan(blocks)
+    sums = np.where(valid, blocks, 0.0).sum(axis=(1, 3))
+    counts = valid.sum(axis=(1, 3))
+    return np.divide(sums, counts, out=np.full(sums.shape, np.nan), where=counts > 0)
+
+
+@traced()
+def plot_correlation_tiles(
+    corr: pd.DataFrame,
+    out_dir: PathLike,
+    order: Optional[List[str]] = None,
+    tile_size: int = CORR_HEATMAP_MAX_COLUMNS,
+    overview_cells: int = CORR_OVERVIEW_CELLS,
+) -> List[Path]:
+    """
+    Корреляция широких данных по плиткам: correlation_overview.png – вся матрица
+    в порядке order, усреднённая до не больше overview_cells клеток по стороне,
+    с сеткой плиток tile_size×tile_size; correlation_tile_K.png – диагональные
+    плитки с подписями колонок. Возвращает пути [обзор, плитка 1, ...].
+    """
+    out_dir = _ensure_dir(out_dir)
+    columns = list(order) if order is not None else list(corr.columns)
+    n = len(columns)
+    if n < 2:
+        return [plot_correlation_heatmap(pd.DataFrame(), out_dir / "correlation_overview.png", corr=corr)]
+    values = corr.loc[columns, columns].to_numpy(dtype="float64")
+
+    factor = max(1, -(-n // overview_cells))
+    overview = _block_mean(values, factor) if factor > 1 else values
+    fig = _draw_correlation(overview, None, f"Correlation overview ({n} columns, clustered)")
+    ax = fig.axes[0]
+    n_tiles = -(-n // tile_size)
+    ticks = [k * tile_size / factor - 0.5 for k in range(n_tiles)]
+    for pos in ticks[1:]:
+        ax.axhline(pos, color="black", linewidth=0.4)
+        ax.axvline(pos, color="black", linewidth=0.4)
+    ax.set_xticks(ticks)
+    ax.set_xticklabels([str(k + 1) for k in range(n_tiles)], fontsize=6)
+    ax.set_yticks(ticks)
+    ax.set_yticklabels([str(k + 1) for k in range(n_tiles)], fontsize=6)
+    ax.set_xlabel("Tile")
+    fig.tight_layout()
+    overview_path = out_dir / "correlation_overview.png"
+    fig.savefig(overview_path)
+    paths = [overview_path]
+
+    for k in range(n_tiles):
+        part = slice(k * tile_size, (k + 1) * tile_size)
+        labels = [str(c) for c in columns[part]]
+        fig = _draw_correlation(values[part, part], labels, f"Correlation tile {k + 1} of {n_tiles}")
+        fig.tight_layout()
+        out_path = out_dir / f"correlation_tile_{k + 1}.png"
+        fig.savefig(out_path)
+        paths.append(out_path)
+    return paths
+
+
+@traced()
 def save_top_categories_tables(
     top_cats: Dict[str, pd.DataFrame],
     out_dir: PathLike,
@@ -0,0 +1,305 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import time
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from .artifact import ARTIFACT_SUFFIX, load_profile
+from .compression import compression_from_name, open_source
+from .profiling import DEFAULT_CHUNKSIZE, DatasetProfile, profile_csv
+from .report import ReportConfig, ReportContext, run_report
+from .shards import expand_sources
+from .sniff import CsvDialect, sniff_path
+
+# Наблюдение за каталогом приёма: один «тёплый» процесс (импорты и пул воркеров
+# поднимаются один раз) опрашивает каталог по stat() и профилирует новые и
+# изменённые CSV. Файл берётся в работу, только когда его размер и mtime не
+# менялись settle секунд: недописанный файл ждёт следующих опросов.
+# Несжатый файл, который только дописали в конец (начало то же), профилируется
+# инкрементально: читается лишь новый хвост и сливается с профилем из прошлого
+# артефакта dataset.edaprof. Состояние хранится в out_root/watch_state.json,
+# поэтому после перезапуска уже обработанные файлы не пересчитываются.
+
+POLL_INTERVAL = 2.0
+SETTLE_SECONDS = 2.0
+HEAD_BYTES = 64 * 1024  # по хэшу начала файла проверяем, что его только дописали
+STATE_FILE = "watch_state.json"
+# Секции, которые строятся из профиля без сырых данных
+WATCH_SECTIONS = ("summary", "missing", "top_categories", "histogram_grid", "json", "artifact")
+_TEMP_PREFIXES = (".", "~")  # временные файлы загрузчиков (.name.csv.part, ~name.csv)
+
+
+@dataclass
+class FileState:
+    """Что известно об обработанном файле: его stat на момент обработки и докуда он учтён."""
+
+    size: int
+    mtime_ns: int
+    head_sha: str = ""
+    head_len: int = 0
+    offset: Optional[int] = None  # байт, до которого учтён профиль; None – дописывать нельзя
+    columns: List[Any] = field(default_factory=list)
+    dialect: Optional[Dict[str, Any]] = None
+    n_rows: int = 0
+    error: Optional[str] = None
+
+
+@dataclass
+class WatchResult:
+    path: Path
+    out_dir: Path
+    state: FileState
+    mode: str  # full | append | error
+    new_rows: int = 0
+    elapsed: float = 0.0
+
+
+def _head_sha(path: Path, length: int) -> str:
+    with path.open("rb") as f:
+        return hashlib.sha1(f.read(length)).hexdigest()
+
+
+def _appendable_offset(path: Path, size: int, dialect: CsvDialect) -> Optional[int]:
+    """Конец учтённых данных, если файл можно будет дочитать с этого места (несжатый, кончается переводом строки)."""
+    if size == 0 or compression_from_name(path.name) is not None or dialect.encoding.startswith(("utf-16", "utf-32")):
+        return None
+    with path.open("rb") as f:
+        f.seek(size - 1)
+        last = f.read(1)
+    return size if last in (b"\n", b"\r") else None
+
+
+def _can_append(path: Path, size: int, prev: Optional[FileState], artifact: Path) -> bool:
+    return (
+        prev is not None
+        and prev.error is None
+        and prev.offset is not None
+        and size > prev.offset
+        and artifact.exists()
+        and _head_sha(path, prev.head_len) == prev.head_sha
+    )
+
+
+def _profile_tail(path: Path, prev: FileState, chunksize: int) -> DatasetProfile:
+    """Профиль строк, дописанных после prev.offset (заголовка там нет – имена колонок из прошлого прогона)."""
+    kwargs = dict(CsvDialect(**prev.dialect).read_csv_kwargs(), header=None, names=prev.columns)
+    tail = DatasetProfile(source=str(path))
+    with path.open("rb") as f:
+        f.seek(prev.offset)
+        with pd.read_csv(f, chunksize=chunksize, **kwargs) as reader:
+            for chunk in reader:
+                tail.update(chunk)
+    return tail
+
+
+def _write_outputs(path: Path, out_dir: Path, profile: DatasetProfile, dialect: CsvDialect) -> None:
+    """Таблицы, SVG-гистограммы, JSON-сводка и артефакт – из профиля, без повторного чтения файла."""
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    def load_frame() -> pd.DataFrame:
+        with open_source(path) as stream:
+            return pd.read_csv(stream, **dialect.read_csv_kwargs())
+
+    config = ReportConfig(source_name=path.name, out_root=out_dir)
+    ctx = ReportContext(config, load_frame=load_frame)
+    ctx.results.update(
+        dataset_profile=profile,
+        dataset_summary=profile.to_summary(),
+        missing_df=profile.missing_table(),
+        top_cats=profile.top_categories(top_k=config.top_k_categories),
+        hist_counts=profile.histograms(),
+        corr_df=pd.DataFrame(),  # корреляции без сырых данных нет
+        target_profile=None,
+    )
+    run_report(ctx, WATCH_SECTIONS)
+
+
+def process_file(
+    path: Path,
+    out_dir: Path,
+    prev: Optional[FileState] = None,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+) -> WatchResult:
+    """
+    Профилирует файл (дописанный – только хвост) и пишет результаты в out_dir.
+    Выполняется в воркере пула, поэтому функция модульного уровня.
+    """
+    start = time.perf_counter()
+    st = path.stat()
+    artifact = out_dir / f"dataset{ARTIFACT_SUFFIX}"
+
+    if _can_append(path, st.st_size, prev, artifact):
+        dialect = CsvDialect(**prev.dialect)
+        tail = _profile_tail(path, prev, chunksize)
+        # Слияние в новый профиль: массивы прошлого артефакта – read-only mmap
+        profile = DatasetProfile(source=str(path))
+        profile.merge(load_profile(artifact).profile).merge(tail)
+        mode, new_rows = "append", tail.n_rows
+    else:
+        dialect = sniff_path(path)
+        profile = profile_csv(path, dialect=dialect, chunksize=chunksize)
+        mode, new_rows = "full", profile.n_rows
+
+    _write_outputs(path, out_dir, profile, dialect)
+    offset = _appendable_offset(path, st.st_size, dialect)
+    after = path.stat()
+    if (after.st_size, after.st_mtime_ns) != (st.st_size, st.st_mtime_ns):
+        offset = None  # файл менялся во время чтения: неизвестно, докуда он учтён
+    head_len = min(HEAD_BYTES, offset or 0)
+    state = FileState(
+        size=st.st_size,
+        mtime_ns=st.st_mtime_ns,
+        head_sha=_head_sha(path, head_len) if offset is not None else "",
+        head_len=head_len,
+        offset=offset,
+        columns=list(profile.columns),
+        dialect=dialect.to_dict(),
+        n_rows=profile.n_rows,
+    )
+    return WatchResult(path, out_dir, state, mode, new_rows, time.perf_counter() - start)
+
+
+class Watcher:
+    """
+    Опрос каталога root и обработка готовых файлов в пуле воркеров.
+    Результаты по файлу name.csv – в out_root/name.csv/.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        out_root: Path,
+        workers: int = 1,
+        settle: float = SETTLE_SECONDS,
+        chunksize: int = DEFAULT_CHUNKSIZE,
+    ) -> None:
+        self.root = Path(root)
+        self.out_root = Path(out_root)
+        self.workers = workers
+        self.settle = settle
+        self.chunksize = chunksize
+        self.state: Dict[str, FileState] = self._load_state()
+        # Последний увиденный (size, mtime_ns) необработанного файла и когда он таким стал
+        self._seen: Dict[Path, Tuple[int, int, float]] = {}
+        self._in_flight: Dict[Future, Path] = {}
+
+    # ---------- Состояние ----------
+
+    @property
+    def state_path(self) -> Path:
+        return self.out_root / STATE_FILE
+
+    def _load_state(self) -> Dict[str, FileState]:
+        try:
+            raw = json.loads(self.state_path.read_text(encoding="utf-8"))
+            return {name: FileState(**item) for name, item in raw.items()}
+        except (OSError, ValueError, TypeError):
+            return {}
+
+    def save_state(self) -> None:
+        self.out_root.mkdir(parents=True, exist_ok=True)
+        tmp = self.state_path.with_name(STATE_FILE + ".tmp")
+        tmp.write_text(json.dumps({name: asdict(s) for name, s in self.state.items()}, ensure_ascii=False), "utf-8")
+        tmp.replace(self.state_path)
+
+    # ---------- Опрос ----------
+
+    def candidates(self) -> List[Path]:
+        return [p for p in expand_sources(str(self.root)) if not p.name.startswith(_TEMP_PREFIXES)]
+
+    def poll(self, now: Optional[float] = None) -> List[Path]:
+        """Файлы, готовые к обработке: новые или изменённые и не менявшиеся settle секунд."""
+        now = time.monotonic() if now is None else now
+        busy = set(self._in_flight.values())
+        candidates = self.candidates()
+        present = set(candidates)
+        self._seen = {path: seen for path, seen in self._seen.items() if path in present}
+        ready = []
+        for path in candidates:
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                continue
+            signature = (st.st_size, st.st_mtime_ns)
+            done = self.state.get(path.name)
+            if st.st_size == 0 or path in busy or (done is not None and (done.size, done.mtime_ns) == signature):
+                continue
+            seen = self._seen.get(path)
+            if seen is None or seen[:2] != signature:
+                self._seen[path] = (*signature, now)  # новый файл или ещё пишется – ждём
+            elif now - seen[2] >= self.settle:
+                del self._seen[path]
+                ready.append(path)
+        return ready
+
+    @property
+    def pending(self) -> int:
+        """Файлы, которые ждут стабилизации или обрабатываются."""
+        return len(self._seen) + len(self._in_flight)
+
+    # ---------- Обработка ----------
+
+    def submit(self, executor: Executor, paths: List[Path]) -> None:
+        for path in paths:
+            future = executor.submit(
+                process_file, path, self.out_root / path.name, self.state.get(path.name), self.chunksize
+            )
+            self._in_flight[future] = path
+
+    def collect(self, timeout: float) -> List[WatchResult]:
+        """Завершившиеся задачи (ждёт не дольше timeout); состояние сохраняется после каждой партии."""
+        if not self._in_flight:
+            return []
+        done, _ = wait(list(self._in_flight), timeout=timeout, return_when=FIRST_COMPLETED)
+        results = []
+        for future in done:
+            path = self._in_flight.pop(future)
+            try:
+                result = future.result()
+            except Exception as exc:  # битый файл не должен останавливать наблюдение
+                # Запоминаем stat, чтобы не повторять, пока файл не изменится
+                try:
+                    st = path.stat()
+                    state = FileState(size=st.st_size, mtime_ns=st.st_mtime_ns, error=str(exc))
+                except OSError:
+                    state = FileState(size=-1, mtime_ns=-1, error=str(exc))
+                result = WatchResult(path, self.out_root / path.name, state, "error")
+            self.state[path.name] = result.state
+            results.append(result)
+        if results:
+            self.save_state()
+        return results
+
+    def make_executor(self) -> Executor:
+        # Один воркер – поток в этом же процессе: опрос не блокируется, а процесс остаётся тёплым
+        if self.workers <= 1:
+            return ThreadPoolExecutor(max_workers=1)
+        return ProcessPoolExecutor(max_workers=self.workers)
+
+    def run(
+        self,
+        interval: float = POLL_INTERVAL,
+        on_result: Optional[Callable[[WatchResult], None]] = None,
+        once: bool = False,
+    ) -> None:
+        """
+        Цикл опроса. once=True – обработать всё, что уже лежит в каталоге
+        (дождавшись стабилизации файлов), и выйти.
+        """
+        with self.make_executor() as executor:
+            while True:
+                self.submit(executor, self.poll())
+                if self._in_flight:
+                    for result in self.collect(timeout=interval):
+                        if on_result is not None:
+                            on_result(result)
+                elif once and not self._seen:
+                    return
+                else:
+                    time.sleep(interval)
@@ -0,0 +1,15 @@
+from __future__ import annotations
+
+import sys
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def _isolated_result_cache(monkeypatch, tmp_path):
+    """Кэши (результаты API, профили, форматы CSV) – свои на каждый тест, чтобы повторные прогоны не давали HIT."""
+    monkeypatch.setenv("EDA_RESULT_CACHE_DIR", str(tmp_path / "results"))
+    monkeypatch.setenv("EDA_CLI_CACHE_DIR", str(tmp_path / "cache"))
+    api = sys.modules.get("eda_cli.api")
+    if api is not None:
+        monkeypatch.setattr(api, "RESULTS", api._result_cache())
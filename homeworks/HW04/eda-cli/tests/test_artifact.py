@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+from typer.testing import CliRunner
+
+from eda_cli.artifact import ProfileArtifact, is_artifact, load_profile, save_profile
+from eda_cli.cli import app
+from eda_cli.drift import compare_profiles
+from eda_cli.profiling import profile_frame
+from eda_cli.report import ReportConfig, ReportContext, run_report
+
+
+def _frame(seed: int = 0, n: int = 500) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame(
+        {
+            "x": rng.normal(seed, 1, n),
+            "y": rng.integers(0, 10, n).astype(float),
+            "city": rng.choice(["A", "B", "C"], n),
+            "day": pd.date_range("2024-01-01", periods=n, freq="6h").strftime("%Y-%m-%d"),
+        }
+    )
+
+
+def test_round_trip_preserves_tables_and_sketches(tmp_path):
+    df = _frame()
+    ctx = ReportContext(ReportConfig(source_name="a.csv", out_root=tmp_path), load_frame=lambda: df)
+    run_report(ctx, ["artifact"])
+    path = tmp_path / "dataset.edaprof"
+    assert is_artifact(path)
+
+    loaded = load_profile(path)
+    assert loaded.summary == ctx["dataset_summary"]
+    pd.testing.assert_frame_equal(loaded.missing, ctx["missing_df"], check_names=False)
+    pd.testing.assert_frame_equal(loaded.correlation, ctx["corr_df"])
+    assert loaded.top_categories.keys() == ctx["top_cats"].keys()
+    assert loaded.profile.to_summary() == ctx["dataset_profile"].to_summary()
+    assert loaded.meta["source"] == "a.csv"
+
+    # Большие массивы – представления mmap, без копии
+    sample = loaded.profile.columns["x"].sample.values
+    assert isinstance(sample.base, np.memmap) or isinstance(sample.base.base, np.memmap)
+    assert not sample.flags.writeable
+
+
+def test_loaded_profiles_merge_and_diff_without_source(tmp_path):
+    first, second = _frame(0), _frame(3)
+    for name, df in (("a", first), ("b", second)):
+        save_profile(tmp_path / f"{name}.edaprof", ProfileArtifact.from_profile(profile_frame(df)))
+    a, b = load_profile(tmp_path / "a.edaprof"), load_profile(tmp_path / "b.edaprof")
+
+    merged = a.merge(b)
+    expected = profile_frame(first).merge(profile_frame(second)).to_summary()
+    assert merged.summary == expected
+    assert a.profile.n_rows == len(first)  # исходный профиль не изменился
+
+    drift = a.diff(b)
+    assert drift.to_dict() == compare_profiles(profile_frame(first), profile_frame(second)).to_dict()
+    assert "x" in drift.drifted_columns
+
+
+def test_rejects_foreign_files(tmp_path):
+    path = tmp_path / "not.edaprof"
+    path.write_bytes(b"x" * 64)
+    with pytest.raises(ValueError):
+        load_profile(path)
+
+
+def test_cli_diff_accepts_artifacts(tmp_path):
+    for name, seed in (("old", 0), ("new", 3)):
+        _frame(seed).to_csv(tmp_path / f"{name}.csv", index=False)
+        result = CliRunner().invoke(
+            app,
+            ["report", str(tmp_path / f"{name}.csv"), "--out-dir", str(tmp_path / name), "--sections", "summary", "--artifact"],
+        )
+        assert result.exit_code == 0, result.output
+
+    result = CliRunner().invoke(
+        app, ["diff", str(tmp_path / "old" / "dataset.edaprof"), str(tmp_path / "new" / "dataset.edaprof")]
+    )
+    assert result.exit_code == 0, result.output
+    assert "Строк: 500 -> 500" in result.output
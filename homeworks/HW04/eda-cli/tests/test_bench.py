@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import pandas as pd
+import pytest
+
+from eda_cli.bench import compare_results, parse_scales, run_benchmarks
+from eda_cli.synth import SyntheticSpec, generate_dataset, parse_dtype_mix
+
+
+def test_generate_dataset_is_seeded_and_follows_spec():
+    spec = SyntheticSpec(
+        rows=2000,
+        cols=10,
+        dtype_mix={"float": 0.5, "category": 0.5},
+        missing_rate=0.1,
+        cardinality=7,
+        zero_share=0.3,
+        seed=42,
+    )
+    df = generate_dataset(spec)
+    pd.testing.assert_frame_equal(df, generate_dataset(spec))
+
+    assert df.shape == (2000, 10)
+    floats = df.filter(like="float_")
+    categories = df.filter(like="category_")
+    assert floats.shape[1] == categories.shape[1] == 5
+    assert df.isna().mean().between(0.05, 0.15).all()
+    assert ((floats == 0).sum() / floats.notna().sum()).between(0.2, 0.4).all()
+    assert categories.nunique().max() <= 7
+
+
+def test_parse_helpers_reject_garbage():
+    assert parse_scales("100x5, 2000X10") == [(100, 5), (2000, 10)]
+    assert parse_dtype_mix("int=1,text=2") == {"int": 1.0, "text": 2.0}
+    with pytest.raises(ValueError):
+        parse_scales("100")
+    with pytest.raises(ValueError):
+        parse_dtype_mix("decimal=1")
+
+
+def test_run_benchmarks_and_compare():
+    results = run_benchmarks([(200, 6)], repeat=1, names=["summarize_dataset", "report"])
+    assert {r["name"] for r in results["results"]} == {"summarize_dataset", "report"}
+    assert all(r["peak_mib"] > 0 for r in results["results"])
+
+    slower = {"meta": {}, "results": [dict(r, min_seconds=r["min_seconds"] * 2) for r in results["results"]]}
+    comparison = compare_results(results, slower, threshold=0.2)
+    assert comparison["regression"].all()
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import asyncio
+import io
+import time
+
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+from eda_cli import api
+from eda_cli.api import _run_cancellable, app
+from eda_cli.cancel import CancelToken, DeadlineExceeded, OperationCancelled, check_cancelled, use_cancel_token
+from eda_cli.profiling import profile_csv
+from eda_cli.validation import read_csv_limited
+
+
+def _csv(n: int) -> bytes:
+    return b"id,value\n" + b"".join(f"{i},{i % 97}\n".encode() for i in range(n))
+
+
+class _ExpiresAfterChecks(CancelToken):
+    """Токен, дедлайн которого «истекает» после заданного числа проверок – без гонок по времени."""
+
+    def __init__(self, checks: int) -> None:
+        super().__init__()
+        self._left = checks
+
+    @property
+    def expired(self) -> bool:
+        self._left -= 1
+        return self._left < 0
+
+
+def test_token_checks():
+    check_cancelled()  # без активного токена – ничего
+    token = CancelToken(timeout=0.0)
+    with use_cancel_token(token), pytest.raises(DeadlineExceeded):
+        check_cancelled()
+    with use_cancel_token(token):
+        check_cancelled(deadline=False)
+        token.cancel("стоп")
+        with pytest.raises(OperationCancelled, match="стоп"):
+            check_cancelled(deadline=False)
+
+
+def test_deadline_returns_partial_frame_and_cancel_stops_profiling():
+    data = _csv(5000)
+    # Две проверки проходят (перед заголовком и перед первым чанком), третья – дедлайн
+    with use_cancel_token(_ExpiresAfterChecks(2)):
+        df = read_csv_limited(io.BytesIO(data), chunk_rows=1000, partial_on_deadline=True)
+    with use_cancel_token(_ExpiresAfterChecks(2)), pytest.raises(DeadlineExceeded):
+        read_csv_limited(io.BytesIO(data), chunk_rows=1000)
+    assert len(df) == 1000 and df.attrs["partial"] is True
+    assert "partial" not in read_csv_limited(io.BytesIO(data), chunk_rows=1000).attrs
+
+    token = CancelToken()
+    token.cancel()
+    with use_cancel_token(token), pytest.raises(OperationCancelled):
+        profile_csv(io.BytesIO(data), chunksize=1000)
+
+
+def test_expired_deadline_reads_nothing():
+    stream = io.BytesIO(_csv(5000))
+    with use_cancel_token(CancelToken(timeout=0.0)):
+        df = read_csv_limited(stream, chunk_rows=1000, partial_on_deadline=True)
+    assert df.empty and df.attrs["partial"] is True
+    assert stream.tell() == 0
+
+
+class _DisconnectedRequest:
+    async def is_disconnected(self) -> bool:
+        return True
+
+
+def test_disconnect_cancels_worker():
+    token = CancelToken()
+    steps = []
+
+    def work():
+        # «Бесконечная» работа с точками отмены – остановится только по отмене
+        while True:
+            steps.append(1)
+            check_cancelled()
+            time.sleep(0.01)
+
+    with pytest.raises(OperationCancelled):
+        asyncio.run(_run_cancellable(_DisconnectedRequest(), work, token))
+    assert token.cancelled and steps
+
+
+def test_quality_from_csv_deadline_gives_partial_result(monkeypatch):
+    data = _csv(250_000)
+    monkeypatch.setattr(api, "_deadline", lambda timeout_ms: _ExpiresAfterChecks(2) if timeout_ms else CancelToken())
+    with TestClient(app) as client:
+        partial = client.post("/quality-from-csv?timeout_ms=1", files={"file": ("a.csv", data, "text/csv")})
+        full = client.post("/quality-from-csv", files={"file": ("a.csv", data, "text/csv")})
+
+    assert partial.status_code == 200
+    body = partial.json()
+    assert body["partial"] is True
+    assert body["dataset_shape"]["n_rows"] == 100_000  # один чанк по умолчанию
+    assert body["message"].startswith("Частичный результат")
+    assert "ETag" not in partial.headers
+    # Частичный результат не кэшируется
+    assert full.headers["X-Cache"] == "MISS"
+    assert full.json()["partial"] is False and full.json()["dataset_shape"]["n_rows"] == 250_000
+
+
+def test_quality_from_csv_expired_deadline_gives_504_without_parsing(monkeypatch):
+    parsed = []
+    read_csv = pd.read_csv
+    monkeypatch.setattr(api, "_deadline", lambda timeout_ms: CancelToken(timeout=0.0))
+    with TestClient(app) as client:
+        # после прогрева воркера: считаем только разбор самой загрузки
+        monkeypatch.setattr(pd, "read_csv", lambda *a, **kw: parsed.append(1) or read_csv(*a, **kw))
+        response = client.post("/quality-from-csv?timeout_ms=1", files={"file": ("b.csv", _csv(1000), "text/csv")})
+    assert response.status_code == 504
+    assert not parsed
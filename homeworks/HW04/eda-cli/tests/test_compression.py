@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import bz2
+import gzip
+import io
+
+import pandas as pd
+import pytest
+
+from eda_cli.compression import open_source
+from eda_cli.profiling import profile_csv
+
+CSV = b"age,city\n10,A\n20,B\n,A\n"
+
+
+@pytest.mark.parametrize(
+    "name, payload",
+    [
+        ("data.csv.gz", gzip.compress(CSV)),
+        ("data.csv.bz2", bz2.compress(CSV)),
+        ("data.bin", gzip.compress(CSV)),  # без расширения – по magic bytes
+        ("data.csv", CSV),
+    ],
+)
+def test_open_source_decompresses_by_extension_or_magic(tmp_path, name, payload):
+    path = tmp_path / name
+    path.write_bytes(payload)
+
+    with open_source(path) as stream:
+        df = pd.read_csv(stream)
+    assert df.shape == (3, 2)
+    assert profile_csv(path, chunksize=1).columns["age"].missing == 1
+
+
+def test_open_source_zstd(tmp_path):
+    zstandard = pytest.importorskip("zstandard")
+    path = tmp_path / "data.csv.zst"
+    path.write_bytes(zstandard.ZstdCompressor().compress(CSV))
+    assert profile_csv(path).n_rows == 3
+
+
+def test_open_source_keeps_foreign_stream_open():
+    upload = io.BytesIO(gzip.compress(CSV))
+    with open_source(upload) as stream:
+        assert pd.read_csv(stream).shape == (3, 2)
+    assert not upload.closed
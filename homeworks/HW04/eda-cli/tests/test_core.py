@@ -5,6 +5,7 @@ import pandas as pd
 from eda_cli.core import (
     compute_quality_flags,
     correlation_matrix,
+    example_values,
     flatten_summary_for_print,
     missing_table,
     summarize_dataset,
@@ -111,3 +112,14 @@ def test_quality_flags_high_cardinality():
     
     assert flags["has_high_cardinality_categoricals"] is True
     assert "high_cardinality_col" in flags["high_cardinality_categoricals"]
+
+
+def test_example_values_first_distinct_in_order():
+    s = pd.Series(["b", None, "a", "b", "c", "d"] + ["z"] * 1000)
+    assert example_values(s, 3) == ["b", "a", "c"]
+    assert example_values(s, 3, exclude=["b"]) == ["a", "c", "d"]
+    # Значения, дающие одинаковую строку, считаются одним примером
+    assert example_values(pd.Series([1, "1", 2], dtype=object), 2) == ["1", "2"]
+    # Второе различное значение далеко от начала – находится в одном из следующих блоков
+    assert example_values(pd.Series(["x"] * 5000 + ["y"]), 3) == ["x", "y"]
+    assert example_values(pd.Series([None, None]), 3) == []
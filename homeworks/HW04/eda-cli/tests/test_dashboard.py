@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import base64
+import json
+import re
+
+import numpy as np
+import pandas as pd
+from typer.testing import CliRunner
+
+from eda_cli.artifact import ProfileArtifact, save_profile
+from eda_cli.cli import app
+from eda_cli.core import correlation_matrix
+from eda_cli.dashboard import _encode_correlation, build_dashboard, find_artifacts
+from eda_cli.profiling import profile_frame
+
+
+def _artifact(seed: int, n_cols: int = 4) -> ProfileArtifact:
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({f"x{i}": rng.normal(size=300) for i in range(n_cols)})
+    df["city"] = rng.choice(["Москва", "</script>", "Казань"], size=300)
+    artifact = ProfileArtifact.from_profile(profile_frame(df), source=f"data{seed}.csv")
+    artifact.correlation = correlation_matrix(df)
+    return artifact
+
+
+def _json_blocks(page: str) -> dict:
+    blocks = re.findall(r'<script type="application/json" id="([\w-]+)">(.*?)</script>', page, flags=re.S)
+    return {name: json.loads(body) for name, body in blocks}
+
+
+def test_dashboard_embeds_lazy_per_dataset_data(tmp_path):
+    page = build_dashboard([(tmp_path / "a.edaprof", _artifact(0)), (tmp_path / "b.edaprof", _artifact(1))])
+    blocks = _json_blocks(page)
+
+    assert [d["name"] for d in blocks["index"]] == ["data0.csv", "data1.csv"]
+    detail = blocks["ds-1"]
+    assert [c[0] for c in detail["columns"]] == ["x0", "x1", "x2", "x3", "city"]
+    # Гистограмма – из артефакта: [min, max, counts...], сумма – все значения
+    assert sum(detail["hist"]["x0"][2:]) == 300
+    assert {value for value, _ in detail["top"]["city"]} == {"Москва", "</script>", "Казань"}
+    assert detail["corr"]["columns"] == ["x0", "x1", "x2", "x3"]
+    # Значения-строки не закрывают тег script раньше времени
+    assert page.count("</script>") == len(blocks) + 1
+
+
+def test_wide_correlation_is_capped_and_quantized():
+    rng = np.random.default_rng(0)
+    base = rng.normal(size=200)
+    df = pd.DataFrame({f"n{i}": rng.normal(size=200) for i in range(8)})
+    df["a"], df["b"] = base, base + rng.normal(scale=0.01, size=200)
+    encoded = _encode_correlation(correlation_matrix(df), max_columns=2)
+
+    assert encoded["columns"] == ["a", "b"] and encoded["n_total"] == 10
+    values = np.frombuffer(base64.b64decode(encoded["b64"]), dtype="int8")
+    assert values.tolist() == [127, 127, 127, 127]
+
+
+def test_cli_dashboard_from_artifact_directory(tmp_path):
+    for seed in range(3):
+        (tmp_path / f"run{seed}").mkdir()
+        save_profile(tmp_path / f"run{seed}" / "dataset.edaprof", _artifact(seed))
+    (tmp_path / "run0" / "summary.csv").write_text("a,b\n1,2\n", encoding="utf-8")
+    assert len(find_artifacts([str(tmp_path)])) == 3
+
+    out = tmp_path / "dash.html"
+    result = CliRunner().invoke(app, ["dashboard", str(tmp_path), "--out", str(out), "--title", "Выгрузки"])
+    assert result.exit_code == 0, result.output
+    assert "Датасетов: 3" in result.output
+    page = out.read_text(encoding="utf-8")
+    assert "<title>Выгрузки</title>" in page
+    assert len(_json_blocks(page)["index"]) == 3
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import json
+
+import pandas as pd
+from typer.testing import CliRunner
+
+from eda_cli.cli import app
+from eda_cli.core import missing_table, summarize_dataset
+from eda_cli.instrument import Tracer, current_tracer, stage, use_tracer
+from eda_cli.report import ReportConfig, ReportContext, run_report
+
+
+def _sample_df() -> pd.DataFrame:
+    return pd.DataFrame({"age": [10, 20, 30, None], "city": ["A", "B", "A", None]})
+
+
+def test_traced_core_functions_record_stages():
+    tracer = Tracer()
+    with use_tracer(tracer):
+        summarize_dataset(_sample_df())
+        missing_table(_sample_df())
+        with stage("custom") as st:
+            st["rows"] = 100
+
+    names = [s["name"] for s in tracer.to_dicts()]
+    assert names == ["summarize_dataset", "missing_table", "custom"]
+    first = tracer.to_dicts()[0]
+    assert first["rows"] == 4
+    assert first["wall_ms"] >= 0.0 and first["cpu_ms"] >= 0.0
+    assert tracer.to_dicts()[2]["rows_per_sec"] > 0
+
+
+def test_no_tracer_is_noop():
+    assert current_tracer() is None
+    with stage("ignored") as st:
+        st["rows"] = 1
+    summarize_dataset(_sample_df())
+    assert current_tracer() is None
+
+
+def test_tracer_propagates_to_report_threads(tmp_path):
+    config = ReportConfig(source_name="sample.csv", out_root=tmp_path)
+    ctx = ReportContext(config, load_frame=_sample_df)
+    tracer = Tracer()
+    with use_tracer(tracer):
+        run_report(ctx, ["summary", "missing", "top_categories"], jobs=3)
+
+    names = {s["name"] for s in tracer.to_dicts()}
+    assert {"summarize_dataset", "missing_table", "top_categories", "section:summary"} <= names
+
+
+def test_chrome_trace_format():
+    tracer = Tracer()
+    with use_tracer(tracer), stage("parse", rows=10):
+        pass
+    trace = tracer.to_chrome_trace()
+    complete = [e for e in trace["traceEvents"] if e["ph"] == "X"]
+    assert complete[0]["name"] == "parse"
+    assert complete[0]["args"]["rows"] == 10
+    assert any(e["ph"] == "M" and e["name"] == "thread_name" for e in trace["traceEvents"])
+    json.dumps(trace)
+
+
+def test_cli_report_profile_writes_table_and_trace(tmp_path):
+    csv_path = tmp_path / "data.csv"
+    _sample_df().to_csv(csv_path, index=False)
+    out_dir = tmp_path / "report"
+    trace_path = tmp_path / "trace.json"
+
+    result = CliRunner().invoke(
+        app,
+        ["report", str(csv_path), "--out-dir", str(out_dir), "--sections", "summary,missing",
+         "--profile", "--trace-out", str(trace_path)],
+    )
+
+    assert result.exit_code == 0, result.output
+    assert "Стадии:" in result.output
+    stages = json.loads((out_dir / "profile.json").read_text(encoding="utf-8"))
+    assert {"total", "parse", "summarize_dataset"} <= {s["name"] for s in stages}
+    assert "traceEvents" in json.loads(trace_path.read_text(encoding="utf-8"))
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import io
+import json
+import logging
+import queue
+
+import pytest
+
+from eda_cli.logs import (
+    NonBlockingQueueHandler,
+    configure_logging,
+    log_event,
+    request_context,
+    shutdown_logging,
+)
+
+
+def test_json_logs_carry_request_id_and_fields():
+    stream = io.StringIO()
+    logger = configure_logging(level="INFO", stream=stream)
+    try:
+        with request_context("req-1"):
+            log_event(logging.getLogger("eda_cli.api"), "quality", n_rows=10, stages={"parse": 1.5})
+        log_event(logger, "sampled-out", sample_rate=0.0)
+    finally:
+        shutdown_logging()
+
+    lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert len(lines) == 1
+    record = lines[0]
+    assert record["event"] == "quality"
+    assert record["request_id"] == "req-1"
+    assert record["n_rows"] == 10
+    assert record["stages"] == {"parse": 1.5}
+    assert record["logger"] == "eda_cli.api"
+
+
+def test_queue_handler_drops_instead_of_blocking():
+    handler = NonBlockingQueueHandler(queue.Queue(maxsize=1))
+    record = logging.makeLogRecord({"msg": "x"})
+    handler.emit(record)
+    handler.emit(record)
+    assert handler.dropped == 1
+
+
+def test_api_echoes_request_id():
+    pytest.importorskip("httpx")
+    from fastapi.testclient import TestClient
+
+    from eda_cli.api import app
+
+    with TestClient(app) as client:
+        response = client.get("/health", headers={"X-Request-ID": "abc123"})
+        generated = client.get("/health")
+
+    assert response.headers["X-Request-ID"] == "abc123"
+    assert len(generated.headers["X-Request-ID"]) == 16
+
+
+def test_exception_traceback_survives_the_queue():
+    stream = io.StringIO()
+    logger = configure_logging(level="INFO", stream=stream)
+    try:
+        try:
+            raise ValueError("битый чанк")
+        except ValueError:
+            logger.exception("profile-failed", extra={"fields": {"filename": "a.csv"}})
+    finally:
+        shutdown_logging()
+
+    record = json.loads(stream.getvalue())
+    assert record["event"] == "profile-failed"
+    assert record["level"] == "ERROR"
+    assert record["filename"] == "a.csv"
+    assert record["exc"].startswith("Traceback")
+    assert "ValueError: битый чанк" in record["exc"]
+
+
+def test_shutdown_reports_dropped_records_in_the_log(monkeypatch):
+    pytest.importorskip("httpx")
+    from fastapi.testclient import TestClient
+
+    from eda_cli import api
+
+    stream = io.StringIO()
+    monkeypatch.setenv("EDA_API_WARMUP", "0")
+    monkeypatch.setattr(api, "configure_logging", lambda: configure_logging(stream=stream))
+    monkeypatch.setattr(api, "dropped_log_records", lambda: 7)
+    with TestClient(api.app):
+        pass
+
+    records = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert records[-1]["event"] == "shutdown"
+    assert records[-1]["dropped_log_records"] == 7
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import threading
+
+import pytest
+
+from eda_cli.metrics import MetricsRegistry
+
+
+def test_counter_sums_thread_shards():
+    registry = MetricsRegistry()
+    counter = registry.counter("jobs_total", "Jobs", ("kind",))
+
+    def work() -> None:
+        for _ in range(1000):
+            counter.inc(kind="csv")
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert counter.values() == {("csv",): 4000.0}
+    assert 'jobs_total{kind="csv"} 4000' in registry.render()
+
+
+def test_histogram_exposition_is_cumulative():
+    registry = MetricsRegistry()
+    hist = registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 5.0):
+        hist.observe(value)
+
+    text = registry.render()
+    assert "# TYPE latency_seconds histogram" in text
+    assert 'latency_seconds_bucket{le="0.1"} 1' in text
+    assert 'latency_seconds_bucket{le="1"} 3' in text
+    assert 'latency_seconds_bucket{le="+Inf"} 4' in text
+    assert "latency_seconds_count 4" in text
+
+
+def test_gauge_and_label_validation():
+    registry = MetricsRegistry()
+    gauge = registry.gauge("in_progress", "In progress", ("endpoint",))
+    gauge.inc(endpoint="/a")
+    gauge.inc(endpoint="/a")
+    gauge.dec(endpoint="/a")
+    assert gauge.values() == {("/a",): 1.0}
+    with pytest.raises(ValueError):
+        gauge.inc(path="/a")
+    with pytest.raises(ValueError):
+        registry.counter("in_progress", "dup")
+
+
+def test_api_metrics_endpoint():
+    pytest.importorskip("httpx")
+    from fastapi.testclient import TestClient
+
+    from eda_cli.api import app
+
+    with TestClient(app) as client:
+        response = client.post("/quality-from-csv", files={"file": ("a.csv", b"a,b\n1,x\n2,y\n", "text/csv")})
+        assert response.status_code == 200
+        text = client.get("/metrics").text
+
+    assert 'eda_http_requests_total{endpoint="/quality-from-csv",method="POST",status="200"}' in text
+    assert 'eda_stage_rows_total{stage="parse"}' in text
+    assert 'eda_stage_duration_seconds_count{stage="summarize_dataset"}' in text
+    assert 'eda_http_requests_in_progress{endpoint="/quality-from-csv"} 0' in text
+
+
+def test_rejected_uploads_are_counted_and_get_request_id(monkeypatch):
+    pytest.importorskip("httpx")
+    from fastapi.testclient import TestClient
+
+    from eda_cli import api
+
+    limit = next(m for m in api.app.user_middleware if m.cls is api.BodySizeLimitMiddleware)
+    monkeypatch.setitem(limit.kwargs, "max_bytes", 1000)
+    monkeypatch.setattr(api.app, "middleware_stack", None)  # пересобрать стек с новым лимитом
+
+    key = ("/quality-from-csv", "POST", "413")
+    before = api.REQUESTS_TOTAL.values().get(key, 0.0)
+    with TestClient(api.app) as client:
+        response = client.post(
+            "/quality-from-csv",
+            files={"file": ("a.csv", b"a,b\n" + b"1,2\n" * 1000, "text/csv")},
+            headers={"X-Request-ID": "too-big"},
+        )
+
+    assert response.status_code == 413
+    assert response.headers["X-Request-ID"] == "too-big"
+    assert api.REQUESTS_TOTAL.values()[key] == before + 1
@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from eda_cli.core import missing_table, summarize_dataset
+from eda_cli.drift import compare_profiles
+from eda_cli.profiling import ProfileCache, cached_profile_csv, profile_csv, profile_frame
+from eda_cli.sketches import psi
+
+
+def _sample_df() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "age": [10, 20, 30, None, 0, 0],
+            "height": [140, 150, 160, 170, 180, 190],
+            "city": ["A", "B", "A", None, "C", "A"],
+        }
+    )
+
+
+def test_chunked_profile_matches_in_memory_summary(tmp_path):
+    df = _sample_df()
+    path = tmp_path / "sample.csv"
+    df.to_csv(path, index=False)
+
+    expected = summarize_dataset(df)
+    actual = profile_csv(path, chunksize=2).to_summary()
+
+    assert actual.n_rows == expected.n_rows
+    for exp, act in zip(expected.columns, actual.columns):
+        assert act.name == exp.name
+        assert act.missing == exp.missing
+        assert act.unique == exp.unique
+        assert act.zeros == exp.zeros
+        assert act.is_numeric == exp.is_numeric
+        if exp.is_numeric:
+            assert act.mean == pytest.approx(exp.mean)
+            assert act.std == pytest.approx(exp.std)
+            assert act.min == exp.min and act.max == exp.max
+        else:
+            # Примеры добираются из нескольких чанков в том же порядке, что и в памяти
+            assert act.example_values == exp.example_values
+
+    missing = profile_csv(path).missing_table()
+    assert missing.loc["age", "missing_count"] == missing_table(df).loc["age", "missing_count"]
+
+
+def test_merge_of_parts_equals_whole():
+    df = _sample_df()
+    whole = profile_frame(df)
+    merged = profile_frame(df.iloc[:3]).merge(profile_frame(df.iloc[3:]))
+
+    assert merged.n_rows == whole.n_rows
+    for name in df.columns:
+        assert merged.columns[name].missing == whole.columns[name].missing
+        assert merged.columns[name].to_summary().unique == whole.columns[name].to_summary().unique
+    assert merged.columns["height"].mean == pytest.approx(whole.columns["height"].mean)
+    assert merged.columns["height"].m2 == pytest.approx(whole.columns["height"].m2)
+
+
+def test_cached_profile_reused(tmp_path):
+    path = tmp_path / "sample.csv"
+    _sample_df().to_csv(path, index=False)
+    cache = ProfileCache(tmp_path / "cache")
+
+    first = cached_profile_csv(path, cache=cache)
+    assert len(list((tmp_path / "cache").glob("*.pkl"))) == 1
+    second = cached_profile_csv(path, cache=cache)
+    assert second.n_rows == first.n_rows
+
+
+def test_compare_profiles_detects_shift():
+    rng = np.random.default_rng(0)
+    old = pd.DataFrame({"x": rng.normal(0, 1, 5000), "cat": rng.choice(["a", "b"], 5000), "gone": 1})
+    new = pd.DataFrame({"x": rng.normal(1, 1, 5000), "cat": rng.choice(["a", "b"], 5000, p=[0.9, 0.1])})
+
+    report = compare_profiles(profile_frame(old), profile_frame(new))
+    by_name = {c.name: c for c in report.columns}
+
+    assert by_name["x"].drifted and by_name["x"].ks > 0.2
+    assert by_name["cat"].drifted and by_name["cat"].category_shift > 0.3
+    assert by_name["gone"].status == "removed"
+
+    same = compare_profiles(profile_frame(old), profile_frame(old))
+    assert same.drifted_columns == []
+
+
+def test_psi_with_constant_baseline():
+    constant = np.full(100, 5.0)
+    assert psi(constant, constant) == pytest.approx(0.0)
+    assert psi(constant, np.full(100, 1000.0)) > 1.0
+    assert psi(constant, np.arange(100.0)) > 1.0
+
+
+def test_merge_with_non_numeric_part_does_not_depend_on_order():
+    numeric = profile_frame(pd.DataFrame({"x": [1.0, 2.0, 0.0]}))
+    text = profile_frame(pd.DataFrame({"x": ["a", "b", None]}))
+    forward = profile_frame(pd.DataFrame({"x": [1.0, 2.0, 0.0]})).merge(text).columns["x"]
+    backward = profile_frame(pd.DataFrame({"x": ["a", "b", None]})).merge(numeric).columns["x"]
+
+    for col in (forward, backward):
+        assert not col.is_numeric
+        assert col.numeric_count == 0 and col.zeros == 0 and col.min is None
+        assert len(col.sample) == 0 and col.histogram() is None
+    assert forward.to_summary().missing == backward.to_summary().missing == 1
+
+
+def test_merge_mixing_numeric_and_string_shards_is_marked_approximate():
+    numeric = pd.DataFrame({"x": [1, 2, 3, 3]})
+    strings = pd.DataFrame({"x": ["1", "a", "b", "a"]})
+    forward = profile_frame(numeric).merge(profile_frame(strings)).columns["x"]
+    backward = profile_frame(strings).merge(profile_frame(numeric)).columns["x"]
+
+    for col in (forward, backward):
+        summary = col.to_summary()
+        # Числа не смешиваются со строками: «1» не считается дважды, unique и top – по строковой части
+        assert summary.approximate is True and summary.unique == 3
+        assert dict(col.top.top(3)) == {"a": 2, "1": 1, "b": 1}
+        assert summary.non_null == 8
+    assert forward.distinct.estimate() == backward.distinct.estimate()
+
+    assert profile_frame(numeric).merge(profile_frame(numeric)).columns["x"].approximate is False
+    assert profile_frame(strings).merge(profile_frame(strings)).columns["x"].to_summary().approximate is False
+
+
+def test_sample_seed_differs_between_columns():
+    df = pd.DataFrame({"a": np.arange(10_000.0), "b": np.arange(10_000.0)})
+    cols = profile_frame(df).columns
+    assert not np.array_equal(np.sort(cols["a"].sample.values), np.sort(cols["b"].sample.values))
+    # Seed зависит только от имени: повторный профиль даёт ту же выборку
+    again = profile_frame(df).columns["a"]
+    assert np.array_equal(again.sample.values, cols["a"].sample.values)
+
+
+def test_drift_api_reuses_cached_profiles(monkeypatch):
+    from fastapi.testclient import TestClient
+
+    from eda_cli import api
+
+    calls = []
+    profile_upload = api._profile_upload
+    monkeypatch.setattr(api, "_profile_upload", lambda file: calls.append(file.filename) or profile_upload(file))
+    files = {
+        "old": ("old.csv", b"x,cat\n1,a\n2,b\n3,a\n", "text/csv"),
+        "new": ("new.csv", b"x,cat\n5,b\n6,b\n7,b\n", "text/csv"),
+    }
+    with TestClient(api.app) as client:
+        first = client.post("/drift-from-csv", files=files)
+        second = client.post("/drift-from-csv", files=files)
+
+    assert first.status_code == second.status_code == 200
+    assert calls == ["old.csv", "new.csv"]
+    assert first.json()["columns"] == second.json()["columns"]
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import gzip
+import io
+import json
+
+from fastapi.testclient import TestClient
+
+from eda_cli.api import app
+from eda_cli.progress import encode_sse, iter_profile_events
+
+
+def _csv(n: int = 1000) -> bytes:
+    return b"id,city,value\n" + b"".join(f"{i},c{i % 5},{i * 0.5}\n".encode() for i in range(n))
+
+
+def test_events_report_progress_partials_and_result():
+    data = gzip.compress(_csv())
+    events = list(iter_profile_events(io.BytesIO(data), total_bytes=len(data), chunk_rows=200, partial_interval=0.0))
+    kinds = [e["event"] for e in events]
+
+    assert kinds.count("progress") == 6  # 5 чанков + стадия summarize
+    assert kinds.count("partial") == 5
+    assert kinds[-1] == "result"
+
+    progress = [e for e in events if e["event"] == "progress"]
+    assert [e["rows"] for e in progress] == [200, 400, 600, 800, 1000, 1000]
+    assert progress[-1]["bytes_read"] == len(data) and progress[-1]["fraction"] == 1.0
+    # Промежуточная сводка – по уже прочитанной части
+    first_partial = next(e for e in events if e["event"] == "partial")
+    assert first_partial["rows"] == 200 and len(first_partial["columns"]) == 3
+    assert events[-1]["n_rows"] == 1000 and events[-1]["n_cols"] == 3
+
+
+def test_sse_encoding():
+    raw = encode_sse({"event": "progress", "rows": 10}).decode()
+    assert raw == 'event: progress\ndata: {"rows":10}\n\n'
+
+
+def test_stream_endpoint_ndjson():
+    with TestClient(app) as client:
+        response = client.post(
+            "/profile-from-csv/stream?chunk_rows=250&partial_interval_ms=0",
+            files={"file": ("data.csv", _csv(), "text/csv")},
+        )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    events = [json.loads(line) for line in response.text.splitlines()]
+    assert events[0]["event"] == "progress" and events[0]["rows"] == 250
+    assert events[-1]["event"] == "result" and events[-1]["n_rows"] == 1000
+    assert {"quality_score", "flags", "columns"} <= events[-1].keys()
+
+
+def test_stream_endpoint_sse_reports_error_mid_stream():
+    # Битая строка посреди файла: первые чанки уже отданы, затем событие error
+    data = _csv(1050) + b"1,2,3,4,5\n" + _csv(100).split(b"\n", 1)[1]
+    with TestClient(app) as client:
+        response = client.post(
+            "/profile-from-csv/stream?format=sse&chunk_rows=500",
+            files={"file": ("data.csv", data, "text/csv")},
+        )
+    assert response.headers["content-type"].startswith("text/event-stream")
+    blocks = [block for block in response.text.split("\n\n") if block]
+    assert blocks[0].startswith("event: progress")
+    assert blocks[-1].startswith("event: error")
+    assert json.loads(blocks[-1].split("data: ", 1)[1])["status_code"] == 400
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from eda_cli.report import ReportConfig, ReportContext, parse_sections, resolve_sections, run_report
+
+
+def _sample_df() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "age": [10, 20, 30, None],
+            "height": [140, 150, 160, 170],
+            "city": ["A", "B", "A", None],
+        }
+    )
+
+
+def _context(tmp_path: Path, calls: list) -> ReportContext:
+    def load() -> pd.DataFrame:
+        calls.append("load")
+        return _sample_df()
+
+    return ReportContext(ReportConfig(source_name="sample.csv", out_root=tmp_path), load_frame=load)
+
+
+def test_resolve_sections_only_needed_nodes():
+    order = resolve_sections(["summary", "missing"])
+    assert order.index("frame") < order.index("dataset_summary") < order.index("summary")
+    assert "corr_df" not in order
+    assert "top_cats" not in order
+
+
+def test_parse_sections_rejects_unknown_and_private():
+    with pytest.raises(ValueError):
+        parse_sections("summary,nope")
+    with pytest.raises(ValueError):
+        parse_sections("frame")
+
+
+@pytest.mark.parametrize("jobs", [1, 4])
+def test_run_report_computes_shared_nodes_once(tmp_path, jobs):
+    calls: list = []
+    ctx = _context(tmp_path, calls)
+    results = run_report(ctx, ["summary", "missing", "json"], jobs=jobs)
+
+    assert calls == ["load"]
+    assert (tmp_path / "summary.csv").exists()
+    assert (tmp_path / "missing.csv").exists()
+    assert (tmp_path / "summary.json").exists()
+    assert not (tmp_path / "report.md").exists()
+    assert "corr_df" not in results
+
+
+def test_histogram_grid_pages_all_numeric_columns(tmp_path):
+    from xml.etree import ElementTree
+
+    from eda_cli.viz import histogram_counts, plot_histogram_grid
+
+    df = pd.DataFrame({f"x{i}": range(i, i + 50) for i in range(25)})
+    df["city"] = "A"
+    hists = histogram_counts(df, bins=10)
+    assert len(hists) == 25
+    counts, edges = hists["x3"]
+    assert counts.sum() == 50 and len(edges) == 11
+
+    paths = plot_histogram_grid(hists, tmp_path, per_image=10)
+    assert [p.name for p in paths] == ["histograms_1.svg", "histograms_2.svg", "histograms_3.svg"]
+    cells = [ElementTree.parse(p).getroot().findall("{http://www.w3.org/2000/svg}g") for p in paths]
+    assert [len(c) for c in cells] == [10, 10, 5]
+
+
+def test_histogram_grid_section_reuses_precomputed_counts(tmp_path):
+    calls: list = []
+    ctx = _context(tmp_path, calls)
+    ctx.results["hist_counts"] = {"age": (pd.Series([1, 2]).to_numpy(), pd.Series([0.0, 1.0, 2.0]).to_numpy())}
+    results = run_report(ctx, ["histogram_grid"])
+
+    assert calls == []
+    assert [p.name for p in results["histogram_grid"]] == ["histograms_1.svg"]
+
+
+def _blocky_corr(n_groups: int, size: int) -> pd.DataFrame:
+    import numpy as np
+
+    rng = np.random.default_rng(0)
+    base = rng.normal(size=(300, n_groups))
+    groups = rng.permutation(np.repeat(np.arange(n_groups), size))
+    data = base[:, groups] + 0.3 * rng.normal(size=(300, len(groups)))
+    return pd.DataFrame(data, columns=[f"c{i}_g{g}" for i, g in enumerate(groups)]).corr()
+
+
+def test_cluster_order_puts_correlated_columns_together():
+    from eda_cli.core import cluster_order
+
+    corr = _blocky_corr(n_groups=4, size=10)
+    order = cluster_order(corr)
+    assert sorted(order) == sorted(corr.columns)
+    groups = [name.split("_")[1] for name in order]
+    # каждая группа – один непрерывный отрезок порядка
+    assert sum(a != b for a, b in zip(groups, groups[1:])) == 3
+
+
+def test_wide_heatmap_top_and_tiles(tmp_path):
+    from eda_cli.core import cluster_order
+    from eda_cli.viz import plot_correlation_heatmap, plot_correlation_tiles
+
+    corr = _blocky_corr(n_groups=3, size=20)
+    order = cluster_order(corr)
+    top = plot_correlation_heatmap(pd.DataFrame(), tmp_path / "heat.png", corr=corr, max_columns=10, order=order)
+    assert top.exists()
+
+    paths = plot_correlation_tiles(corr, tmp_path, order=order, tile_size=25, overview_cells=20)
+    assert [p.name for p in paths] == [
+        "correlation_overview.png",
+        "correlation_tile_1.png",
+        "correlation_tile_2.png",
+        "correlation_tile_3.png",
+    ]
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import hashlib
+import os
+
+import pytest
+
+from eda_cli.resultcache import ResultCache
+
+CSV = b"a,b\n1,x\n2,\n3,z\n"
+
+
+def test_memory_lru_is_bounded_by_bytes():
+    cache = ResultCache(root=None, max_memory_bytes=10)
+    cache.put("a", b"1234")
+    cache.put("b", b"5678")
+    assert cache.get("a") == b"1234"  # a становится самым свежим
+    cache.put("c", b"9012")
+    assert cache.get("b") is None
+    assert cache.get("a") == b"1234" and cache.get("c") == b"9012"
+    assert (cache.hits, cache.misses) == (3, 1)
+
+
+def test_disk_level_survives_process_and_evicts_oldest(tmp_path):
+    cache = ResultCache(root=tmp_path, max_memory_bytes=100, max_disk_bytes=10)
+    cache.put("old", b"aaaa")
+    os.utime(tmp_path / "old.json", ns=(1, 1))
+    cache.put("mid", b"bbbb")
+    assert ResultCache(root=tmp_path).get("mid") == b"bbbb"  # «другой воркер» читает с диска
+
+    cache.put("new", b"cccc")
+    assert not (tmp_path / "old.json").exists()
+    assert (tmp_path / "new.json").exists()
+
+
+def _client():
+    pytest.importorskip("httpx")
+    from fastapi.testclient import TestClient
+
+    from eda_cli.api import app
+
+    return TestClient(app)
+
+
+def test_quality_upload_is_cached_and_fetchable_by_hash():
+    sha = hashlib.sha256(CSV).hexdigest()
+    with _client() as client:
+        assert client.get(f"/quality/by-hash/{sha}").status_code == 404
+
+        first = client.post("/quality-from-csv", files={"file": ("a.csv", CSV, "text/csv")})
+        second = client.post("/quality-from-csv", files={"file": ("b.csv", CSV, "text/csv")})
+        assert first.headers["X-Cache"] == "MISS" and second.headers["X-Cache"] == "HIT"
+        assert first.headers["ETag"] == second.headers["ETag"]
+        assert first.json()["quality_score"] == second.json()["quality_score"]
+        assert "parse" not in {t["name"] for t in second.json()["timings"]}
+
+        by_hash = client.get(f"/quality/by-hash/{sha}")
+        assert by_hash.status_code == 200
+        assert by_hash.json()["flags"] == first.json()["flags"]
+        etag = by_hash.headers["ETag"]
+        assert client.get(f"/quality/by-hash/{sha}", headers={"If-None-Match": etag}).status_code == 304
+        assert client.get("/quality/by-hash/not-a-hash").status_code == 422
+
+
+def test_summary_cache_keeps_columns_variant_separate():
+    sha = hashlib.sha256(CSV).hexdigest()
+    with _client() as client:
+        plain = client.post("/summary-from-csv", files={"file": ("a.csv", CSV, "text/csv")})
+        assert plain.headers["X-Cache"] == "MISS"
+        assert client.get(f"/summary/by-hash/{sha}?columns=true").status_code == 404
+
+        cached = client.get(f"/summary/by-hash/{sha}")
+        assert cached.status_code == 200
+        data = cached.json()
+        assert data["timings"] == []
+        assert {k: v for k, v in data.items() if k != "timings"} == {
+            k: v for k, v in plain.json().items() if k != "timings"
+        }
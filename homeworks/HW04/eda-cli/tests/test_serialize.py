@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from eda_cli import serialize
+from eda_cli.core import summarize_dataset
+from eda_cli.serialize import dumps, iter_dataset_summary, iter_json, loads, write_json_stream
+
+
+def _payload():
+    summary = summarize_dataset(pd.DataFrame({"x": [1, 2, 3], "город": ["Москва", "Рига", None]}))
+    return {
+        "summary": summary,
+        "score": np.float64(0.5),
+        "n": np.int64(3),
+        "hist": np.array([1, 2, 3]),
+        "ts": pd.Timestamp("2024-01-02 03:04:05"),
+    }
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_dumps_handles_numpy_and_dataclasses(monkeypatch, use_orjson):
+    if use_orjson and not serialize.HAS_ORJSON:
+        pytest.skip("orjson не установлен")
+    monkeypatch.setattr(serialize, "HAS_ORJSON", use_orjson)
+
+    data = json.loads(dumps(_payload()))
+    assert data["score"] == 0.5 and data["n"] == 3 and data["hist"] == [1, 2, 3]
+    assert data["ts"] == "2024-01-02T03:04:05"
+    assert data["summary"] == summarize_dataset(
+        pd.DataFrame({"x": [1, 2, 3], "город": ["Москва", "Рига", None]})
+    ).to_dict()
+    assert "Москва".encode("utf-8") in dumps(_payload())
+    assert json.loads(dumps({"a": [1]}, indent=True)) == {"a": [1]}
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_non_finite_floats_become_null(monkeypatch, use_orjson):
+    if use_orjson and not serialize.HAS_ORJSON:
+        pytest.skip("orjson не установлен")
+    monkeypatch.setattr(serialize, "HAS_ORJSON", use_orjson)
+
+    # std по колонке из одного значения – NaN
+    summary = summarize_dataset(pd.DataFrame({"x": [1.0]}))
+    payload = {"a": float("nan"), "b": [np.float64("inf"), 1.5], "c": np.array([np.nan, 2.0]), "summary": summary}
+    raw = dumps(payload)
+    data = json.loads(raw, parse_constant=lambda name: pytest.fail(f"нестрогий JSON: {name}"))
+    assert data["a"] is None and data["b"] == [None, 1.5] and data["c"] == [None, 2.0]
+    assert data["summary"]["columns"][0]["std"] is None
+
+
+def test_iter_json_streams_lazy_items():
+    produced = []
+
+    def rows():
+        for i in range(3):
+            produced.append(i)
+            yield {"i": i}
+
+    chunks = iter_json({"n": 3}, {"rows": rows(), "empty": []})
+    first = next(chunks)
+    assert first == b"{" and produced == []
+    assert loads(first + b"".join(chunks)) == {"n": 3, "rows": [{"i": 0}, {"i": 1}, {"i": 2}], "empty": []}
+    assert loads(b"".join(iter_json({}))) == {}
+
+
+def test_dataset_summary_stream_matches_to_dict(tmp_path):
+    df = pd.DataFrame({f"c{i}": range(5) for i in range(50)})
+    summary = summarize_dataset(df)
+    path = write_json_stream(tmp_path / "summary.json", iter_dataset_summary(summary))
+    assert loads(path.read_bytes()) == json.loads(json.dumps(summary.to_dict()))
+
+
+def test_summary_endpoint_streams_columns():
+    pytest.importorskip("httpx")
+    from fastapi.testclient import TestClient
+
+    from eda_cli.api import app
+
+    with TestClient(app) as client:
+        response = client.post(
+            "/summary-from-csv?columns=true", files={"file": ("a.csv", b"a,b\n1,x\n2,\n", "text/csv")}
+        )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["n_rows"] == 2 and "problematic_columns" in data
+    assert [c["name"] for c in data["columns"]] == ["a", "b"]
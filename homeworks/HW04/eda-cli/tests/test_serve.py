@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+from fastapi import HTTPException
+from typer.testing import CliRunner
+
+from eda_cli.api import JobTracker, warmup
+from eda_cli.cli import app
+
+
+def test_job_tracker_drains_in_flight_jobs():
+    tracker = JobTracker()
+    started = threading.Event()
+
+    def job() -> None:
+        with tracker.track():
+            started.set()
+            time.sleep(0.2)
+
+    worker = threading.Thread(target=job)
+    worker.start()
+    started.wait()
+    assert tracker.active == 1
+    assert tracker.drain(timeout=5.0) is True
+    assert tracker.active == 0
+    worker.join()
+
+    with pytest.raises(HTTPException) as exc_info:
+        with tracker.track():
+            pass
+    assert exc_info.value.status_code == 503
+
+    tracker.resume()
+    with tracker.track():
+        assert tracker.active == 1
+
+
+def test_drain_times_out_with_stuck_job():
+    tracker = JobTracker()
+    with tracker.track():
+        assert tracker.drain(timeout=0.05) is False
+
+
+def test_warmup_runs_pipeline():
+    assert warmup() > 0.0
+
+
+def test_serve_passes_settings_to_uvicorn(monkeypatch):
+    import uvicorn
+
+    calls = {}
+    monkeypatch.setattr(uvicorn, "run", lambda app_path, **kwargs: calls.update(app=app_path, **kwargs))
+    # serve пишет настройки в os.environ – monkeypatch вернёт прежние значения
+    for name in ("EDA_API_WARMUP", "EDA_DRAIN_TIMEOUT", "EDA_LOG_LEVEL"):
+        monkeypatch.setenv(name, "")
+
+    result = CliRunner().invoke(app, ["serve", "--workers", "3", "--port", "9000", "--no-warmup", "--graceful-timeout", "5"])
+
+    assert result.exit_code == 0, result.output
+    assert calls["app"] == "eda_cli.api:app"
+    assert calls["workers"] == 3 and calls["port"] == 9000
+    assert calls["timeout_graceful_shutdown"] == 5
+    import os
+
+    assert os.environ["EDA_API_WARMUP"] == "0"
+    assert os.environ["EDA_DRAIN_TIMEOUT"] == "5"
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import pandas as pd
+
+from eda_cli.core import summarize_dataset
+from eda_cli.shards import expand_sources, merge_shards, profile_shards, shard_table
+
+
+def _write_shards(tmp_path) -> pd.DataFrame:
+    df = pd.DataFrame(
+        {
+            "age": [10, 20, 30, None, 50, 60],
+            "city": ["A", "B", "A", None, "C", "A"],
+        }
+    )
+    df.iloc[:3].to_csv(tmp_path / "part1.csv", index=False)
+    df.iloc[3:].to_csv(tmp_path / "part2.csv", index=False)
+    pd.DataFrame({"age": [None, None], "city": [None, None]}).to_csv(tmp_path / "part3.csv", index=False)
+    (tmp_path / "notes.txt").write_text("not a shard")
+    return df
+
+
+def test_expand_sources_directory_and_glob(tmp_path):
+    _write_shards(tmp_path)
+    assert [p.name for p in expand_sources(str(tmp_path))] == ["part1.csv", "part2.csv", "part3.csv"]
+    assert [p.name for p in expand_sources(str(tmp_path / "part[12].csv"))] == ["part1.csv", "part2.csv"]
+
+
+def test_profile_shards_merges_into_one_summary(tmp_path):
+    df = _write_shards(tmp_path)
+    shards = profile_shards(expand_sources(str(tmp_path / "part[12].csv")), workers=2)
+    merged = merge_shards(shards).to_summary()
+    expected = summarize_dataset(df)
+
+    assert merged.n_rows == expected.n_rows
+    for exp, act in zip(expected.columns, merged.columns):
+        assert (act.name, act.missing, act.unique) == (exp.name, exp.missing, exp.unique)
+
+
+def test_shard_table_points_at_bad_shard(tmp_path):
+    _write_shards(tmp_path)
+    table = shard_table(profile_shards(expand_sources(str(tmp_path)), workers=1))
+    worst = table.sort_values("quality_score").iloc[0]
+    assert worst["shard"] == "part3.csv"
+    assert worst["max_missing_share"] == 1.0
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import gzip
+
+import pandas as pd
+from typer.testing import CliRunner
+
+from eda_cli.cli import app
+from eda_cli.sniff import SNIFF_BYTES, sniff_bytes, sniff_path
+
+
+def _rows(n: int = 40) -> list:
+    return [[i, f"Город {i % 7}", round(i * 1.5, 1)] for i in range(n)]
+
+
+def test_semicolon_cp1251_with_header():
+    text = "id;город;сумма\n" + "".join(f"{a};{b};{c}\n" for a, b, c in _rows())
+    dialect = sniff_bytes(text.encode("cp1251"))
+    assert (dialect.delimiter, dialect.encoding, dialect.has_header, dialect.n_columns) == (";", "cp1251", True, 3)
+
+
+def test_bom_tab_and_utf8():
+    text = "id\tcity\tvalue\n" + "".join(f"{a}\t{b}\t{c}\n" for a, b, c in _rows())
+    assert sniff_bytes(b"\xef\xbb\xbf" + text.encode("utf-8")).encoding == "utf-8-sig"
+    dialect = sniff_bytes(text.encode("utf-8"))
+    assert (dialect.delimiter, dialect.encoding) == ("\t", "utf-8")
+
+
+def test_delimiters_inside_quotes_are_ignored():
+    # В каждом поле «адреса» по две запятые – без учёта кавычек победила бы запятая
+    lines = ["name;address;n"] + [f'user{i};"ул. Ленина, д. {i}, кв. 1";{i}' for i in range(30)]
+    dialect = sniff_bytes("\n".join(lines).encode("utf-8"))
+    assert (dialect.delimiter, dialect.quotechar, dialect.quoted, dialect.n_columns) == (";", '"', True, 3)
+
+
+def test_headerless_numeric_file():
+    text = "".join(f"{a},{a * 2},{c}\n" for a, _, c in _rows())
+    dialect = sniff_bytes(text.encode("utf-8"))
+    assert dialect.has_header is False
+    assert dialect.read_csv_kwargs()["header"] is None
+
+
+def test_numeric_looking_header_names():
+    # Заголовки вида 2023 / q1 / 1st: решает сравнение типов колонок, а не «есть ли в шапке число»
+    by_year = "name,2023\n" + "".join(f"user{i},{'high' if i % 2 else 'low'}\n" for i in range(30))
+    assert sniff_bytes(by_year.encode("utf-8")).has_header is True
+
+    quarters = "id,q1,1st,2024\n" + "".join(f"{i},{i * 1.5},{i * 2.25},{i / 4}\n" for i in range(30))
+    assert sniff_bytes(quarters.encode("utf-8")).has_header is True
+
+    headerless = "".join(f"user{i},{'high' if i % 2 else 'low'}\n" for i in range(30))
+    assert sniff_bytes(headerless.encode("utf-8")).has_header is False
+
+
+def test_truncated_block_ignores_partial_last_line():
+    text = "a,b\n" + "".join(f"{i},{i}\n" for i in range(5000))
+    block = text.encode("utf-8")[: SNIFF_BYTES - 3]
+    assert sniff_bytes(block).n_columns == 2
+
+
+def test_sniff_path_reads_compressed_and_caches(tmp_path):
+    path = tmp_path / "data.csv.gz"
+    frame = pd.DataFrame(_rows(), columns=["id", "город", "сумма"])
+    with gzip.open(path, "wt", encoding="cp1251") as f:
+        frame.to_csv(f, sep="|", index=False)
+    cache_dir = tmp_path / "dialects"
+
+    dialect = sniff_path(path, cache_dir=cache_dir)
+    assert (dialect.delimiter, dialect.encoding) == ("|", "cp1251")
+    cached = list(cache_dir.glob("*.json"))
+    assert len(cached) == 1
+
+    # Второй вызов берёт формат из кэша, файл не читается
+    cached[0].write_text(cached[0].read_text().replace('"|"', '";"'), encoding="utf-8")
+    assert sniff_path(path, cache_dir=cache_dir).delimiter == ";"
+
+
+def test_overview_detects_format(tmp_path):
+    path = tmp_path / "export.csv"
+    frame = pd.DataFrame(_rows(), columns=["id", "город", "сумма"])
+    frame.to_csv(path, sep=";", index=False, encoding="cp1251")
+
+    result = CliRunner().invoke(app, ["overview", str(path)])
+    assert result.exit_code == 0, result.output
+    assert "разделитель: точка с запятой, кодировка: cp1251" in result.output
+    assert "Столбцов: 3" in result.output
+    assert "город" in result.output
+
+    # Явно заданный --sep важнее определённого
+    result = CliRunner().invoke(app, ["overview", str(path), "--sep", ","])
+    assert "Столбцов: 1" in result.output
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+from typing import Dict
+
+import pytest
+
+# Бюджет на импорт CLI (кумулятивно, по -X importtime). Сейчас основную часть
+# занимает сам typer; pandas/matplotlib здесь загружаться не должны вовсе.
+IMPORT_BUDGET_MS = 300.0
+
+
+def _import_times(statement: str) -> Dict[str, float]:
+    """Кумулятивное время импорта (мс) каждого модуля по выводу python -X importtime."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times: Dict[str, float] = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        times[name.strip()] = int(cumulative_us) / 1000.0
+    return times
+
+
+def _loaded_heavy(times: Dict[str, float]) -> list:
+    return sorted(name for name in times if name.split(".")[0] in ("pandas", "matplotlib"))
+
+
+def test_cli_import_skips_pandas_and_matplotlib():
+    times = _import_times("import eda_cli.cli")
+    assert _loaded_heavy(times) == []
+
+
+def test_report_import_skips_matplotlib():
+    times = _import_times("import eda_cli.report")
+    assert not any(name.startswith("matplotlib") for name in times)
+
+
+def test_cli_import_within_budget():
+    # Минимум из нескольких запусков – меньше шума от прогретости диска/кэшей
+    best = min(_import_times("import eda_cli.cli")["eda_cli.cli"] for _ in range(3))
+    if best > IMPORT_BUDGET_MS:
+        pytest.fail(f"import eda_cli.cli: {best:.0f} ms > бюджет {IMPORT_BUDGET_MS:.0f} ms")
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+from eda_cli.api import app
+from eda_cli.core import build_json_summary, compute_quality_flags, missing_table, summarize_dataset
+from eda_cli.target import TargetNotFound, TargetProfile, profile_target
+
+
+def _classification_df(n: int = 2000) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    label = np.where(rng.random(n) < 0.05, "fraud", "ok")
+    signal = np.where(label == "fraud", 1.0, 0.0) + rng.normal(scale=1.0, size=n)
+    return pd.DataFrame(
+        {
+            "noise": rng.normal(size=n),
+            "signal": signal,
+            "leak": np.where(label == "fraud", "F", "O"),
+            "city": rng.choice(["A", "B", "C"], size=n),
+            "label": label,
+        }
+    )
+
+
+def test_classification_balance_mutual_info_and_leakage():
+    profile = profile_target(_classification_df(), "label")
+
+    assert profile.kind == "classification"
+    assert profile.n_labeled == 2000 and profile.missing == 0
+    assert profile.imbalance_ratio() > 10
+    mutual_info = profile.mutual_info()
+    assert mutual_info["leak"] == pytest.approx(1.0)
+    assert mutual_info["signal"] > mutual_info["noise"]
+    assert profile.leakage_columns() == ["leak"]
+    assert set(profile.to_dict()["classes"]) == {"ok", "fraud"}
+
+
+def test_chunked_update_matches_whole_frame():
+    df = _classification_df()
+    whole = profile_target(df, "label")
+    chunked = TargetProfile("label")
+    for start in range(0, len(df), 500):
+        chunked.update(df.iloc[start : start + 500])
+
+    assert chunked.class_counts.tolist() == whole.class_counts.tolist()
+    assert chunked.mutual_info()["leak"] == pytest.approx(whole.mutual_info()["leak"])
+    assert chunked.correlations()["signal"] == pytest.approx(whole.correlations()["signal"])
+
+
+def test_regression_target_leakage_by_correlation():
+    rng = np.random.default_rng(1)
+    y = rng.normal(size=1000)
+    df = pd.DataFrame({"price": y, "price_x2": 2 * y + 1e-3 * rng.normal(size=1000), "other": rng.normal(size=1000)})
+    df.loc[:9, "price"] = np.nan
+
+    profile = profile_target(df, "price")
+    assert profile.kind == "regression"
+    assert profile.missing == 10
+    assert profile.correlations()["price_x2"] > 0.99
+    assert profile.leakage_columns() == ["price_x2"]
+
+    with pytest.raises(TargetNotFound):
+        profile_target(df, "nope")
+
+
+def test_quality_flags_with_target():
+    df = _classification_df()
+    summary, missing_df = summarize_dataset(df), missing_table(df)
+    plain = compute_quality_flags(summary, missing_df)
+    flags = compute_quality_flags(summary, missing_df, target=profile_target(df, "label"))
+
+    assert "target" not in plain
+    assert flags["has_leakage_suspects"] and flags["has_class_imbalance"]
+    assert not flags["has_missing_target"] and not flags["has_constant_target"]
+    assert flags["quality_score"] < plain["quality_score"]
+    issues = build_json_summary(summary, flags)["problematic_columns"]
+    assert {"name": "leak", "issue": "target_leakage"}.items() <= next(i for i in issues if i["name"] == "leak").items()
+
+
+def test_api_quality_with_target():
+    data = _classification_df(300).to_csv(index=False).encode()
+    with TestClient(app) as client:
+        plain = client.post("/quality-from-csv", files={"file": ("a.csv", data, "text/csv")})
+        with_target = client.post("/quality-from-csv?target=label", files={"file": ("a.csv", data, "text/csv")})
+        missing = client.post("/quality-from-csv?target=nope", files={"file": ("a.csv", data, "text/csv")})
+        flags = client.post("/quality-flags-from-csv?target=label", files={"file": ("a.csv", data, "text/csv")})
+
+    assert plain.json()["target"] is None
+    body = with_target.json()
+    assert with_target.headers["X-Cache"] == "MISS"
+    assert body["flags"]["has_leakage_suspects"] is True
+    assert body["target"]["leakage_columns"] == ["leak"]
+    assert "утечку" in body["message"]
+    assert missing.status_code == 400
+    assert flags.json()["flags"]["has_class_imbalance"] is True
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import time
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+
+from eda_cli.core import STALE_AFTER_DAYS, build_json_summary, compute_quality_flags, missing_table, summarize_dataset
+from eda_cli.profiling import profile_csv
+from eda_cli.temporal import NATIVE_FORMAT, TemporalProfile, infer_datetime_format, profile_temporal
+
+
+def test_infer_datetime_format():
+    assert infer_datetime_format(pd.Series(["2024-01-05", "2024-02-10 12:30:00", None])) == "ISO8601"
+    assert infer_datetime_format(pd.Series(["05.01.2024", "31.12.2023"])) == "%d.%m.%Y"
+    assert infer_datetime_format(pd.Series(["01/31/2024", "12/25/2023"])) == "%m/%d/%Y"
+    assert infer_datetime_format(pd.Series(pd.date_range("2024-01-01", periods=3))) == NATIVE_FORMAT
+    assert infer_datetime_format(pd.Series(["a", "b"])) is None
+    assert infer_datetime_format(pd.Series([1, 2, 3])) is None
+
+
+def test_profile_gaps_months_and_sentinels():
+    days = [f"2024-01-{d:02d}" for d in range(1, 21)] + [f"2024-02-{d:02d}" for d in range(1, 6)]
+    s = pd.Series(days + ["1970-01-01", "2099-01-01", "not a date"])
+    stats = profile_temporal(s)
+
+    assert stats["format"] == "ISO8601"
+    assert stats["count"] == 27
+    assert stats["unparsed"] == 1
+    assert stats["min"].startswith("2024-01-01") and stats["max"].startswith("2024-02-05")
+    assert stats["days_with_rows"] == 25
+    assert stats["max_gap_days"] == 11
+    assert stats["max_gap_start"].startswith("2024-01-21")
+    assert stats["rows_by_month"] == {"2024-01": 20, "2024-02": 5}
+    assert stats["sentinel"] == 1 and stats["future"] == 1
+
+    assert profile_temporal(pd.Series(["x", "y"])) is None
+
+
+def test_merge_equals_single_pass():
+    s = pd.Series(pd.date_range("2024-01-01", periods=1000, freq="3h").astype(str))
+    whole = TemporalProfile("ISO8601")
+    whole.update(s)
+    left, right = TemporalProfile("ISO8601"), TemporalProfile("ISO8601")
+    left.update(s.iloc[:400])
+    right.update(s.iloc[400:])
+    assert left.merge(right).to_dict() == whole.to_dict()
+
+
+def test_temporal_quality_flags():
+    recent = datetime.now() - timedelta(days=1)
+    df = pd.DataFrame(
+        {
+            "old": [f"2020-01-{d:02d}" for d in range(1, 21)] + ["2020-03-01"],
+            "fresh": [(recent - timedelta(days=i)).strftime("%Y-%m-%d") for i in range(20)] + ["1900-01-01"],
+            "name": list("abcdefghijklmnopqrstu"),
+        }
+    )
+    summary = summarize_dataset(df)
+    flags = compute_quality_flags(summary, missing_table(df))
+
+    assert summary.columns[2].temporal is None
+    assert flags["stale_datetime_columns"] == ["old"]
+    assert flags["datetime_gap_columns"] == ["old"]
+    assert flags["datetime_sentinel_columns"] == ["fresh"]
+
+    issues = {(p["name"], p["issue"]) for p in build_json_summary(summary, flags)["problematic_columns"]}
+    assert {("old", "stale_datetime"), ("old", "datetime_gaps"), ("fresh", "datetime_sentinels")} <= issues
+
+
+def test_stale_check_uses_utc_now(monkeypatch):
+    # Локальные часы на 12 часов впереди UTC: последняя дата на 6 часов моложе порога
+    monkeypatch.setenv("TZ", "Etc/GMT-12")
+    time.tzset()
+    try:
+        last = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=STALE_AFTER_DAYS, hours=-6)
+        df = pd.DataFrame({"ts": [(last - timedelta(days=i)).isoformat() for i in range(20)]})
+        summary = summarize_dataset(df)
+        flags = compute_quality_flags(summary, missing_table(df))
+    finally:
+        monkeypatch.undo()
+        time.tzset()
+    assert flags["stale_datetime_columns"] == []
+
+
+def test_streaming_temporal_profile_matches_in_memory(tmp_path):
+    df = pd.DataFrame(
+        {
+            "ts": pd.date_range("2023-06-01", periods=500, freq="7h").strftime("%d.%m.%Y %H:%M"),
+            "v": range(500),
+        }
+    )
+    path = tmp_path / "events.csv"
+    df.to_csv(path, index=False)
+
+    streamed = profile_csv(path, chunksize=64).to_summary()
+    in_memory = summarize_dataset(pd.read_csv(path))
+    assert streamed.columns[0].temporal == in_memory.columns[0].temporal
+    assert streamed.columns[0].temporal["format"] == "%d.%m.%Y %H:%M"
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import pandas as pd
+import pytest
+
+from eda_cli.core import build_json_summary, compute_quality_flags, missing_table, summarize_dataset
+from eda_cli.profiling import profile_csv
+from eda_cli.text import TextProfile, profile_text
+
+
+def _text_df() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "amount": ["10", "20.5", " 30 ", "-4", "1e3", "7", "8", "9", "11", "12"],
+            "email": ["a@b.com", "c@d.org", "", "  ", "e@f.ru", "x@y.io", "q@w.com", None, "z@z.de", "m@n.net"],
+            "city": ["Москва", "MÃ¼nchen", "Berlin", "Paris", "Rome", "Oslo", "Riga", "Kyiv", "Baku", "Minsk"],
+            "n": range(10),
+        }
+    )
+
+
+def test_profile_text_lengths_and_classes():
+    stats = profile_text(_text_df()["email"])
+    assert stats["count"] == 9
+    assert stats["empty"] == 1
+    assert stats["whitespace_only"] == 1
+    assert stats["len_min"] == 0 and stats["len_max"] == 7
+    assert stats["email_like_share"] == pytest.approx(7 / 9)
+
+    assert profile_text(_text_df()["amount"])["numeric_like_share"] == 1.0
+    assert profile_text(_text_df()["n"]) is None
+    # object-колонка без строк
+    assert profile_text(pd.Series([True, None, False], dtype=object)) is None
+
+
+def test_sampled_classes_are_extrapolated():
+    s = pd.Series(["1"] * 5000 + ["word"] * 5000)
+    profile = TextProfile(sample_size=500)
+    profile.update(s)
+    stats = profile.to_dict()
+    assert stats["sampled"] == 500
+    assert stats["count"] == 10_000
+    assert stats["numeric_like_share"] == pytest.approx(0.5, abs=0.1)
+
+
+def test_text_quality_flags_and_json_issues():
+    df = _text_df()
+    summary = summarize_dataset(df)
+    flags = compute_quality_flags(summary, missing_table(df))
+
+    assert flags["numeric_as_text_columns"] == ["amount"]
+    assert flags["encoding_anomaly_columns"] == ["city"]
+    assert flags["blank_string_columns"] == ["email"]
+
+    issues = {(p["name"], p["issue"]) for p in build_json_summary(summary, flags)["problematic_columns"]}
+    assert ("amount", "numeric_stored_as_text") in issues
+    assert ("city", "encoding_anomalies") in issues
+
+
+def test_streaming_text_profile_matches_in_memory(tmp_path):
+    df = _text_df()[["email", "city"]]
+    path = tmp_path / "text.csv"
+    df.to_csv(path, index=False)
+
+    streamed = {c.name: c.text for c in profile_csv(path, chunksize=3).to_summary().columns}
+    # В CSV пустая строка читается как пропуск, поэтому сравниваем с тем, что прочитал pandas
+    expected = {c.name: c.text for c in summarize_dataset(pd.read_csv(path)).columns}
+    for name in ("email", "city"):
+        for key in ("count", "empty", "whitespace_only", "len_min", "len_max", "len_mean", "email_like_share"):
+            assert streamed[name][key] == pytest.approx(expected[name][key])
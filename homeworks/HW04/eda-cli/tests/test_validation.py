@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import io
+
+import pandas as pd
+import pytest
+
+from eda_cli.validation import UploadLimits, UploadRejected, inspect_block, iter_csv_chunks, read_csv_limited
+
+
+class CountingStream(io.BytesIO):
+    """BytesIO, который помнит, сколько байт у него прочитали."""
+
+    def __init__(self, data: bytes) -> None:
+        super().__init__(data)
+        self.consumed = 0
+
+    def read(self, size=-1):
+        data = super().read(size)
+        self.consumed += len(data)
+        return data
+
+
+def test_inspect_block_detects_delimiter_encoding_and_binary():
+    info = inspect_block("имя;город\nАня;Москва\nБоря;Рига\n".encode("cp1251"))
+    assert (info.encoding, info.delimiter, info.n_columns) == ("cp1251", ";", 2)
+    assert inspect_block(b"a,b,c\n1,2,3\n").delimiter == ","
+
+    with pytest.raises(UploadRejected) as exc:
+        inspect_block(b"PK\x03\x04\x00\x00binary")
+    assert exc.value.status_code == 415
+    with pytest.raises(UploadRejected):
+        inspect_block(b"  \n")
+
+
+def test_read_csv_limited_matches_read_csv():
+    data = b"a;b\n" + b"".join(f"{i};x{i % 3}\n".encode() for i in range(1000))
+    df = read_csv_limited(io.BytesIO(data), chunk_rows=128)
+    pd.testing.assert_frame_equal(df, pd.read_csv(io.BytesIO(data), sep=";"))
+
+
+def test_limits_abort_early():
+    rows = b"1,2\n" * 1_000_000
+    stream = CountingStream(b"a,b\n" + rows)
+    with pytest.raises(UploadRejected) as exc:
+        read_csv_limited(stream, UploadLimits(max_rows=1000), chunk_rows=500)
+    assert exc.value.status_code == 413
+    assert stream.consumed < len(stream.getvalue()) / 4
+
+    with pytest.raises(UploadRejected) as exc:
+        read_csv_limited(io.BytesIO(b"a,b\n" + rows), UploadLimits(max_bytes=10_000))
+    assert exc.value.status_code == 413
+
+    with pytest.raises(UploadRejected) as exc:
+        read_csv_limited(io.BytesIO(b"a,b,c\n1,2,3\n"), UploadLimits(max_columns=2))
+    assert exc.value.status_code == 413
+
+
+def test_malformed_csv_is_rejected_at_bad_chunk():
+    good = b"1,2\n" * 1050
+    stream = CountingStream(b"a,b\n" + good + b"1,2,3,4\n" + good * 1000)
+    with pytest.raises(UploadRejected) as exc:
+        for _ in iter_csv_chunks(stream, chunk_rows=100):
+            pass
+    assert exc.value.status_code == 400
+    assert stream.consumed < len(stream.getvalue()) / 4
+
+
+def test_api_rejects_oversized_and_binary_uploads():
+    pytest.importorskip("httpx")
+    from fastapi.testclient import TestClient
+
+    from eda_cli.api import BodySizeLimitMiddleware, app
+
+    with TestClient(app) as client:
+        response = client.post("/quality-from-csv", files={"file": ("a.csv", b"\x00\x01\x02" * 100, "text/csv")})
+        assert response.status_code == 415
+        response = client.post("/quality-from-csv", files={"file": ("a.csv", b"a,b\n1,2\n1,2,3\n", "text/csv")})
+        assert response.status_code == 400
+
+    with TestClient(BodySizeLimitMiddleware(app, max_bytes=1000)) as client:
+        response = client.post("/quality-from-csv", files={"file": ("a.csv", b"a,b\n" + b"1,2\n" * 1000, "text/csv")})
+        assert response.status_code == 413
+
+
+def test_api_rejects_oversized_chunked_upload_without_content_length():
+    pytest.importorskip("httpx")
+    from fastapi.testclient import TestClient
+
+    from eda_cli.api import BodySizeLimitMiddleware, app
+
+    boundary = "eda-boundary"
+    head = (
+        f'--{boundary}\r\nContent-Disposition: form-data; name="file"; filename="a.csv"\r\n'
+        "Content-Type: text/csv\r\n\r\na,b\r\n"
+    ).encode()
+    tail = f"\r\n--{boundary}--\r\n".encode()
+
+    def body():  # генератор – httpx шлёт его chunked, без Content-Length
+        yield head
+        for _ in range(100):
+            yield b"1,2\r\n" * 10
+        yield tail
+
+    with TestClient(BodySizeLimitMiddleware(app, max_bytes=1000)) as client:
+        response = client.post(
+            "/quality-from-csv",
+            content=body(),
+            headers={"content-type": f"multipart/form-data; boundary={boundary}"},
+        )
+    assert response.status_code == 413
+    assert "1000 байт" in response.json()["detail"]
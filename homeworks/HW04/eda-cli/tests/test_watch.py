@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import json
+
+from typer.testing import CliRunner
+
+from eda_cli.artifact import load_profile
+from eda_cli.cli import app
+from eda_cli.profiling import profile_csv
+from eda_cli.watch import STATE_FILE, Watcher
+
+
+def _rows(start: int, stop: int) -> str:
+    return "".join(f"{i},{i % 7},{'x' if i % 3 else ''}\n" for i in range(start, stop))
+
+
+def _run_once(watcher: Watcher) -> list:
+    results: list = []
+    watcher.run(interval=0.01, on_result=results.append, once=True)
+    return results
+
+
+def test_poll_waits_until_file_is_stable(tmp_path):
+    landing = tmp_path / "in"
+    landing.mkdir()
+    watcher = Watcher(landing, tmp_path / "out", settle=5.0)
+    data = landing / "a.csv"
+    data.write_text("id,k,s\n" + _rows(0, 10))
+    (landing / ".a.csv.part").write_text("id\n1\n")
+
+    assert watcher.poll(now=0.0) == []  # первый раз видим – ждём
+    assert watcher.poll(now=3.0) == []  # размер тот же, но settle ещё не прошёл
+    with data.open("a") as f:
+        f.write(_rows(10, 20))  # файл ещё пишется – отсчёт заново
+    assert watcher.poll(now=6.0) == []
+    assert watcher.poll(now=10.0) == []
+    assert watcher.poll(now=11.0) == [data]
+
+
+def test_new_file_then_append_is_incremental(tmp_path):
+    landing, out = tmp_path / "in", tmp_path / "out"
+    landing.mkdir()
+    data = landing / "sales.csv"
+    data.write_text("id,k,s\n" + _rows(0, 500))
+
+    [first] = _run_once(Watcher(landing, out, settle=0.0))
+    assert first.mode == "full" and first.state.n_rows == 500
+    for name in ("dataset.edaprof", "summary.csv", "missing.csv", "summary.json", "histograms_1.svg"):
+        assert (out / "sales.csv" / name).exists()
+
+    # Новый процесс: состояние берётся из watch_state.json, неизменённый файл не пересчитывается
+    assert _run_once(Watcher(landing, out, settle=0.0)) == []
+
+    with data.open("a") as f:
+        f.write(_rows(500, 800))
+    [second] = _run_once(Watcher(landing, out, settle=0.0))
+    assert second.mode == "append" and second.new_rows == 300
+
+    profile = load_profile(out / "sales.csv" / "dataset.edaprof").profile
+    expected = profile_csv(data)
+    assert profile.n_rows == expected.n_rows == 800
+    assert profile.missing_table().equals(expected.missing_table())
+    state = json.loads((out / STATE_FILE).read_text(encoding="utf-8"))
+    assert state["sales.csv"]["n_rows"] == 800
+
+    # Перезаписанный файл (другое начало) профилируется заново
+    data.write_text("id,k,s\n" + _rows(1000, 1100))
+    [third] = _run_once(Watcher(landing, out, settle=0.0))
+    assert third.mode == "full" and third.state.n_rows == 100
+
+
+def test_broken_file_is_reported_and_not_retried(tmp_path):
+    landing, out = tmp_path / "in", tmp_path / "out"
+    landing.mkdir()
+    (landing / "bad.csv").write_bytes(b"a,b\n1,2\n3,4,5,6\n")
+    (landing / "good.csv").write_text("id,k,s\n" + _rows(0, 5))
+
+    results = {r.path.name: r for r in _run_once(Watcher(landing, out, settle=0.0))}
+    assert results["bad.csv"].mode == "error" and results["bad.csv"].state.error
+    assert results["good.csv"].mode == "full"
+    assert _run_once(Watcher(landing, out, settle=0.0)) == []
+
+
+def test_watch_command_once(tmp_path):
+    landing, out = tmp_path / "in", tmp_path / "out"
+    landing.mkdir()
+    (landing / "a.csv").write_text("id,k,s\n" + _rows(0, 20))
+
+    result = CliRunner().invoke(
+        app, ["watch", str(landing), "--out-dir", str(out), "--once", "--settle", "0", "--interval", "0.01", "--workers", "1"]
+    )
+    assert result.exit_code == 0, result.output
+    assert "[full] a.csv: всего 20 строк" in result.output
+    assert (out / "a.csv" / "dataset.edaprof").exists()